@@ -0,0 +1,192 @@
+import argparse
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+import csv
+from dataclasses import asdict, dataclass
+import json
+import logging
+from multiprocessing.util import Finalize
+import os
+import traceback
+from typing import Any, Iterable, Iterator, Optional
+
+from scrapping_playbook_framework.execution_plan import ExecutionPlan, compile_playbook
+from scrapping_playbook_framework.playbook_reader import PlaybookDict, from_yaml_file
+from scrapping_playbook_framework.worker import Worker, WorkerEngine, strategies
+from scrapping_playbook_framework.worker_strategies.worker_strategy import WorkerStrategy
+
+
+@dataclass
+class BatchResult:
+    index: int
+    record: dict[str, Any]
+    outputs: Optional[dict[str, Any]] = None
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def read_records(file_path: str) -> Iterator[dict[str, Any]]:
+    """
+    Read input records from a JSONL file (one object per line) or a CSV file with a header row.
+    """
+    extension = os.path.splitext(file_path)[1].lower()
+    with open(file_path, 'r', newline='', encoding='utf-8') as file:
+        if extension == '.csv':
+            yield from csv.DictReader(file)
+        elif extension in ('.jsonl', '.ndjson'):
+            for line_number, line in enumerate(file, start=1):
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                if not isinstance(record, dict):
+                    raise ValueError(f"Record on line {line_number} of {file_path} is not an object")
+                yield record
+        else:
+            raise ValueError(f"Unsupported input file format: {file_path}, expected .jsonl or .csv")
+
+
+def to_serializable(value: Any) -> Any:
+    """Outputs cross a process boundary and end up in JSON, engine objects (elements...) become strings"""
+    return json.loads(json.dumps(value, default=str))
+
+
+# State of a pool process, set once by _init_process and reused for every record it runs
+_process_playbook: Optional[PlaybookDict] = None
+_process_plan: Optional[ExecutionPlan] = None
+_process_engine: Optional[WorkerEngine] = None
+_process_strategy: Optional[WorkerStrategy] = None
+
+def _init_process(playbook_dict: PlaybookDict, engine: WorkerEngine) -> None:
+    global _process_playbook, _process_plan, _process_engine, _process_strategy
+    _process_playbook = playbook_dict
+    _process_plan = compile_playbook(playbook_dict)
+    _process_engine = engine
+    strategy_class = strategies.get(engine)
+    if not strategy_class:
+        raise ValueError(f"No strategy found for engine: {engine}")
+    # The strategy keeps its browser session warm between records
+    _process_strategy = strategy_class.from_config(_process_plan.config)
+    # Pool processes leave through os._exit, atexit handlers never run there
+    Finalize(None, _process_strategy.shutdown, exitpriority=10)
+
+def _run_record(index: int, record: dict[str, Any]) -> BatchResult:
+    try:
+        worker = Worker(_process_playbook, _process_engine, variables=record, strategy=_process_strategy, plan=_process_plan) # type: ignore
+        return BatchResult(index, record, outputs=to_serializable(worker.start()))
+    except Exception as e:
+        logging.error(f"Record {index} failed: {e}")
+        return BatchResult(index, record, error="".join(traceback.format_exception(e)))
+
+
+class BatchRunner:
+    """
+    Run one playbook over many input records on a pool of processes, each process holds its own browser.
+    A failing record only produces an errored result, the other records keep running.
+    """
+    def __init__(self, playbook_dict: PlaybookDict, engine: WorkerEngine, processes: int = 4, ordered: bool = False):
+        """
+        :param processes: Number of worker processes, hence of browsers.
+        :param ordered: Yield results in input order instead of completion order.
+        """
+        self.playbook_dict = playbook_dict
+        self.engine = engine
+        self.processes = max(processes, 1)
+        self.ordered = ordered
+
+    def run(self, records: Iterable[dict[str, Any]]) -> Iterator[BatchResult]:
+        # Bound the records in flight so huge input files are never fully loaded
+        max_in_flight = self.processes * 4
+        records_iterator = enumerate(records)
+        # Record of each future and the generation of the pool running it
+        pending: dict[Future[BatchResult], tuple[int, dict[str, Any], int]] = {}
+        completed: dict[int, BatchResult] = {}
+        next_to_yield = 0
+        exhausted = False
+        generation = 0
+        executor = self._start_executor()
+        try:
+            while True:
+                while not exhausted and len(pending) + len(completed) < max_in_flight:
+                    next_record = next(records_iterator, None)
+                    if next_record is None:
+                        exhausted = True
+                        break
+                    index, record = next_record
+                    try:
+                        future = executor.submit(_run_record, index, record)
+                    except BrokenProcessPool:
+                        executor, generation = self._restart_executor(executor), generation + 1
+                        future = executor.submit(_run_record, index, record)
+                    pending[future] = (index, record, generation)
+                if not pending:
+                    break
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    index, record, future_generation = pending.pop(future)
+                    try:
+                        result = future.result()
+                    except BrokenProcessPool as e:
+                        # A process died (OOM, browser crash...): every record in flight on the pool fails with it
+                        result = BatchResult(index, record, error=f"{type(e).__name__}: {e}")
+                        if future_generation == generation:
+                            executor, generation = self._restart_executor(executor), generation + 1
+                    except Exception as e:
+                        # The record or its outputs could not cross the process boundary
+                        result = BatchResult(index, record, error=f"{type(e).__name__}: {e}")
+                    if self.ordered:
+                        completed[index] = result
+                    else:
+                        yield result
+                while next_to_yield in completed:
+                    yield completed.pop(next_to_yield)
+                    next_to_yield += 1
+        finally:
+            executor.shutdown(cancel_futures=True)
+
+    def _start_executor(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(max_workers=self.processes, initializer=_init_process, initargs=(self.playbook_dict, self.engine))
+
+    def _restart_executor(self, executor: ProcessPoolExecutor) -> ProcessPoolExecutor:
+        logging.warning("A batch process died, restarting the process pool")
+        executor.shutdown(wait=False, cancel_futures=True)
+        return self._start_executor()
+
+
+def run_batch(playbook_path: str, input_path: str, output_path: str, engine: WorkerEngine = WorkerEngine.SELENIUM, processes: int = 4, ordered: bool = False) -> tuple[int, int]:
+    """
+    Run a playbook over every record of input_path and write one JSON result per line to output_path.
+    :return: Number of succeeded and failed records.
+    """
+    runner = BatchRunner(from_yaml_file(playbook_path), engine, processes=processes, ordered=ordered)
+    directory = os.path.dirname(output_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    succeeded, failed = 0, 0
+    with open(output_path, 'w', encoding='utf-8') as output_file:
+        for result in runner.run(read_records(input_path)):
+            if result.ok:
+                succeeded += 1
+            else:
+                failed += 1
+            output_file.write(json.dumps(asdict(result), default=str) + "\n")
+            output_file.flush()
+    logging.info(f"Batch finished: {succeeded} succeeded, {failed} failed")
+    return succeeded, failed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run a playbook over every record of a JSONL or CSV file")
+    parser.add_argument("playbook", help="Path of the YAML playbook")
+    parser.add_argument("input", help="Input records, .jsonl or .csv")
+    parser.add_argument("-o", "--output", default="batch_results.jsonl", help="JSONL file receiving one result per record")
+    parser.add_argument("-p", "--processes", type=int, default=4, help="Number of worker processes (browsers)")
+    parser.add_argument("-e", "--engine", default=WorkerEngine.SELENIUM.value, choices=[engine.value for engine in WorkerEngine])
+    parser.add_argument("--ordered", action="store_true", help="Write results in input order")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    run_batch(args.playbook, args.input, args.output, WorkerEngine(args.engine), args.processes, args.ordered)
@@ -0,0 +1,97 @@
+from typing import Any, Optional
+
+from scrapping_playbook_framework.position import Position
+from scrapping_playbook_framework.task.browser_task import GoToParams, GoToTask, ScreenshotParams
+from scrapping_playbook_framework.task.dom_task import DOMElement, DOMElementGetAttributeParams, ExtractParams, ExtractTask, GetElementTask, GetElementsTask, SelectorParams
+from scrapping_playbook_framework.task.task import ScrappingTask
+from scrapping_playbook_framework.task.wait_task import WaitTask, WaitTaskParams
+from scrapping_playbook_framework.worker_strategies.worker_strategy import WorkerStrategy
+
+
+class FakeDOMElement(DOMElement):
+    """
+    In-memory element answering instantly, every query returns `fan_out` children.
+    """
+    def __init__(self, path: str = 'html', fan_out: int = 10):
+        self.path = path
+        self.fan_out = fan_out
+
+    def get_text(self, ctx: Any) -> str:
+        return f"text of {self.path}"
+
+    def get_attribute(self, ctx: DOMElementGetAttributeParams) -> str | None:
+        return f"{ctx.get('attribute_name')} of {self.path}"
+
+    def get_position(self, ctx: Any) -> Position | None:
+        return Position(x=0, y=0)
+
+    def click(self, ctx: Any) -> None:
+        pass
+
+    def get_element(self, ctx: SelectorParams) -> Optional[DOMElement]:
+        return FakeDOMElement(f"{self.path} {ctx['selector']}", self.fan_out)
+
+    def get_elements(self, ctx: SelectorParams) -> list[DOMElement]:
+        return [FakeDOMElement(f"{self.path} {ctx['selector']}:{index}", self.fan_out) for index in range(self.fan_out)]
+
+    def get_shadow_root(self, ctx: Any) -> Optional[DOMElement]:
+        return None
+
+    def screenshot(self, ctx: ScreenshotParams) -> None:
+        pass
+
+    def extract(self, ctx: ExtractParams) -> list[dict[str, Any]]:
+        fields = ExtractTask.normalize_fields(ctx['fields'])
+        return [{key: f"{key} of {self.path}:{index}" for key, _ in fields} for index in range(self.fan_out)]
+
+    def get_outer_html(self, ctx: Any) -> str:
+        return f"<div data-path=\"{self.path}\"></div>"
+
+
+class FakeGoToTask(GoToTask):
+    def execute(self, ctx: GoToParams) -> None:
+        pass
+
+class FakeGetElementTask(GetElementTask):
+    def __init__(self, document: FakeDOMElement):
+        self.document = document
+
+    def execute(self, ctx: SelectorParams) -> Optional[DOMElement]:
+        return self.document.get_element(ctx)
+
+class FakeGetElementsTask(GetElementsTask):
+    def __init__(self, document: FakeDOMElement):
+        self.document = document
+
+    def execute(self, ctx: SelectorParams) -> list[DOMElement]:
+        return self.document.get_elements(ctx)
+
+class FakeExtractTask(ExtractTask):
+    def __init__(self, document: FakeDOMElement):
+        self.document = document
+
+    def execute(self, ctx: ExtractParams) -> list[dict[str, Any]]:
+        return self.document.extract(ctx)
+
+class FakeWaitTask(WaitTask):
+    def execute(self, ctx: WaitTaskParams) -> None:
+        pass
+
+
+class FakeWorkerStrategy(WorkerStrategy):
+    """
+    Engine without browser, what a benchmark measures is the framework overhead only.
+    """
+    def __init__(self, fan_out: int = 10):
+        self.fan_out = fan_out
+
+    def get_available_tasks(self) -> dict[str, ScrappingTask[Any]]:
+        document = FakeDOMElement(fan_out=self.fan_out)
+        tasks: list[ScrappingTask[Any]] = [
+            FakeGoToTask(),
+            FakeGetElementTask(document),
+            FakeGetElementsTask(document),
+            FakeExtractTask(document),
+            FakeWaitTask(),
+        ]
+        return {task.get_task_action_name(): task for task in tasks}
@@ -0,0 +1,318 @@
+import argparse
+from dataclasses import asdict, dataclass
+import json
+import logging
+import platform
+import os
+import statistics
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Optional
+
+from scrapping_playbook_framework.benchmarks.fake_engine import FakeWorkerStrategy
+from scrapping_playbook_framework.core.post_processor import PostProcessorFactory
+from scrapping_playbook_framework.execution_context import ExecutionContext
+from scrapping_playbook_framework.execution_plan import CompiledCondition, compile_playbook
+from scrapping_playbook_framework.lib import value_resolver
+from scrapping_playbook_framework.playbook_reader import PlaybookCondition, PlaybookDict, from_yaml_file, yaml_playbook_to_dict
+from scrapping_playbook_framework.worker import Worker, WorkerEngine
+
+logger = logging.getLogger(__name__)
+
+# Bumped when benchmarks change in a way that makes older results not comparable
+RESULTS_FORMAT_VERSION = 1
+
+@dataclass
+class BenchmarkResult:
+    name: str
+    operations: int
+    repeat: int
+    best: float
+    median: float
+
+    @property
+    def operations_per_second(self) -> float:
+        return self.operations / self.median if self.median else 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        return {**asdict(self), 'operations_per_second': self.operations_per_second}
+
+
+# A benchmark prepares its state and returns the measured function, which returns the number of operations it ran
+Benchmark = Callable[[], Callable[[], int]]
+BENCHMARKS: dict[str, Benchmark] = {}
+
+def benchmark(name: str) -> Callable[[Benchmark], Benchmark]:
+    def register(setup: Benchmark) -> Benchmark:
+        BENCHMARKS[name] = setup
+        return setup
+    return register
+
+
+def worker_run(playbook_dict: PlaybookDict, fan_out: int, operations: int) -> Callable[[], int]:
+    plan = compile_playbook(playbook_dict)
+    strategy = FakeWorkerStrategy(fan_out=fan_out)
+
+    def run() -> int:
+        Worker(playbook_dict, WorkerEngine.SELENIUM, strategy=strategy, plan=plan).start()
+        return operations
+    return run
+
+
+FLAT_MAP_PLAYBOOK = """
+config: {}
+tasks:
+  - {name: Open listing, action: browser.goto, url: "https://example.com/products"}
+  - {name: Get products, action: dom.get_elements, selector: ".product", output: products}
+  - name: Read products
+    action: map
+    map: products
+    item_name: product
+    output: items
+    tasks:
+      - {name: Get title, action: $product.get_element, selector: ".title", output: title_element}
+      - {name: Read title, action: $title_element.get_text, output: title}
+      - {name: Read link, action: $product.get_attribute, attribute_name: href, output: link}
+"""
+
+@benchmark('worker_loop.flat_map')
+def flat_map() -> Callable[[], int]:
+    # 1000 iterations of 3 tasks
+    return worker_run(yaml_playbook_to_dict(FLAT_MAP_PLAYBOOK), fan_out=1000, operations=3000)
+
+NESTED_MAP_PLAYBOOK = """
+config: {}
+tasks:
+  - {name: Get categories, action: dom.get_elements, selector: ".category", output: categories}
+  - name: Read categories
+    action: map
+    map: categories
+    item_name: category
+    output: categories_items
+    tasks:
+      - {name: Get products, action: $category.get_elements, selector: ".product", output: products}
+      - name: Read products
+        action: map
+        map: products
+        item_name: product
+        output: items
+        tasks:
+          - {name: Read title, action: $product.get_text, output: title}
+          - {name: Read link, action: $product.get_attribute, attribute_name: href, output: link}
+"""
+
+@benchmark('worker_loop.nested_map')
+def nested_map() -> Callable[[], int]:
+    # 30 outer iterations of 1 task + 30 inner iterations of 2 tasks
+    return worker_run(yaml_playbook_to_dict(NESTED_MAP_PLAYBOOK), fan_out=30, operations=30 + 30 * 30 * 2)
+
+PARALLEL_MAP_PLAYBOOK = """
+config:
+  urls: [%s]
+tasks:
+  - name: Visit pages
+    action: map
+    map: urls
+    item_name: url
+    parallel: 4
+    output: pages
+    tasks:
+      - {name: Open page, action: browser.goto, url: "{{url}}"}
+      - {name: Extract, action: dom.extract, container: ".row", fields: {title: ".title", link: {selector: ".title", attribute: href}}, output: rows}
+"""
+
+@benchmark('worker_loop.parallel_map')
+def parallel_map() -> Callable[[], int]:
+    urls = ", ".join(f'"https://example.com/page/{index}"' for index in range(500))
+    return worker_run(yaml_playbook_to_dict(PARALLEL_MAP_PLAYBOOK % urls), fan_out=10, operations=1000)
+
+def context_clone(scope_size: int) -> Callable[[], int]:
+    context = ExecutionContext().inject_variables({f"variable_{index}": index for index in range(scope_size)})
+    iterations = 10000
+
+    def run() -> int:
+        for index in range(iterations):
+            sub_context = context.clone()
+            sub_context.set_variable('INDEX', index)
+            sub_context.get_variable('variable_0')
+        return iterations
+    return run
+
+for _scope_size in (10, 100, 1000):
+    benchmark(f'context.clone.{_scope_size}_variables')(lambda scope_size=_scope_size: context_clone(scope_size))
+
+@benchmark('value_resolver.template')
+def template() -> Callable[[], int]:
+    context = ExecutionContext().inject_variables({'category': 'laptops', 'page': 3, 'query': 'thinkpad', 'base_url': 'https://example.com'})
+    templates = ['{{base_url}}/{{category}}?page={{page}}&q={{query}}', 'plain string without placeholder', '{{query}}']
+    iterations = 10000
+
+    def run() -> int:
+        for _ in range(iterations):
+            for current_template in templates:
+                value_resolver.resolve(context, current_template)
+        return iterations * len(templates)
+    return run
+
+@benchmark('value_resolver.nested_template')
+def nested_template() -> Callable[[], int]:
+    context = ExecutionContext().inject_variables({'host': 'example.com', 'base_url': 'https://{{host}}', 'listing_url': '{{base_url}}/products'})
+    iterations = 10000
+
+    def run() -> int:
+        for _ in range(iterations):
+            value_resolver.resolve(context, '{{listing_url}}?page=2')
+        return iterations
+    return run
+
+@benchmark('conditions.evaluate')
+def conditions() -> Callable[[], int]:
+    context = ExecutionContext().inject_variables({'price': 42.0, 'status': 'available', 'limit': 100, 'popup': None})
+    compiled = [CompiledCondition.compile(PlaybookCondition(**condition)) for condition in (
+        {'variable': 'price', 'less_than': '{{limit}}'},
+        {'variable': 'price', 'greater_than': 10},
+        {'variable': 'status', 'equals': 'available'},
+        {'variable': 'popup', 'is_defined': False},
+    )]
+    iterations = 10000
+
+    def run() -> int:
+        for _ in range(iterations):
+            for condition in compiled:
+                condition.evaluate(context)
+        return iterations * len(compiled)
+    return run
+
+@benchmark('post_processors.chain')
+def post_processors() -> Callable[[], int]:
+    chain = PostProcessorFactory.create_chain([
+        {'type': 'strip'},
+        {'type': 'regex_extract', 'pattern': r'[\d,.]+'},
+        {'type': 'replace', 'old': ',', 'new': ''},
+        {'type': 'cast', 'to': 'float'},
+    ])
+    values = [f"  Price: {index},99 EUR  " for index in range(1000)]
+    iterations = 10
+
+    def run() -> int:
+        for _ in range(iterations):
+            for value in values:
+                chain.process(value)
+        return iterations * len(values)
+    return run
+
+# Temporary directories of the benchmark being run, removed once it is measured
+_temporary_directories: list[tempfile.TemporaryDirectory[str]] = []
+
+def temporary_directory() -> str:
+    directory = tempfile.TemporaryDirectory(prefix='playbook-benchmark-')
+    _temporary_directories.append(directory)
+    return directory.name
+
+def large_playbook_file() -> str:
+    """
+    A 1,800 lines playbook written to a temporary directory, like the generated ones.
+    """
+    lines = ["config: {base_url: 'https://example.com'}", "tasks:"]
+    for index in range(200):
+        lines += [
+            f"  - name: Read list {index}", "    action: map", f"    map: list_{index}", "    item_name: item", f"    output: items_{index}",
+            "    when: [{variable: base_url, is_defined: true}]", "    tasks:",
+            f"      - {{name: Get title {index}, action: $item.get_element, selector: '.title-{index}', output: title_element}}",
+            "      - {name: Read title, action: $title_element.get_text, output: title, post_process: [{type: strip}]}",
+        ]
+    file_path = os.path.join(temporary_directory(), 'playbook.yaml')
+    with open(file_path, 'w', encoding='utf-8') as playbook_file:
+        playbook_file.write("\n".join(lines))
+    return file_path
+
+@benchmark('playbook_reader.from_yaml_file')
+def read_playbook() -> Callable[[], int]:
+    file_path = large_playbook_file()
+
+    def run() -> int:
+        from_yaml_file(file_path, cache=False)
+        return 1
+    return run
+
+@benchmark('playbook_reader.from_yaml_file.cached')
+def read_cached_playbook() -> Callable[[], int]:
+    file_path = large_playbook_file()
+    cache_dir = os.path.join(os.path.dirname(file_path), 'cache')
+
+    def run() -> int:
+        from_yaml_file(file_path, cache=True, cache_dir=cache_dir)
+        return 1
+    return run
+
+
+def run_benchmarks(names: list[str], repeat: int = 5) -> list[BenchmarkResult]:
+    results: list[BenchmarkResult] = []
+    for name in names:
+        try:
+            run = BENCHMARKS[name]()
+            # Warm up caches (compiled templates, selectors...) before timing
+            run()
+            timings: list[float] = []
+            operations = 0
+            for _ in range(repeat):
+                started = time.perf_counter()
+                operations = run()
+                timings.append(time.perf_counter() - started)
+        finally:
+            while _temporary_directories:
+                _temporary_directories.pop().cleanup()
+        result = BenchmarkResult(name, operations, repeat, min(timings), statistics.median(timings))
+        logger.info(f"{name}: {result.operations_per_second:,.0f} ops/s (median {result.median * 1000:.1f} ms)")
+        results.append(result)
+    return results
+
+def compare(results: list[BenchmarkResult], baseline: dict[str, Any], threshold: float) -> list[str]:
+    """
+    :return: The benchmarks whose throughput dropped by more than threshold (0.2 is 20%) against the baseline.
+    """
+    baseline_results = {result['name']: result for result in baseline.get('results', [])}
+    regressions: list[str] = []
+    for result in results:
+        previous = baseline_results.get(result.name)
+        if previous is None or not previous['operations_per_second']:
+            continue
+        change = result.operations_per_second / previous['operations_per_second'] - 1
+        if change < -threshold:
+            regressions.append(f"{result.name}: {change:+.0%} ({previous['operations_per_second']:,.0f} -> {result.operations_per_second:,.0f} ops/s)")
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure the framework overhead against an in-memory engine")
+    parser.add_argument("-o", "--output", default="benchmark_results.json", help="JSON file receiving the results")
+    parser.add_argument("-k", "--filter", default="", help="Only run the benchmarks whose name contains this string")
+    parser.add_argument("-r", "--repeat", type=int, default=5, help="Timed runs per benchmark, the median is kept")
+    parser.add_argument("--baseline", help="Results of a previous run, exit with status 1 on regression")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Throughput drop reported as a regression")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    # The worker logs every task, keep the benchmark output readable and the logging cost out of the timings
+    logging.getLogger().setLevel(logging.WARNING)
+    logger.setLevel(logging.INFO)
+
+    names = [name for name in BENCHMARKS if args.filter in name]
+    results = run_benchmarks(names, args.repeat)
+    with open(args.output, 'w', encoding='utf-8') as output_file:
+        json.dump({
+            'format_version': RESULTS_FORMAT_VERSION,
+            'timestamp': time.time(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'results': [result.to_dict() for result in results],
+        }, output_file, indent=2)
+
+    regressions: Optional[list[str]] = None
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as baseline_file:
+            regressions = compare(results, json.load(baseline_file), args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+    sys.exit(1 if regressions else 0)
@@ -0,0 +1,277 @@
+from functools import lru_cache
+import logging
+import re
+from typing import Any, Callable, Optional
+
+from cssselect import parse as parse_selector
+from cssselect.parser import CombinedSelector, Relation
+from lxml import etree, html
+from lxml.cssselect import CSSSelector, LxmlHTMLTranslator
+
+from scrapping_playbook_framework.position import Position
+from scrapping_playbook_framework.task.browser_task import ScreenshotParams
+from scrapping_playbook_framework.task.dom_task import DOMElement, DOMElementGetAttributeParams, ExtractField, ExtractParams, ExtractTask, SelectorParams
+
+_WHITESPACE = re.compile(r'[ \t\r\f\v]+')
+_BLANK_LINES = re.compile(r'\s*\n\s*')
+# Elements rendered on their own line by innerText
+_BLOCK_TAGS = {'address', 'article', 'aside', 'blockquote', 'br', 'dd', 'div', 'dl', 'dt', 'fieldset', 'figcaption', 'figure', 'footer', 'form', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'header', 'hr', 'li', 'main', 'nav', 'ol', 'p', 'pre', 'section', 'table', 'tr', 'ul'}
+_HIDDEN_TAGS = {'script', 'style', 'template', 'noscript', 'head'}
+# The parser always moves these to the document level, their outerHTML can not be parsed as a fragment
+_DOCUMENT_TAG = re.compile(r'\s*<(html|head|body)[\s/>]', re.IGNORECASE)
+
+
+@lru_cache(maxsize=1024)
+def compile_selector(selector: str) -> CSSSelector:
+    return CSSSelector(selector, translator='html')
+
+
+def _has_combinator(node: Any) -> bool:
+    if isinstance(node, CombinedSelector):
+        return True
+    if isinstance(node, Relation):
+        # :has() combinators are relative to the matched element, they never reach its ancestors
+        return _has_combinator(node.selector)
+    for value in vars(node).values():
+        children = value if isinstance(value, list) else [value]
+        if any(hasattr(child, 'specificity') and _has_combinator(child) for child in children):
+            return True
+    return False
+
+
+@lru_cache(maxsize=1024)
+def depends_on_ancestors(selector: str) -> bool:
+    """
+    Whether a selector can match an element because of its ancestors (descendant, child or sibling combinators).
+    """
+    return any(_has_combinator(parsed.parsed_tree) for parsed in parse_selector(selector))
+
+
+# A compound selector (no combinator) and the combinator relating it to the compound on its left, None for the leftmost
+_Compound = tuple[etree.XPath, Optional[str]]
+
+
+class CombinatorMatcher:
+    """
+    Match a selector with combinators on the candidates of an element subtree: the rightmost compound of each selector
+    finds the candidates below the element, the combinators are then checked by walking up from each candidate.
+    """
+    def __init__(self, chains: list[list[_Compound]], candidates: etree.XPath):
+        self.chains = chains
+        self.candidates = candidates
+
+    @staticmethod
+    def compile(selector: str) -> Optional['CombinatorMatcher']:
+        """
+        :return: None if a combinator is nested in a pseudo-class (:is(a b)...), only matched against the whole document.
+        """
+        translator = LxmlHTMLTranslator()
+        chains: list[list[_Compound]] = []
+        rightmost: list[str] = []
+        for parsed in parse_selector(selector):
+            if parsed.pseudo_element is not None:
+                return None
+            chain: list[_Compound] = []
+            node = parsed.parsed_tree
+            subject = node.subselector if isinstance(node, CombinedSelector) else node
+            rightmost.append(f'descendant::{translator.xpath(subject)}')
+            while isinstance(node, CombinedSelector):
+                if _has_combinator(node.subselector):
+                    return None
+                chain.append((etree.XPath('self::' + str(translator.xpath(node.subselector))), node.combinator))
+                node = node.selector
+            if _has_combinator(node):
+                return None
+            chain.append((etree.XPath('self::' + str(translator.xpath(node))), None))
+            chains.append(chain)
+        # The union of the candidates of every selector comes in document order
+        return CombinatorMatcher(chains, etree.XPath(' | '.join(rightmost)))
+
+    def select(self, element: html.HtmlElement) -> list[html.HtmlElement]:
+        return [candidate for candidate in self.candidates(element) if any(_matches(chain, 0, candidate) for chain in self.chains)]
+
+
+def _matches(chain: list[_Compound], index: int, element: html.HtmlElement) -> bool:
+    compound, combinator = chain[index]
+    if not compound(element):
+        return False
+    if combinator is None:
+        return True
+    if combinator == ' ':
+        return any(_matches(chain, index + 1, ancestor) for ancestor in element.iterancestors())
+    if combinator == '>':
+        parent = element.getparent()
+        return parent is not None and _matches(chain, index + 1, parent)
+    if combinator == '+':
+        previous = next(element.itersiblings(tag=etree.Element, preceding=True), None)
+        return previous is not None and _matches(chain, index + 1, previous)
+    # '~'
+    return any(_matches(chain, index + 1, sibling) for sibling in element.itersiblings(tag=etree.Element, preceding=True))
+
+
+@lru_cache(maxsize=1024)
+def compile_combinator_matcher(selector: str) -> Optional[CombinatorMatcher]:
+    return CombinatorMatcher.compile(selector)
+
+
+def parse_html(content: str | bytes, base_url: Optional[str] = None, encoding: Optional[str] = None) -> html.HtmlElement:
+    """
+    Parse a whole document, relative links are made absolute like the href/src properties of a browser.
+    """
+    if not content or not content.strip():
+        content = "<html></html>"
+    parser = html.HTMLParser(encoding=encoding) if encoding and isinstance(content, bytes) else None
+    document = html.document_fromstring(content, parser=parser, base_url=base_url)
+    if base_url:
+        document.make_links_absolute(base_url, handle_failures='ignore')
+    return document
+
+
+def parse_fragment(content: str, base_url: Optional[str] = None) -> html.HtmlElement:
+    """
+    Parse the outerHTML of a single element.
+    """
+    document_tag = _DOCUMENT_TAG.match(content)
+    if document_tag:
+        document = parse_html(content, base_url=base_url)
+        tag = document_tag.group(1).lower()
+        return document if tag == 'html' else getattr(document, tag)
+    # Parsed into a wrapper so that tags like <td> or <li> are kept as is, then detached from it
+    wrapper = html.fragment_fromstring(content, create_parent='div', base_url=base_url)
+    if len(wrapper) != 1:
+        raise ValueError(f"Expected the outerHTML of a single element, got {len(wrapper)} elements")
+    element = wrapper[0]
+    wrapper.remove(element)
+    element.tail = None
+    if base_url:
+        element.make_links_absolute(base_url, handle_failures='ignore')
+    return element
+
+
+def inner_text(element: html.HtmlElement) -> str:
+    """
+    Approximation of the browser innerText: hidden elements skipped, blocks on their own line, spaces collapsed.
+    """
+    parts: list[str] = []
+
+    def walk(node: html.HtmlElement) -> None:
+        tag = node.tag if isinstance(node.tag, str) else ''
+        if tag in _HIDDEN_TAGS:
+            return
+        is_block = tag in _BLOCK_TAGS
+        if is_block:
+            parts.append('\n')
+        if node.text:
+            parts.append(node.text)
+        for child in node:
+            walk(child)
+            if child.tail:
+                parts.append(child.tail)
+        if is_block:
+            parts.append('\n')
+
+    walk(element)
+    text = _WHITESPACE.sub(' ', ''.join(parts))
+    return _BLANK_LINES.sub('\n', text).strip()
+
+
+# DOM properties that have no attribute counterpart in a parsed tree
+_PROPERTIES: dict[str, Callable[[html.HtmlElement], Any]] = {
+    'innerText': inner_text,
+    'textContent': lambda element: element.text_content(),
+    'outerHTML': lambda element: html.tostring(element, encoding='unicode', with_tail=False),
+    'innerHTML': lambda element: (element.text or '') + ''.join(html.tostring(child, encoding='unicode') for child in element),
+    'tagName': lambda element: str(element.tag).upper(),
+    'checked': lambda element: element.get('checked') is not None,
+    'disabled': lambda element: element.get('disabled') is not None,
+    'selected': lambda element: element.get('selected') is not None,
+    'className': lambda element: element.get('class') or '',
+}
+
+
+class ParsedDOMElement(DOMElement):
+    """
+    DOMElement backed by a locally parsed HTML tree, every query runs in-process.
+    The tree is static: clicks and positions are not available.
+    """
+    session_bound = False
+
+    def __init__(self, element: html.HtmlElement):
+        self.element = element
+
+    def get_text(self, ctx: Any) -> str:
+        return inner_text(self.element)
+
+    def get_attribute(self, ctx: DOMElementGetAttributeParams) -> str | None:
+        return self.element.get(ctx.get('attribute_name'))
+
+    def get_property(self, name: str) -> Any:
+        getter = _PROPERTIES.get(name)
+        if getter is not None:
+            return getter(self.element)
+        return self.element.get(name)
+
+    def get_position(self, ctx: Any) -> Position | None:
+        return None
+
+    def click(self, ctx: Any) -> None:
+        logging.warning("Can not click on an element of a parsed document")
+
+    def get_element(self, ctx: SelectorParams) -> Optional[DOMElement]:
+        elements = self.query(ctx['selector'])
+        return ParsedDOMElement(elements[0]) if elements else None
+
+    def get_elements(self, ctx: SelectorParams) -> list[DOMElement]:
+        return [ParsedDOMElement(element) for element in self.query(ctx['selector'])]
+
+    def get_shadow_root(self, ctx: Any) -> Optional[DOMElement]:
+        return None
+
+    def screenshot(self, ctx: ScreenshotParams) -> None:
+        raise Exception("Can not take a screenshot of a parsed document")
+
+    def extract(self, ctx: ExtractParams) -> list[dict[str, Any]]:
+        return extract_from(self.element, ctx)
+
+    def get_outer_html(self, ctx: Any) -> str:
+        return html.tostring(self.element, encoding='unicode', with_tail=False)
+
+    def query(self, selector: str) -> list[html.HtmlElement]:
+        """
+        Like querySelectorAll: descendants of the element matching the selector against the whole document,
+        the element itself and its ancestors can match the left part of a combinator ('body li' from a ul).
+        """
+        if not depends_on_ancestors(selector):
+            # Matching from the element is enough, the element itself never matches
+            return [element for element in compile_selector(selector)(self.element) if element is not self.element]
+        matcher = compile_combinator_matcher(selector)
+        if matcher is not None:
+            # Only the element subtree is searched, ancestors are only walked up from the candidates
+            return matcher.select(self.element)
+        root = self.element
+        for ancestor in self.element.iterancestors():
+            root = ancestor
+        return [element for element in compile_selector(selector)(root) if any(ancestor is self.element for ancestor in element.iterancestors())]
+
+
+def extract_from(root: html.HtmlElement, ctx: ExtractParams) -> list[dict[str, Any]]:
+    fields = ExtractTask.normalize_fields(ctx['fields'])
+    rows: list[dict[str, Any]] = []
+    for container in ParsedDOMElement(root).query(ctx['container']):
+        rows.append({key: _extract_field(container, field) for key, field in fields})
+    return rows
+
+
+def _extract_field(container: html.HtmlElement, field: ExtractField) -> Any:
+    if field['selector']:
+        matches = ParsedDOMElement(container).query(field['selector'])
+        if not matches:
+            return None
+        element = ParsedDOMElement(matches[0])
+    else:
+        element = ParsedDOMElement(container)
+    if field['kind'] == 'attribute':
+        return element.get_attribute({'attribute_name': field['name']})
+    if field['kind'] == 'property':
+        return element.get_property(field['name'])
+    return element.get_text(None)
@@ -104,8 +104,21 @@ class ArrayPluckProcessor(PostProcessor):
     def process(self, value: list[dict[str, Any]]) -> list[Any]:
         return [item.get(self.key) for item in value if self.key in item]
 
+class PostProcessorChain(PostProcessor):
+    def __init__(self, processors: list[PostProcessor]):
+        self.processors = tuple(processors)
+
+    def process(self, value: Any) -> Any:
+        for processor in self.processors:
+            value = processor.process(value)
+        return value
+
 # Factory pour créer les processors
 class PostProcessorFactory:
+    @staticmethod
+    def create_chain(configs: list[dict[str, Any]]) -> PostProcessorChain:
+        return PostProcessorChain([PostProcessorFactory.create(config) for config in configs])
+
     @staticmethod
     def create(config: dict[str, Any]) -> PostProcessor:
         processor_type = config.get('type')
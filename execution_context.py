@@ -1,34 +1,74 @@
+from collections import ChainMap
 import logging
-from typing import Any
+from typing import Any, Iterator, Mapping
 
 from scrapping_playbook_framework.lib import value_resolver
 
+# Marks a key deleted in a child layer while it still exists in a parent layer
+_DELETED = object()
+
 class ExecutionContext():
-    def __init__(self):
-        self._variables: dict[str, Any] = {}
+    def __init__(self, parent: 'ExecutionContext | None' = None):
+        """
+        A context is a stack of layers, a child only holds its own writes and reads fall through to its parents.
+        :param parent: The context to layer this one on top of, if any.
+        """
+        self._parent = parent
+        if parent is None:
+            self._variables: ChainMap[str, Any] = ChainMap()
+        else:
+            self._variables = parent._variables.new_child()
+        # Bumped on every write, resolved values are memoized until the next write in this context or a parent
+        self._version = 0
+        self._resolved: dict[str, Any] = {}
+        self._resolved_version = 0
         logging.debug("Initialized new execution context.")
 
     def set_variable(self, key: str, value: Any) -> None:
         self._variables[key] = value
-    
+        self._version += 1
+
     def get_variable(self, key: str, default: Any = None) -> Any:
         keys = key.split('.')
-        current_value = self._variables
+        owner = self._owner(keys[0])
+        if owner is None:
+            return default
+        current_value: Any = owner._variables.maps[0]
         try:
             for k in keys:
                 if isinstance(current_value, dict): # type:ignore
                     current_value = current_value[k] # type:ignore
                 else:
                     return default
-            
-            return value_resolver.resolve(self, current_value)
+
+            # Resolved in the context that defines the variable, a parent template never sees the INDEX or item of an iteration
+            return value_resolver.resolve(owner, current_value)
         except (KeyError, TypeError):
             return default
-    
+
+    def _owner(self, key: str) -> 'ExecutionContext | None':
+        """
+        The context whose own layer defines a top level variable, None if it is not defined or deleted.
+        """
+        context: ExecutionContext | None = self
+        while context is not None:
+            layer = context._variables.maps[0]
+            if key in layer:
+                return None if layer[key] is _DELETED else context
+            context = context._parent
+        return None
+
     def delete(self, key: str) -> None:
-        if key in self._variables:
+        if key not in self._variables or self._variables[key] is _DELETED:
+            return
+        if self._parent is not None and key in self._parent._variables:
+            # Hide the parent value without touching the parent layer
+            self._variables[key] = _DELETED
+        else:
             del self._variables[key]
-            logging.debug(f"Deleted variable: {key}")
+        self._version += 1
+        logging.debug(f"Deleted variable: {key}")
+
     def inject_variables(self, dict: dict[str, Any]) -> 'ExecutionContext':
         for key, value in dict.items():
             self.set_variable(key, value)
@@ -36,14 +76,70 @@ class ExecutionContext():
 
     def provide_variables(self) -> dict[str, Any]:
         resolved_vars : dict[str, Any] = {}
-        for key in self._variables.keys():
+        for key in self.get_keys():
             resolved_vars[key] = self.get_variable(key)
         return resolved_vars
-    
+
+    def has_variable(self, key: str) -> bool:
+        return self._variables.get(key, _DELETED) is not _DELETED
+
+    def get_resolved(self, key: str) -> Any:
+        """
+        Resolve a top level variable, memoized until the next write.
+        :raise KeyError: If the variable is not defined.
+        """
+        owner = self._owner(key)
+        if owner is None:
+            raise KeyError(key)
+        if owner is not self:
+            # Memoized once in the defining context for all its children
+            return owner.get_resolved(key)
+        version = self._chain_version()
+        if version != self._resolved_version:
+            self._resolved = {}
+            self._resolved_version = version
+        if key in self._resolved:
+            return self._resolved[key]
+        value = value_resolver.resolve(self, self._variables[key])
+        self._resolved[key] = value
+        return value
+
+    def view(self) -> 'VariablesView':
+        """
+        Read-only mapping handed to tasks, a variable is only resolved when the task reads it.
+        """
+        return VariablesView(self)
+
+    def _chain_version(self) -> int:
+        version = 0
+        context: ExecutionContext | None = self
+        while context is not None:
+            version += context._version
+            context = context._parent
+        return version
+
     def get_keys(self) -> list[str]:
-        return list(self._variables.keys())
-    
+        return [key for key, value in self._variables.items() if value is not _DELETED]
+
     def clone(self) -> 'ExecutionContext':
-        new_context = ExecutionContext()
-        new_context._variables = self.provide_variables().copy()
-        return new_context
\ No newline at end of file
+        """
+        Create a child context in O(1), writes in the child never reach this context.
+        """
+        return ExecutionContext(parent=self)
+
+
+class VariablesView(Mapping[str, Any]):
+    def __init__(self, context: ExecutionContext):
+        self._context = context
+
+    def __getitem__(self, key: str) -> Any:
+        return self._context.get_resolved(key)
+
+    def __contains__(self, key: object) -> bool:
+        return isinstance(key, str) and self._context.has_variable(key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._context.get_keys())
+
+    def __len__(self) -> int:
+        return len(self._context.get_keys())
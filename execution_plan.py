@@ -0,0 +1,216 @@
+import logging
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Any, Callable, Iterator, Mapping, Optional
+
+from scrapping_playbook_framework.core.post_processor import PostProcessorChain, PostProcessorFactory
+from scrapping_playbook_framework.execution_context import ExecutionContext
+from scrapping_playbook_framework.lib import value_resolver
+from scrapping_playbook_framework.lib.task_cache import parse_ttl
+from scrapping_playbook_framework.task.export_task import StreamingExporterFactory
+from scrapping_playbook_framework.playbook_reader import PlaybookCondition, PlaybookDict, PlaybookTask, PlaybookTask_ATTRIBUTES
+
+
+@dataclass(frozen=True)
+class VariableReference:
+    """
+    A pre-parsed `$variable.path` parameter value.
+    The path can walk attributes or dict keys, usefull to access values returned by iterate task
+    """
+    raw: str
+    name: str
+    path: tuple[str, ...]
+
+    @staticmethod
+    def parse(raw: str) -> 'VariableReference':
+        parts = raw[1:].split('.')
+        return VariableReference(raw=raw, name=parts[0], path=tuple(parts[1:]))
+
+    def resolve(self, context: ExecutionContext) -> Any:
+        variable_value = context.get_variable(self.name)
+        if variable_value is None:
+            return None
+        for part in self.path:
+            if hasattr(variable_value, part):
+                variable_value = getattr(variable_value, part)
+            elif isinstance(variable_value, dict) and part in variable_value:
+                variable_value = variable_value[part] # type: ignore
+            else:
+                logging.warning(f"Could not resolve {part} in {self.raw[1:]}")
+                return None
+        return variable_value
+
+
+def _is_template(value: Any) -> bool:
+    return isinstance(value, str) and '{{' in value
+
+
+def _check_equals(value: Any, operand: Any) -> bool:
+    return value == operand
+
+def _check_not_equals(value: Any, operand: Any) -> bool:
+    return value != float(operand)
+
+def _check_greater_than(value: Any, operand: Any) -> bool:
+    return float(value) > float(operand)
+
+def _check_less_than(value: Any, operand: Any) -> bool:
+    return float(value) < float(operand)
+
+
+@dataclass(frozen=True)
+class CompiledCondition:
+    """
+    A PlaybookCondition reduced to the list of checks that are actually set.
+    Operands without template are kept as is and never go through the value resolver.
+    """
+    variable: str
+    is_defined: Optional[bool]
+    checks: tuple[tuple[Callable[[Any, Any], bool], Any, bool], ...]
+
+    @staticmethod
+    def compile(condition: PlaybookCondition) -> 'CompiledCondition':
+        checks: list[tuple[Callable[[Any, Any], bool], Any, bool]] = []
+        for check, operand in (
+            (_check_equals, condition.equals),
+            (_check_not_equals, condition.not_equals),
+            (_check_greater_than, condition.greater_than),
+            (_check_less_than, condition.less_than),
+        ):
+            if operand is not None:
+                checks.append((check, operand, _is_template(operand)))
+        return CompiledCondition(variable=condition.variable, is_defined=condition.is_defined, checks=tuple(checks))
+
+    def evaluate(self, context: ExecutionContext) -> bool:
+        value = context.get_variable(self.variable)
+        if self.is_defined is not None and (value is not None) != self.is_defined:
+            return False
+        for check, operand, is_template in self.checks:
+            if is_template:
+                operand = value_resolver.resolve(context, operand)
+            if not check(value, operand):
+                return False
+        return True
+
+
+@dataclass(frozen=True)
+class CompiledTask:
+    """
+    Immutable, ready to run version of a PlaybookTask.
+    Everything that does not depend on the execution context is computed once here.
+    """
+    name: str
+    action: str
+    output: Optional[str]
+    static_params: Mapping[str, Any]
+    variable_params: tuple[tuple[str, VariableReference], ...]
+    conditions: tuple[CompiledCondition, ...]
+    filters: tuple[CompiledCondition, ...]
+    post_processors: Optional[PostProcessorChain]
+    map: Optional[str]
+    is_map: bool
+    item_name: str
+    flatten: bool
+    parallel: int
+    ordered: bool
+    exporters: tuple[Mapping[str, Any], ...]
+    checkpoint_key: Optional[str]
+    incremental: bool
+    fingerprint: Optional[str]
+    cache_ttl: Optional[float]
+    tasks: tuple['CompiledTask', ...]
+    debug: bool
+    source: PlaybookTask = field(repr=False, compare=False)
+    # Index of the task in its task list, and of its parents, e.g. (2, 0) for the first nested task of the third task
+    position: tuple[int, ...] = ()
+
+    @property
+    def path_segment(self) -> str:
+        """
+        Identifies the task among the tasks of the plan in checkpoint paths, siblings may share a name.
+        """
+        return f"{'.'.join(str(index) for index in self.position)}:{self.name}"
+
+    def resolve_params(self, context: ExecutionContext) -> dict[str, Any]:
+        params = dict(self.static_params)
+        for key, reference in self.variable_params:
+            variable_value = reference.resolve(context)
+            if variable_value is not None:
+                params[key] = variable_value
+            else:
+                logging.warning(f"Variable {reference.name} not found in context for parameter {key}")
+        return params
+
+
+@dataclass(frozen=True)
+class ExecutionPlan:
+    tasks: tuple[CompiledTask, ...]
+    config: Mapping[str, Any]
+
+    def iter_tasks(self) -> Iterator[CompiledTask]:
+        """
+        Every task of the plan, nested ones included.
+        """
+        pending = list(self.tasks)
+        while pending:
+            task = pending.pop()
+            yield task
+            pending.extend(task.tasks)
+
+    def has_cached_tasks(self) -> bool:
+        return any(task.cache_ttl is not None for task in self.iter_tasks())
+
+    def has_incremental_maps(self) -> bool:
+        return any(task.is_map and task.incremental for task in self.iter_tasks())
+
+
+def compile_task(task: PlaybookTask, position: tuple[int, ...] = ()) -> CompiledTask:
+    for exporter_config in task.export or []:
+        # Fail on unknown exporter types before the first task runs, exporters are only opened when the loop starts
+        StreamingExporterFactory.create(exporter_config)
+
+    static_params: dict[str, Any] = {}
+    variable_params: list[tuple[str, VariableReference]] = []
+    for key, value in task.model_dump().items():
+        if key in PlaybookTask_ATTRIBUTES:
+            continue
+        # Unresolved references fall back to the raw string, like any static value
+        static_params[key] = value
+        if isinstance(value, str) and value.startswith("$"):
+            variable_params.append((key, VariableReference.parse(value)))
+
+    return CompiledTask(
+        name=task.name,
+        action=task.action,
+        output=task.output,
+        static_params=MappingProxyType(static_params),
+        variable_params=tuple(variable_params),
+        conditions=tuple(CompiledCondition.compile(c) for c in task.when or []),
+        filters=tuple(CompiledCondition.compile(f) for f in task.filters or []),
+        post_processors=PostProcessorFactory.create_chain(task.post_process) if task.post_process else None,
+        map=task.map,
+        is_map=task.map is not None and task.tasks is not None,
+        item_name=task.item_name or "item",
+        flatten=bool(task.flatten),
+        parallel=max(task.parallel or 1, 1),
+        ordered=task.ordered is not False,
+        exporters=tuple(MappingProxyType(dict(config)) for config in task.export or []),
+        checkpoint_key=task.checkpoint_key,
+        incremental=bool(task.incremental),
+        fingerprint=task.incremental if isinstance(task.incremental, str) else None,
+        cache_ttl=parse_ttl(task.cache),
+        tasks=tuple(compile_task(t, position + (index,)) for index, t in enumerate(task.tasks or [])),
+        debug=bool(task.debug),
+        source=task,
+        position=position,
+    )
+
+
+def compile_playbook(playbook_dict: PlaybookDict) -> ExecutionPlan:
+    """
+    Compile a validated playbook into an immutable execution plan, done once per Worker
+    """
+    return ExecutionPlan(
+        tasks=tuple(compile_task(t, (index,)) for index, t in enumerate(playbook_dict.tasks)),
+        config=MappingProxyType(dict(playbook_dict.config)),
+    )
@@ -0,0 +1,29 @@
+from typing import Any
+
+from scrapping_playbook_framework.http_engine.http_browser import HttpGoBackTask, HttpGoToTask, HttpPage
+from scrapping_playbook_framework.http_engine.http_dom_task import HttpExtractTask, HttpGetElementTask, HttpGetElementsTask, HttpSnapshotTask
+from scrapping_playbook_framework.http_engine.http_wait_task import HttpWaitForDomStableTask, HttpWaitForElementTask, HttpWaitForNetworkIdleTask, HttpWaitTask
+from scrapping_playbook_framework.task.browser_task import DownloadMany, DownloadUrl
+from scrapping_playbook_framework.task.export_task import CSVExportTask, SQLiteExportTask
+from scrapping_playbook_framework.task.task import ScrappingTask
+
+def get_http_tasks(page: HttpPage) -> list[ScrappingTask[Any]]:
+    """
+    Tasks of the browserless engine, interactions (click, keyboard, scroll, screenshot) have no meaning here.
+    """
+    return [
+        HttpGoToTask(page),
+        HttpGoBackTask(page),
+        HttpGetElementTask(page),
+        HttpGetElementsTask(page),
+        HttpExtractTask(page),
+        HttpSnapshotTask(page),
+        HttpWaitTask(),
+        HttpWaitForElementTask(page),
+        HttpWaitForNetworkIdleTask(),
+        HttpWaitForDomStableTask(),
+        DownloadUrl(cookies_provider=page.get_cookies),
+        DownloadMany(cookies_provider=page.get_cookies),
+        CSVExportTask(),
+        SQLiteExportTask(),
+    ]
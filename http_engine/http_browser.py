@@ -0,0 +1,64 @@
+import logging
+from typing import Any, Optional
+
+from lxml import html
+from requests.cookies import RequestsCookieJar
+
+from scrapping_playbook_framework.core.parsed_dom_element import parse_html
+from scrapping_playbook_framework.lib.http_session import get_session
+from scrapping_playbook_framework.task.browser_task import GoBackTask, GoToParams, GoToTask
+
+class HttpPage:
+    """
+    State of a browserless session: the current document, its history and the cookies set by the sites.
+    """
+    def __init__(self, timeout: float = 30):
+        self.timeout = timeout
+        self.url: Optional[str] = None
+        self.status_code: Optional[int] = None
+        self.document: Optional[html.HtmlElement] = None
+        self.cookies = RequestsCookieJar()
+        self.history: list[str] = []
+
+    def load(self, url: str) -> None:
+        response = get_session().get(url, cookies=self.cookies, timeout=self.timeout)
+        for step in [*response.history, response]:
+            self.cookies.update(step.cookies)
+        if response.status_code >= 400:
+            logging.warning(f"GET {url} returned {response.status_code}")
+        # Only trust the charset of the headers, otherwise let the parser read the <meta> of the page
+        encoding = response.encoding if 'charset' in response.headers.get('content-type', '').lower() else None
+        self.document = parse_html(response.content, base_url=response.url, encoding=encoding)
+        self.url = response.url
+        self.status_code = response.status_code
+
+    def require_document(self) -> html.HtmlElement:
+        if self.document is None:
+            raise Exception("No page loaded, run browser.goto first")
+        return self.document
+
+    def get_cookies(self) -> list[dict[str, Any]]:
+        return [{'name': cookie.name, 'value': cookie.value, 'domain': cookie.domain, 'path': cookie.path} for cookie in self.cookies]
+
+
+class HttpGoToTask(GoToTask):
+    def __init__(self, page: HttpPage):
+        super().__init__()
+        self.page = page
+
+    def execute(self, ctx: GoToParams) -> None:
+        if self.page.url is not None:
+            self.page.history.append(self.page.url)
+        self.page.load(ctx['url'])
+
+
+class HttpGoBackTask(GoBackTask):
+    def __init__(self, page: HttpPage):
+        super().__init__()
+        self.page = page
+
+    def execute(self, ctx: Any) -> None:
+        if not self.page.history:
+            logging.warning("No previous page to go back to")
+            return
+        self.page.load(self.page.history.pop())
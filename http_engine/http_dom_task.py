@@ -0,0 +1,38 @@
+from typing import Any, Optional
+
+from scrapping_playbook_framework.core.parsed_dom_element import ParsedDOMElement, extract_from
+from scrapping_playbook_framework.http_engine.http_browser import HttpPage
+from scrapping_playbook_framework.task.dom_task import DOMElement, ExtractParams, ExtractTask, GetElementTask, GetElementsTask, SelectorParams, SnapshotParams, SnapshotTask
+
+class HttpGetElementTask(GetElementTask):
+    def __init__(self, page: HttpPage):
+        self.page = page
+
+    def execute(self, ctx: SelectorParams) -> Optional[DOMElement]:
+        return ParsedDOMElement(self.page.require_document()).get_element(ctx)
+
+class HttpGetElementsTask(GetElementsTask):
+    def __init__(self, page: HttpPage):
+        self.page = page
+
+    def execute(self, ctx: SelectorParams) -> list[DOMElement]:
+        return ParsedDOMElement(self.page.require_document()).get_elements(ctx)
+
+class HttpExtractTask(ExtractTask):
+    def __init__(self, page: HttpPage):
+        self.page = page
+
+    def execute(self, ctx: ExtractParams) -> list[dict[str, Any]]:
+        return extract_from(self.page.require_document(), ctx)
+
+class HttpSnapshotTask(SnapshotTask):
+    """
+    The fetched document already is a local tree, the snapshot is the tree itself.
+    """
+    def __init__(self, page: HttpPage):
+        self.page = page
+
+    def execute(self, ctx: SnapshotParams) -> Optional[DOMElement]:
+        root = ParsedDOMElement(self.page.require_document())
+        selector = ctx.get('selector')
+        return root.get_element({'selector': selector}) if selector else root
@@ -0,0 +1,37 @@
+import time
+
+from scrapping_playbook_framework.http_engine.http_browser import HttpPage
+from scrapping_playbook_framework.http_engine.http_dom_task import HttpGetElementTask
+from scrapping_playbook_framework.task.dom_task import DOMElement
+from scrapping_playbook_framework.task.wait_task import WaitForDomStableTask, WaitForDomStableTaskParams, WaitForElementTask, WaitForElementTaskParams, WaitForNetworkIdleTask, WaitForNetworkIdleTaskParams, WaitTask, WaitTaskParams
+
+class HttpWaitTask(WaitTask):
+    def execute(self, ctx: WaitTaskParams) -> None:
+        time.sleep(ctx['duration'])
+
+class HttpWaitForElementTask(WaitForElementTask):
+    """
+    A fetched document never changes, the element is either there or will never be.
+    """
+    def __init__(self, page: HttpPage):
+        self._get_element_task = HttpGetElementTask(page)
+
+    def execute(self, ctx: WaitForElementTaskParams) -> DOMElement:
+        element = self._get_element_task.execute(ctx)
+        if element is None:
+            raise Exception(f"Element with selector '{ctx['selector']}' not found in the fetched document")
+        return element
+
+class HttpWaitForNetworkIdleTask(WaitForNetworkIdleTask):
+    """
+    The document is fully fetched before goto returns, nothing is left to wait for.
+    """
+    def execute(self, ctx: WaitForNetworkIdleTaskParams) -> float:
+        return 0.0
+
+class HttpWaitForDomStableTask(WaitForDomStableTask):
+    """
+    No script runs on a fetched document, it is stable as soon as it is parsed.
+    """
+    def execute(self, ctx: WaitForDomStableTaskParams) -> float:
+        return 0.0
@@ -0,0 +1,19 @@
+import os
+import sys
+
+APP_NAME = "browser-playbook"
+
+
+def user_cache_dir(*parts: str) -> str:
+    """
+    Per-user cache directory of the framework: $XDG_CACHE_HOME, ~/Library/Caches or %LOCALAPPDATA%.
+    :param parts: Sub-directories joined to the cache directory.
+    :return: The path, not created.
+    """
+    if sys.platform == 'win32':
+        base = os.environ.get('LOCALAPPDATA') or os.path.expanduser(os.path.join('~', 'AppData', 'Local'))
+    elif sys.platform == 'darwin':
+        base = os.path.expanduser(os.path.join('~', 'Library', 'Caches'))
+    else:
+        base = os.environ.get('XDG_CACHE_HOME') or os.path.expanduser(os.path.join('~', '.cache'))
+    return os.path.join(base, APP_NAME, *parts)
@@ -0,0 +1,169 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+import logging
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Iterator, Optional
+
+from scrapping_playbook_framework.lib import value_resolver
+from scrapping_playbook_framework.lib.iteration_store import IterationStore, StoredIteration, stable_hash
+from scrapping_playbook_framework.task.dom_task import DOMElement
+
+if TYPE_CHECKING:
+    from scrapping_playbook_framework.execution_context import ExecutionContext
+
+# Items of incremental maps not seen for 30 days are forgotten
+DEFAULT_MAX_AGE = 30 * 24 * 3600
+
+# Map iterations currently running, e.g. ("1:Read categories[3]",) while running the nested tasks of the 4th category
+_iteration_path: ContextVar[tuple[str, ...]] = ContextVar('iteration_path', default=())
+
+
+class MapCheckpoint:
+    """
+    Completed iterations of one map task, loaded once when the loop starts.
+    """
+    # Status of the iteration span when its outputs are restored
+    restored_status = 'restored'
+
+    def __init__(self, store: IterationStore, namespace: str, task_path: str, key_template: Optional[str]):
+        self.store = store
+        self.namespace = namespace
+        self.task_path = task_path
+        self.key_template = key_template
+        self.completed: dict[str, StoredIteration] = store.load(namespace, task_path)
+        if self.completed:
+            logging.info(f"Resuming {task_path}: {len(self.completed)} iterations restored from checkpoint")
+
+    def item_key(self, index: int, sub_context: 'ExecutionContext') -> str:
+        if self.key_template is None:
+            return str(index)
+        return str(value_resolver.resolve(sub_context, self.key_template))
+
+    def identify(self, index: int, sub_context: 'ExecutionContext') -> tuple[str, Optional[str]]:
+        """
+        :return: The item key and the fingerprint of the item content, None when the content is not compared.
+        """
+        return self.item_key(index, sub_context), None
+
+    def restore(self, item_key: str, fingerprint: Optional[str] = None) -> Optional[dict[str, Any]]:
+        stored = self.completed.get(item_key)
+        if stored is None or stored.fingerprint != fingerprint:
+            return None
+        return stored.outputs
+
+    def save(self, item_key: str, outputs: dict[str, Any], fingerprint: Optional[str] = None) -> None:
+        self.store.save(self.namespace, self.task_path, item_key, outputs, fingerprint)
+
+    @contextmanager
+    def iteration(self, task_segment: str, item_key: str) -> Iterator[None]:
+        """
+        Nested maps started in the block get a path of their own for this item.
+        :param task_segment: The map task in the path, see CompiledTask.path_segment.
+        """
+        token = _iteration_path.set(_iteration_path.get() + (f"{task_segment}[{item_key}]",))
+        try:
+            yield
+        finally:
+            _iteration_path.reset(token)
+
+
+class IncrementalMap(MapCheckpoint):
+    """
+    Iterations of a map kept across runs, an item whose fingerprint did not change since the last run
+    reuses its previous outputs instead of running the nested tasks again.
+    """
+    restored_status = 'unchanged'
+
+    def __init__(self, incremental: 'Incremental', task_path: str, key_template: Optional[str], item_name: str, fingerprint_template: Optional[str]):
+        self.incremental = incremental
+        self.item_name = item_name
+        self.fingerprint_template = fingerprint_template
+        super().__init__(incremental.store, incremental.namespace, task_path, key_template)
+
+    def fingerprint(self, sub_context: 'ExecutionContext') -> str:
+        if self.fingerprint_template is not None:
+            return stable_hash(value_resolver.resolve(sub_context, self.fingerprint_template))
+        item = sub_context.get_variable(self.item_name)
+        if isinstance(item, DOMElement):
+            outer_html = item.get_outer_html(None)
+            # Engines without HTML fall back to the text, a change of attributes only is not seen
+            return stable_hash(outer_html if outer_html is not None else item.get_text(None))
+        return stable_hash(item)
+
+    def identify(self, index: int, sub_context: 'ExecutionContext') -> tuple[str, Optional[str]]:
+        fingerprint = self.fingerprint(sub_context)
+        # Without a key, items are identified by their content: a moved item is still found
+        item_key = fingerprint if self.key_template is None else self.item_key(index, sub_context)
+        return item_key, fingerprint
+
+    def restore(self, item_key: str, fingerprint: Optional[str] = None) -> Optional[dict[str, Any]]:
+        outputs = super().restore(item_key, fingerprint)
+        if outputs is not None:
+            self.incremental.keep(self.task_path, item_key)
+        return outputs
+
+
+class Incremental:
+    """
+    Map iterations of a playbook kept from run to run, items not seen for `max_age` seconds are forgotten.
+    """
+    def __init__(self, store: IterationStore, namespace: str, max_age: float = DEFAULT_MAX_AGE):
+        """
+        :param namespace: Identifies the playbook, a hash of its file path and content. Runs over other inputs share it,
+            items are told apart by their key or their content.
+        """
+        self.store = store
+        self.namespace = namespace
+        self.max_age = max_age
+        self._kept: list[tuple[str, str]] = []
+        self._lock = threading.Lock()
+
+    def for_map(self, task_segment: str, key_template: Optional[str], item_name: str, fingerprint_template: Optional[str] = None) -> IncrementalMap:
+        """
+        :param task_segment: The map task in the path, see CompiledTask.path_segment.
+        """
+        task_path = "/".join(_iteration_path.get() + (task_segment,))
+        return IncrementalMap(self, task_path, key_template, item_name, fingerprint_template)
+
+    def keep(self, task_path: str, item_key: str) -> None:
+        with self._lock:
+            self._kept.append((task_path, item_key))
+
+    def prune(self) -> None:
+        """
+        Once a run completed, mark the reused items as seen with their nested iterations and forget the items gone for too long.
+        """
+        with self._lock:
+            kept, self._kept = self._kept, []
+        now = time.time()
+        self.store.touch(self.namespace, kept, now)
+        deleted = self.store.prune(self.namespace, now - self.max_age)
+        if deleted:
+            logging.info(f"Forgot {deleted} items not seen for {self.max_age / 86400:g} days")
+
+
+class Checkpoint:
+    """
+    Persist the outputs of every completed map iteration of a run, a crashed run restarted with the same
+    playbook and inputs skips the iterations already done.
+    """
+    def __init__(self, store: IterationStore, run_key: str):
+        """
+        :param run_key: Identifies the run, a hash of the playbook (file path and content) and its input variables.
+        """
+        self.store = store
+        self.run_key = run_key
+
+    def for_map(self, task_segment: str, key_template: Optional[str] = None) -> MapCheckpoint:
+        """
+        :param task_segment: The map task in the path, see CompiledTask.path_segment.
+        """
+        task_path = "/".join(_iteration_path.get() + (task_segment,))
+        return MapCheckpoint(self.store, self.run_key, task_path, key_template)
+
+    def clear(self) -> None:
+        """
+        Forget the run once it completed, the next run starts from scratch.
+        """
+        self.store.clear(self.run_key)
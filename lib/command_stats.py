@@ -0,0 +1,109 @@
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+import threading
+from typing import Iterator, Optional
+
+# Upper bounds of the latency histogram buckets in milliseconds, the last bucket catches everything above
+HISTOGRAM_BOUNDS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+OUTSIDE_TASKS = '(outside tasks)'
+
+_current_task: ContextVar[Optional[str]] = ContextVar('current_task', default=None)
+_active_stats: ContextVar[Optional['CommandStats']] = ContextVar('active_command_stats', default=None)
+
+@contextmanager
+def task_scope(task_name: str) -> Iterator[None]:
+    """
+    Attribute the commands sent until the end of the block to task_name.
+    """
+    token = _current_task.set(task_name)
+    try:
+        yield
+    finally:
+        _current_task.reset(token)
+
+@contextmanager
+def collect_commands(stats: 'CommandStats') -> Iterator['CommandStats']:
+    """
+    Record the commands sent until the end of the block in stats, engines report through record_command.
+    """
+    token = _active_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _active_stats.reset(token)
+
+def record_command(command: str, duration: float) -> None:
+    stats = _active_stats.get()
+    if stats is not None:
+        stats.record(_current_task.get() or OUTSIDE_TASKS, command, duration)
+
+
+@dataclass
+class CommandStat:
+    count: int = 0
+    total: float = 0.0
+    max: float = 0.0
+    histogram: list[int] = field(default_factory=lambda: [0] * (len(HISTOGRAM_BOUNDS_MS) + 1))
+
+    def add(self, duration: float) -> None:
+        self.count += 1
+        self.total += duration
+        self.max = max(self.max, duration)
+        self.histogram[bisect_left(HISTOGRAM_BOUNDS_MS, duration * 1000)] += 1
+
+    def percentile(self, ratio: float) -> float:
+        """
+        Upper bound in seconds of the bucket holding the percentile, the max for the last bucket.
+        """
+        target = ratio * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.histogram):
+            seen += bucket_count
+            if seen >= target and bucket_count:
+                return min(HISTOGRAM_BOUNDS_MS[index] / 1000, self.max) if index < len(HISTOGRAM_BOUNDS_MS) else self.max
+        return self.max
+
+
+class CommandStats:
+    """
+    Count and latency histograms of engine commands (WebDriver round trips...) per task and command.
+    """
+    def __init__(self):
+        self.stats: dict[tuple[str, str], CommandStat] = {}
+        self._lock = threading.Lock()
+
+    def record(self, task_name: str, command: str, duration: float) -> None:
+        with self._lock:
+            stat = self.stats.get((task_name, command))
+            if stat is None:
+                stat = self.stats[(task_name, command)] = CommandStat()
+            stat.add(duration)
+
+    def total_count(self) -> int:
+        return sum(stat.count for stat in self.stats.values())
+
+    def total_time(self) -> float:
+        return sum(stat.total for stat in self.stats.values())
+
+    def summary(self, limit: int = 15) -> str:
+        """
+        Table of the (task, command) pairs that spent the most time in round trips.
+        """
+        with self._lock:
+            rows = sorted(self.stats.items(), key=lambda row: row[1].total, reverse=True)
+        task_width = max([len('task')] + [len(task_name) for (task_name, _), _ in rows[:limit]])
+        command_width = max([len('command')] + [len(command) for (_, command), _ in rows[:limit]])
+        lines = [
+            f"{self.total_count()} commands, {self.total_time():.2f}s of round trips",
+            f"{'task':<{task_width}}  {'command':<{command_width}}  {'count':>6}  {'total ms':>9}  {'mean ms':>8}  {'p50 ms':>7}  {'p95 ms':>7}  {'max ms':>7}",
+        ]
+        for (task_name, command), stat in rows[:limit]:
+            lines.append(
+                f"{task_name:<{task_width}}  {command:<{command_width}}  {stat.count:>6}  {stat.total * 1000:>9.1f}  {stat.total / stat.count * 1000:>8.1f}"
+                f"  {stat.percentile(0.5) * 1000:>7.1f}  {stat.percentile(0.95) * 1000:>7.1f}  {stat.max * 1000:>7.1f}"
+            )
+        if len(rows) > limit:
+            lines.append(f"... {len(rows) - limit} more")
+        return "\n".join(lines)
@@ -0,0 +1,36 @@
+from http.cookiejar import DefaultCookiePolicy
+import threading
+from typing import Any, Optional
+
+from requests import Session
+from requests.adapters import HTTPAdapter
+from requests.cookies import RequestsCookieJar
+
+DEFAULT_POOL_SIZE = 32
+
+_session: Optional[Session] = None
+_session_lock = threading.Lock()
+
+def get_session() -> Session:
+    """
+    Process wide requests session, connections are kept alive and reused across tasks and threads.
+    It never stores cookies, so sessions can not leak into each other: pass them per request instead.
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = Session()
+            _session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+            adapter = HTTPAdapter(pool_connections=DEFAULT_POOL_SIZE, pool_maxsize=DEFAULT_POOL_SIZE)
+            _session.mount("http://", adapter)
+            _session.mount("https://", adapter)
+        return _session
+
+def cookies_from_browser(browser_cookies: list[dict[str, Any]]) -> RequestsCookieJar:
+    """
+    Convert WebDriver style cookies ({name, value, domain, path...}) to a jar that keeps their domain scope.
+    """
+    jar = RequestsCookieJar()
+    for cookie in browser_cookies:
+        jar.set(cookie['name'], cookie['value'], domain=cookie.get('domain', ''), path=cookie.get('path', '/'))
+    return jar
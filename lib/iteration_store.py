@@ -0,0 +1,108 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Optional
+
+from scrapping_playbook_framework.lib.cache_dir import user_cache_dir
+
+def default_incremental_path() -> str:
+    """Iterations of incremental maps are kept in the per-user cache directory, not in the working directory"""
+    return user_cache_dir("incremental.sqlite")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS iterations (
+    namespace TEXT NOT NULL,
+    task_path TEXT NOT NULL,
+    item_key TEXT NOT NULL,
+    fingerprint TEXT,
+    outputs TEXT NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (namespace, task_path, item_key)
+)
+"""
+
+def stable_hash(*values: Any) -> str:
+    """Hash of JSON serializable values, independent of dict ordering"""
+    content = json.dumps(values, sort_keys=True, default=str)
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+
+class StoredIteration:
+    def __init__(self, outputs: dict[str, Any], fingerprint: Optional[str]):
+        self.outputs = outputs
+        self.fingerprint = fingerprint
+
+
+class IterationStore:
+    """
+    SQLite store of map iteration outputs, keyed by a namespace (a run, a playbook...), the map task path and the item key.
+    Outputs are stored as JSON, values that are not serializable (elements...) are stored as strings.
+    """
+    def __init__(self, file_path: str):
+        directory = os.path.dirname(file_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.file_path = file_path
+        # Parallel loops save from their pool threads
+        self._connection = sqlite3.connect(file_path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock:
+            # One commit per iteration, WAL keeps them cheap and a crash never loses a committed iteration
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("PRAGMA synchronous=NORMAL")
+            self._connection.execute(SCHEMA)
+            self._connection.commit()
+
+    def load(self, namespace: str, task_path: str) -> dict[str, StoredIteration]:
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT item_key, outputs, fingerprint FROM iterations WHERE namespace = ? AND task_path = ?",
+                (namespace, task_path),
+            ).fetchall()
+        return {item_key: StoredIteration(json.loads(outputs), fingerprint) for item_key, outputs, fingerprint in rows}
+
+    def save(self, namespace: str, task_path: str, item_key: str, outputs: dict[str, Any], fingerprint: Optional[str] = None) -> None:
+        serialized = json.dumps(outputs, default=str)
+        with self._lock:
+            self._connection.execute(
+                "INSERT INTO iterations (namespace, task_path, item_key, fingerprint, outputs, updated_at) VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (namespace, task_path, item_key) DO UPDATE SET fingerprint = excluded.fingerprint, outputs = excluded.outputs, updated_at = excluded.updated_at",
+                (namespace, task_path, item_key, fingerprint, serialized, time.time()),
+            )
+            self._connection.commit()
+
+    def touch(self, namespace: str, items: list[tuple[str, str]], touched_at: float) -> None:
+        """
+        Mark items, and the iterations of the maps nested in them, as still in use.
+        :param items: (task_path, item_key) pairs.
+        """
+        with self._lock:
+            for task_path, item_key in items:
+                nested_prefix = f"{task_path}[{item_key}]/"
+                self._connection.execute(
+                    "UPDATE iterations SET updated_at = ? WHERE namespace = ? AND ((task_path = ? AND item_key = ?) OR substr(task_path, 1, ?) = ?)",
+                    (touched_at, namespace, task_path, item_key, len(nested_prefix), nested_prefix),
+                )
+            self._connection.commit()
+
+    def prune(self, namespace: str, before: float) -> int:
+        """
+        Delete the items not saved nor touched since `before`.
+        :return: The number of deleted items.
+        """
+        with self._lock:
+            deleted = self._connection.execute("DELETE FROM iterations WHERE namespace = ? AND updated_at < ?", (namespace, before)).rowcount
+            self._connection.commit()
+        return deleted
+
+    def clear(self, namespace: str) -> None:
+        with self._lock:
+            self._connection.execute("DELETE FROM iterations WHERE namespace = ?", (namespace,))
+            self._connection.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
@@ -0,0 +1,66 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+import threading
+from typing import Iterator, Optional
+
+_active_stats: ContextVar[Optional['NetworkStats']] = ContextVar('active_network_stats', default=None)
+
+@contextmanager
+def collect_network(stats: 'NetworkStats') -> Iterator['NetworkStats']:
+    """
+    Record the requests reported until the end of the block in stats, engines report through record_request.
+    """
+    token = _active_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _active_stats.reset(token)
+
+def record_request(resource_type: str, blocked: bool, transferred: int = 0) -> None:
+    stats = _active_stats.get()
+    if stats is not None:
+        stats.record(resource_type, blocked, transferred)
+
+
+class NetworkStats:
+    """
+    Requests made by the browser sessions of a run, per resource type (Document, Image, Script...).
+    """
+    def __init__(self):
+        self.requests: dict[str, int] = {}
+        self.blocked: dict[str, int] = {}
+        self.transferred: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def record(self, resource_type: str, blocked: bool, transferred: int = 0) -> None:
+        with self._lock:
+            self.requests[resource_type] = self.requests.get(resource_type, 0) + 1
+            if blocked:
+                self.blocked[resource_type] = self.blocked.get(resource_type, 0) + 1
+            self.transferred[resource_type] = self.transferred.get(resource_type, 0) + transferred
+
+    def total_requests(self) -> int:
+        return sum(self.requests.values())
+
+    def total_blocked(self) -> int:
+        return sum(self.blocked.values())
+
+    def total_transferred(self) -> int:
+        return sum(self.transferred.values())
+
+    def summary(self) -> str:
+        """
+        Table of the requests, blocked requests and bytes transferred per resource type.
+        """
+        with self._lock:
+            rows = sorted(self.requests.items(), key=lambda row: row[1], reverse=True)
+        type_width = max([len('type')] + [len(resource_type) for resource_type, _ in rows])
+        lines = [
+            f"{self.total_requests()} requests, {self.total_blocked()} blocked, {self.total_transferred() / 1024:.1f} KiB transferred",
+            f"{'type':<{type_width}}  {'requests':>8}  {'blocked':>7}  {'KiB':>9}",
+        ]
+        for resource_type, count in rows:
+            lines.append(
+                f"{resource_type:<{type_width}}  {count:>8}  {self.blocked.get(resource_type, 0):>7}  {self.transferred.get(resource_type, 0) / 1024:>9.1f}"
+            )
+        return "\n".join(lines)
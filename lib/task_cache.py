@@ -0,0 +1,191 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Optional
+
+from scrapping_playbook_framework.lib.cache_dir import user_cache_dir
+
+def default_cache_path() -> str:
+    """Task outputs are cached in the per-user cache directory, not in the working directory"""
+    return user_cache_dir("task_cache.sqlite")
+
+DEFAULT_TTL = 24 * 3600
+DEFAULT_MAX_SIZE = 256 * 1024 * 1024
+
+NAVIGATION_ACTION = 'browser.goto'
+# Cached on their params only, whatever page the session is on
+PAGE_INDEPENDENT_ACTIONS = {'browser.download_url', 'browser.download_many'}
+# Running them does not move the session to another page, the known page url stays valid
+READ_ONLY_ACTIONS = {
+    'wait', 'wait.for_element', 'wait.for_network_idle', 'wait.for_dom_stable',
+    'dom.get_element', 'dom.get_elements', 'dom.extract', 'dom.snapshot',
+    'export.csv', 'export.sqlite', 'browser.screenshot', 'browser.download_url', 'browser.download_many',
+}
+READ_ONLY_METHODS = {'get_text', 'get_attribute', 'get_property', 'get_position', 'get_element', 'get_elements', 'get_shadow_root', 'get_outer_html', 'extract', 'screenshot'}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    expires_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+)
+"""
+
+def parse_ttl(cache: Any) -> Optional[float]:
+    """
+    TTL in seconds of a `cache:` task attribute: true, a number of seconds or {ttl: seconds}. None when not cached.
+    """
+    if cache is None or cache is False:
+        return None
+    if cache is True:
+        return DEFAULT_TTL
+    if isinstance(cache, (int, float)):
+        return float(cache)
+    if isinstance(cache, dict):
+        return float(cache.get('ttl', DEFAULT_TTL))
+    raise ValueError(f"Invalid cache setting: {cache}, expected true, a TTL in seconds or {{ttl: seconds}}")
+
+def cached_files_exist(action: str, params: dict[str, Any], output: Any) -> bool:
+    """
+    A cached download is only valid while the downloaded files are still there.
+    """
+    if action == 'browser.download_url':
+        return os.path.exists(params.get('path') or '')
+    if action == 'browser.download_many':
+        return all(os.path.exists(result['path']) for result in output or [] if result.get('ok'))
+    return True
+
+def is_read_only(action: str) -> bool:
+    if action.startswith('$'):
+        return action.rsplit('.', 1)[-1] in READ_ONLY_METHODS
+    return action in READ_ONLY_ACTIONS
+
+
+class TaskCache:
+    """
+    SQLite cache of task outputs with a TTL per entry, least recently used entries are evicted above max_size bytes.
+    Only JSON serializable outputs are cached, elements and other engine objects are not.
+    """
+    def __init__(self, file_path: Optional[str] = None, max_size: int = DEFAULT_MAX_SIZE):
+        """
+        :param file_path: SQLite file of the cache, defaults to default_cache_path().
+        """
+        file_path = file_path or default_cache_path()
+        directory = os.path.dirname(file_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.file_path = file_path
+        self.max_size = max_size
+        # Batch processes may share the file, wait for their writes instead of failing
+        self._connection = sqlite3.connect(file_path, timeout=30, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(SCHEMA)
+            self._connection.execute("CREATE INDEX IF NOT EXISTS ix_entries_accessed_at ON entries (accessed_at)")
+            self._connection.commit()
+            self._size = self._connection.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+
+    def get(self, key: str) -> tuple[bool, Any]:
+        """
+        :return: Whether a fresh entry exists, and its value.
+        """
+        now = time.time()
+        with self._lock:
+            row = self._connection.execute("SELECT value, expires_at FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return False, None
+            value, expires_at = row
+            if expires_at <= now:
+                self._delete(key)
+                self._connection.commit()
+                return False, None
+            self._connection.execute("UPDATE entries SET accessed_at = ? WHERE key = ?", (now, key))
+            self._connection.commit()
+        return True, json.loads(value)
+
+    def set(self, key: str, value: Any, ttl: float) -> bool:
+        """
+        :return: False if the value is not JSON serializable and was not cached.
+        """
+        try:
+            serialized = json.dumps(value)
+        except (TypeError, ValueError):
+            logging.debug(f"Output of type {type(value).__name__} is not cacheable")
+            return False
+        now = time.time()
+        with self._lock:
+            self._delete(key)
+            self._connection.execute(
+                "INSERT INTO entries (key, value, size, expires_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                (key, serialized, len(serialized), now + ttl, now),
+            )
+            self._size += len(serialized)
+            if self._size > self.max_size:
+                self._evict(now)
+            self._connection.commit()
+        return True
+
+    def _delete(self, key: str) -> None:
+        row = self._connection.execute("SELECT size FROM entries WHERE key = ?", (key,)).fetchone()
+        if row is not None:
+            self._connection.execute("DELETE FROM entries WHERE key = ?", (key,))
+            self._size -= row[0]
+
+    def _evict(self, now: float) -> None:
+        # Expired entries first, then the least recently used ones down to 90% of max_size to not evict on every write
+        self._connection.execute("DELETE FROM entries WHERE expires_at <= ?", (now,))
+        self._size = self._connection.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        target = self.max_size * 0.9
+        if self._size <= target:
+            return
+        evicted = 0
+        for key, size in self._connection.execute("SELECT key, size FROM entries ORDER BY accessed_at").fetchall():
+            if self._size <= target:
+                break
+            self._connection.execute("DELETE FROM entries WHERE key = ?", (key,))
+            self._size -= size
+            evicted += 1
+        logging.debug(f"Evicted {evicted} cache entries")
+
+    def clear(self) -> None:
+        with self._lock:
+            self._connection.execute("DELETE FROM entries")
+            self._connection.commit()
+            self._size = 0
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+
+class PageState:
+    """
+    Page of a browser session as far as the cache knows, a cached goto only records its url until a task needs the page.
+    """
+    def __init__(self):
+        self.url: Optional[str] = None
+        self.pending: Optional[dict[str, Any]] = None
+
+    def defer(self, params: dict[str, Any]) -> None:
+        """
+        :param params: Params of the goto, its wait_until... apply once it runs.
+        """
+        self.url = params.get('url')
+        self.pending = params
+
+    def take_pending(self) -> Optional[dict[str, Any]]:
+        params, self.pending = self.pending, None
+        return params
+
+    def after_task(self, action: str, params: dict[str, Any]) -> None:
+        if action == NAVIGATION_ACTION:
+            self.url = params.get('url')
+        elif not is_read_only(action):
+            # A click, a key press... may have navigated, the url is unknown until the next goto
+            self.url = None
@@ -0,0 +1,132 @@
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field
+import itertools
+import json
+import os
+import threading
+import time
+from typing import Any, ContextManager, Iterator, Optional
+
+# Longest string param kept on a span, a selector or an url, not a whole page
+MAX_ATTRIBUTE_LENGTH = 200
+
+@dataclass
+class Span:
+    name: str
+    kind: str
+    span_id: int
+    parent_id: Optional[int]
+    action: Optional[str] = None
+    start: float = 0.0
+    duration: float = 0.0
+    status: str = 'ok'
+    error: Optional[str] = None
+    thread: int = 0
+    attributes: dict[str, Any] = field(default_factory=dict)
+
+    def set_params(self, params: dict[str, Any]) -> None:
+        """
+        Keep the scalar params of a task (selector, url...), that is what tells two spans of the same action apart.
+        """
+        for key, value in params.items():
+            if isinstance(value, str):
+                self.attributes[key] = value[:MAX_ATTRIBUTE_LENGTH]
+            elif isinstance(value, (int, float, bool)):
+                self.attributes[key] = value
+
+
+_current_span: ContextVar[Optional[Span]] = ContextVar('current_span', default=None)
+
+def current_span() -> Optional[Span]:
+    return _current_span.get()
+
+
+class Tracer:
+    """
+    Record a span for each task and map iteration, the parent of a span is the span current when it starts.
+    Thread pools must run their work in a copy of the submitting context (contextvars.copy_context) to keep parents.
+    """
+    def __init__(self):
+        self.spans: list[Span] = []
+        self._ids = itertools.count(1)
+        self._threads: dict[int, int] = {}
+        self._lock = threading.Lock()
+        # Chrome traces want microseconds from an arbitrary origin, spans keep wall clock start times
+        self._origin = time.time()
+        self._origin_counter = time.perf_counter()
+
+    @contextmanager
+    def span(self, name: str, kind: str, action: Optional[str] = None, **attributes: Any) -> Iterator[Span]:
+        parent = _current_span.get()
+        span = Span(name, kind, next(self._ids), parent.span_id if parent else None, action, attributes=attributes)
+        span.thread = self._thread_number()
+        token = _current_span.set(span)
+        started = time.perf_counter()
+        span.start = self._origin + started - self._origin_counter
+        try:
+            yield span
+        except BaseException as e:
+            span.status = 'error'
+            span.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            span.duration = time.perf_counter() - started
+            _current_span.reset(token)
+            with self._lock:
+                self.spans.append(span)
+
+    def _thread_number(self) -> int:
+        ident = threading.get_ident()
+        with self._lock:
+            return self._threads.setdefault(ident, len(self._threads) + 1)
+
+    def to_chrome_trace(self) -> dict[str, Any]:
+        with self._lock:
+            spans = list(self.spans)
+        events: list[dict[str, Any]] = []
+        for span in spans:
+            events.append({
+                'name': span.name,
+                'cat': span.kind,
+                'ph': 'X',
+                'ts': round((span.start - self._origin) * 1_000_000),
+                'dur': round(span.duration * 1_000_000),
+                'pid': os.getpid(),
+                'tid': span.thread,
+                'args': {
+                    'span_id': span.span_id,
+                    'parent_id': span.parent_id,
+                    'action': span.action,
+                    'status': span.status,
+                    'error': span.error,
+                    **span.attributes,
+                },
+            })
+        return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+    def export(self, file_path: str) -> None:
+        """
+        Write the spans recorded so far, one JSON span per line for a .jsonl file, a Chrome trace otherwise.
+        The Chrome trace opens in chrome://tracing or https://ui.perfetto.dev.
+        """
+        directory = os.path.dirname(file_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(file_path, 'w', encoding='utf-8') as file:
+            if file_path.endswith(('.jsonl', '.ndjson')):
+                with self._lock:
+                    spans = sorted(self.spans, key=lambda span: span.start)
+                for span in spans:
+                    file.write(json.dumps(asdict(span), default=str) + "\n")
+            else:
+                json.dump(self.to_chrome_trace(), file, default=str)
+
+
+def trace(tracer: Optional[Tracer], name: str, kind: str, action: Optional[str] = None, **attributes: Any) -> ContextManager[Optional[Span]]:
+    """
+    Span of the tracer, or a no-op when tracing is disabled.
+    """
+    if tracer is None:
+        return nullcontext()
+    return tracer.span(name, kind, action, **attributes)
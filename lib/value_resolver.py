@@ -1,29 +1,73 @@
+from contextvars import ContextVar
+from functools import lru_cache
+import logging
 import re
-from typing import Any
+from typing import Any, NamedTuple
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
     from scrapping_playbook_framework.execution_context import ExecutionContext
 
+TEMPLATE_PATTERN = re.compile(r'\{\{([^}]+)\}\}')
+TEMPLATE_CACHE_SIZE = 4096
 
-def resolve(context: ExecutionContext, current_value: Any) -> Any:
-    if(not isinstance(current_value, str)):
+class UnresolvedVariableError(Exception):
+    pass
+
+class Placeholder(NamedTuple):
+    key: str
+    raw: str
+
+Segment = str | Placeholder
+
+# Variables currently being resolved, used to detect self references
+_resolving: ContextVar[frozenset[str]] = ContextVar('resolving', default=frozenset())
+
+
+@lru_cache(maxsize=TEMPLATE_CACHE_SIZE)
+def compile_template(template: str) -> tuple[Segment, ...]:
+    """
+    Split a template string into literal and placeholder segments, each distinct string is parsed once.
+    :param template: The string to compile.
+    :return: The segments in order of appearance.
+    """
+    segments: list[Segment] = []
+    position = 0
+    for match in TEMPLATE_PATTERN.finditer(template):
+        if match.start() > position:
+            segments.append(template[position:match.start()])
+        segments.append(Placeholder(match.group(1).strip(), match.group(0)))
+        position = match.end()
+    if position < len(template):
+        segments.append(template[position:])
+    return tuple(segments)
+
+
+def render(context: 'ExecutionContext', segments: tuple[Segment, ...]) -> str:
+    resolving = _resolving.get()
+    parts: list[str] = []
+    for segment in segments:
+        if isinstance(segment, str):
+            parts.append(segment)
+            continue
+        if segment.key in resolving:
+            logging.warning(f"Interpolated variable '{segment.key}' is part of a circular reference, left unresolved")
+            parts.append(segment.raw)
+            continue
+        token = _resolving.set(resolving | {segment.key})
+        try:
+            resolved_value = context.get_variable(segment.key, '')
+        finally:
+            _resolving.reset(token)
+        if resolved_value is None:
+            raise UnresolvedVariableError(f"Interpolated variable '{segment.key}' not found in context")
+        parts.append(str(resolved_value))
+    return ''.join(parts)
+
+
+def resolve(context: 'ExecutionContext', current_value: Any) -> Any:
+    if not isinstance(current_value, str) or '{{' not in current_value:
         return current_value
-    
-
-    def replace_match(match : Any):
-        var_key = match.group(1).strip() # type:ignore
-        resolved_value = context.get_variable(var_key, '') # type:ignore
-        if(resolved_value == None):
-            breakpoint()
-            raise Exception(f"Interpolated variable '{var_key}' not found in context")
-        return str(resolved_value) 
-
-    # Recursively resolve templates in the string
-    # We loop until no more templates are found
-    while re.search(r'\{\{([^}]+)\}\}', current_value):
-        new_value = re.sub(r'\{\{([^}]+)\}\}', replace_match, current_value)
-        if new_value == current_value: # Avoid infinite loops if a variable resolves to itself
-            break
-        current_value = new_value
-    return current_value
\ No newline at end of file
+
+    # Single pass, nested templates are resolved recursively through context.get_variable
+    return render(context, compile_template(current_value))
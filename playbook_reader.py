@@ -1,9 +1,17 @@
+from functools import lru_cache
+import hashlib
+import json
+import logging
+import os
+import tempfile
 from typing import Any, Optional
-from pydantic import BaseModel, Field
+import pydantic
+from pydantic import BaseModel, Field, PrivateAttr
 import yaml
 
 from scrapping_playbook_framework.execution_context import ExecutionContext
 from scrapping_playbook_framework.lib import value_resolver
+from scrapping_playbook_framework.lib.cache_dir import user_cache_dir
 
 class PlaybookCondition(BaseModel):
     variable: str
@@ -32,7 +40,7 @@ class PlaybookCondition(BaseModel):
             res = res and (float(value) < float(less_than))
         return res
 
-PlaybookTask_ATTRIBUTES = ["name", "action", "output", "when", "map", "tasks", "item_name",'post_process','filters','debug']
+PlaybookTask_ATTRIBUTES = ["name", "action", "output", "when", "map", "tasks", "item_name",'post_process','filters','debug','flatten','parallel','ordered','export','checkpoint_key','incremental','cache']
 
 class PlaybookTask(BaseModel):
     name: str
@@ -45,6 +53,12 @@ class PlaybookTask(BaseModel):
     map: Optional[str]  = Field(default=None) # on wich variable to map the tasks
     tasks: Optional[list["PlaybookTask"]] = Field(default=None) # nested tasks for loops 
     item_name: Optional[str] = Field(default="item") # name of the variable for each item in the loop
+    parallel: Optional[int] = Field(default=None) # number of browser sessions sharing the loop iterations
+    ordered: Optional[bool] = Field(default=True) # keep loop outputs in list order when running in parallel
+    export: Optional[list[dict[str, Any]]] = Field(default=None) # streaming exporters fed with each loop iteration outputs
+    checkpoint_key: Optional[str] = Field(default=None) # template identifying an item in checkpoints, the item index if None
+    incremental: Optional[bool | str] = Field(default=None) # reuse the outputs of items unchanged since the last run: true or a fingerprint template
+    cache: Optional[bool | float | dict[str, Any]] = Field(default=None) # reuse the output of a previous run: true, a TTL in seconds or {ttl: seconds}
     post_process: Optional[list[dict[str, Any]]] = Field(default=None) # post processing value before store
     debug: Optional[bool] = Field(default=False)
 
@@ -54,13 +68,107 @@ class PlaybookTask(BaseModel):
 class PlaybookDict(BaseModel):
     tasks: list[PlaybookTask]
     config: dict[str, Any]
+    # Absolute path of the file the playbook was read from, None when built from a string
+    _source_path: Optional[str] = PrivateAttr(default=None)
+
+    @property
+    def source_path(self) -> Optional[str]:
+        return self._source_path
 
 def yaml_playbook_to_dict(yaml_content: str) -> PlaybookDict:
     playbook_dict_not_safe = yaml.safe_load(yaml_content)
     playbook_model = PlaybookDict(**playbook_dict_not_safe)
     return playbook_model
 
-def from_yaml_file(file_path: str) -> PlaybookDict:
-    with open(file_path, 'r') as file:
+# Bumped when cached playbooks must be rebuilt although the models did not change
+PLAYBOOK_CACHE_VERSION = 2
+
+@lru_cache(maxsize=1)
+def models_fingerprint() -> str:
+    """Changes with the playbook models, a cache written by another version of them is never loaded"""
+    schema = json.dumps(PlaybookDict.model_json_schema(), sort_keys=True)
+    return f"{PLAYBOOK_CACHE_VERSION}:{pydantic.VERSION}:{hashlib.sha256(schema.encode('utf-8')).hexdigest()}"
+
+def playbook_cache_key(yaml_content: bytes) -> str:
+    digest = hashlib.sha256(yaml_content)
+    digest.update(models_fingerprint().encode('utf-8'))
+    return digest.hexdigest()
+
+def playbook_cache_path(key: str, cache_dir: Optional[str] = None) -> str:
+    return os.path.join(cache_dir or user_cache_dir('playbooks'), f"{key}.json")
+
+def construct_condition(data: dict[str, Any]) -> PlaybookCondition:
+    return PlaybookCondition.model_construct(**data)
+
+def construct_task(data: dict[str, Any]) -> PlaybookTask:
+    # model_construct does not build nested models, the dumped dicts are turned back into models here
+    data = dict(data)
+    for conditions in ('when', 'filters'):
+        if data.get(conditions) is not None:
+            data[conditions] = [construct_condition(condition) for condition in data[conditions]]
+    if data.get('tasks') is not None:
+        data['tasks'] = [construct_task(task) for task in data['tasks']]
+    return PlaybookTask.model_construct(**data)
+
+def read_cached_playbook(cache_path: str, key: str) -> Optional[PlaybookDict]:
+    """
+    Load a cached playbook, the cache holds plain JSON of an already validated playbook: it is rebuilt without validation.
+    """
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as cache_file:
+            cached = json.load(cache_file)
+        if cached.get('key') != key:
+            return None
+        playbook = cached['playbook']
+        return PlaybookDict.model_construct(tasks=[construct_task(task) for task in playbook['tasks']], config=playbook['config'])
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logging.debug(f"Ignoring unreadable playbook cache {cache_path}: {e}")
+        return None
+
+def write_cached_playbook(cache_path: str, key: str, playbook_dict: PlaybookDict) -> None:
+    try:
+        content = json.dumps({'key': key, 'playbook': playbook_dict.model_dump()})
+    except (TypeError, ValueError) as e:
+        # e.g. YAML dates, the playbook is parsed on every load
+        logging.debug(f"Playbook can not be cached as JSON: {e}")
+        return
+    directory = os.path.dirname(cache_path) or '.'
+    try:
+        os.makedirs(directory, exist_ok=True)
+        # Written aside then renamed, concurrent workers never read a partial file
+        file_descriptor, temporary_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    except OSError as e:
+        logging.debug(f"Could not write playbook cache {cache_path}: {e}")
+        return
+    try:
+        with os.fdopen(file_descriptor, 'w', encoding='utf-8') as cache_file:
+            cache_file.write(content)
+        os.replace(temporary_path, cache_path)
+    except Exception as e:
+        logging.debug(f"Could not write playbook cache {cache_path}: {e}")
+        if os.path.exists(temporary_path):
+            os.remove(temporary_path)
+
+def from_yaml_file(file_path: str, cache: bool = False, cache_dir: Optional[str] = None) -> PlaybookDict:
+    """
+    Read and validate a playbook file. When cached, while the file content does not change the validated playbook
+    is loaded back without YAML parsing nor validation.
+    :param cache: Use and refresh the cache.
+    :param cache_dir: Directory of the cache files, named by content hash. The per-user cache directory if None.
+    """
+    with open(file_path, 'rb') as file:
         yaml_content = file.read()
-    return yaml_playbook_to_dict(yaml_content)
\ No newline at end of file
+    playbook_dict = None
+    if cache:
+        key = playbook_cache_key(yaml_content)
+        cache_path = playbook_cache_path(key, cache_dir)
+        playbook_dict = read_cached_playbook(cache_path, key)
+    if playbook_dict is None:
+        playbook_dict = yaml_playbook_to_dict(yaml_content.decode('utf-8'))
+        if cache:
+            write_cached_playbook(cache_path, key, playbook_dict)
+    # Tells apart the state (checkpoints, incremental maps...) of identical playbooks in different files
+    playbook_dict._source_path = os.path.abspath(file_path)
+    return playbook_dict
@@ -1,12 +1,13 @@
-from typing import Any
+from typing import Any, Optional
 from scrapping_playbook_framework.selenium.selenium_browser import SeleniumGoBackTask, SeleniumGoToTask, SeleniumScreenshotTask
 from scrapping_playbook_framework.selenium.selenium_click_task import SeleniumClickTask
-from scrapping_playbook_framework.selenium.selenium_dom_task import SeleniumGetElementTask, SeleniumGetElementsTask, WebDriverElementFinder
+from scrapping_playbook_framework.selenium.selenium_dom_task import SeleniumExtractTask, SeleniumGetElementTask, SeleniumGetElementsTask, SeleniumSnapshotTask, WebDriverElementFinder
+from scrapping_playbook_framework.selenium.selenium_profile import BrowserProfile
 from scrapping_playbook_framework.selenium.selenium_keyboard_task import SeleniumKeyboardPressTask, SeleniumKeyboardTypeTask
 from scrapping_playbook_framework.selenium.selenium_scroll_task import SeleniumScrollTask
-from scrapping_playbook_framework.selenium.selenium_wait_task import SeleniumWaitForElementTask, SeleniumWaitTask
-from scrapping_playbook_framework.task.browser_task import DownloadUrl
-from scrapping_playbook_framework.task.export_task import CSVExportTask
+from scrapping_playbook_framework.selenium.selenium_wait_task import SeleniumWaitForDomStableTask, SeleniumWaitForElementTask, SeleniumWaitForNetworkIdleTask, SeleniumWaitTask
+from scrapping_playbook_framework.task.browser_task import DownloadMany, DownloadUrl
+from scrapping_playbook_framework.task.export_task import CSVExportTask, SQLiteExportTask
 from scrapping_playbook_framework.task.task import ScrappingTask
 from selenium.webdriver.chrome.options import Options
 from selenium import webdriver
@@ -14,9 +15,11 @@ from selenium.webdriver.remote.webdriver import WebDriver
 
 from scrapping_playbook_framework.task.wait_task import WaitForElementTask
 
-def get_driver() -> WebDriver:
+def get_driver(profile: Optional[BrowserProfile] = None) -> WebDriver:
+    profile = profile or BrowserProfile()
     options = Options()
-    # options.add_argument('--headless')  # Mode sans interface graphique
+    # Headless mode, page load strategy and network logging
+    profile.apply(options)
     options.add_argument('--no-sandbox')
     options.add_argument('--disable-dev-shm-usage')
     
@@ -33,6 +36,8 @@ def get_driver() -> WebDriver:
     
     # Remove webdriver property
     driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+    # Blocked resources
+    profile.configure(driver)
     
     # Pollute browsing history with random navigation
     history_urls = [
@@ -65,10 +70,16 @@ def get_selenium_tasks(driver: WebDriver) -> list[ScrappingTask[Any]]:
         _wait_task,
         _get_element_task,
         SeleniumGetElementsTask(driver,WebDriverElementFinder(driver)),
+        SeleniumExtractTask(driver, WebDriverElementFinder(driver)),
+        SeleniumSnapshotTask(driver),
         SeleniumKeyboardTypeTask(driver, _keyboard_press_task),
-        SeleniumWaitForElementTask(driver, _get_element_task),
+        SeleniumWaitForElementTask(driver),
+        SeleniumWaitForNetworkIdleTask(driver),
+        SeleniumWaitForDomStableTask(driver),
         SeleniumScrollTask(driver),
         SeleniumScreenshotTask(driver),
-        DownloadUrl(),
-        CSVExportTask()
+        DownloadUrl(cookies_provider=driver.get_cookies),
+        DownloadMany(cookies_provider=driver.get_cookies),
+        CSVExportTask(),
+        SQLiteExportTask(),
     ]
@@ -1,15 +1,83 @@
+import logging
 import os
 from typing import Any
-from scrapping_playbook_framework.task.browser_task import GoBackTask, GoToParams, GoToTask, ScreenshotParams, ScreenshotTask
+from scrapping_playbook_framework.selenium.selenium_wait_task import execute_async_wait
+from scrapping_playbook_framework.task.browser_task import GoBackTask, GoToParams, GoToTask, ScreenshotParams, ScreenshotTask, parse_wait_until
 from selenium.webdriver.remote.webdriver import WebDriver
 
+# Polls the page until the goto condition holds on the new document, told apart from the previous one by its time origin
+GOTO_WAIT_SCRIPT = """
+const [timeout, previousOrigin, condition, selector, idleTime, stopLoading, done] = arguments;
+const started = Date.now();
+let lastResource = Date.now();
+if (condition === 'networkidle') {
+    new PerformanceObserver(() => { lastResource = Date.now(); }).observe({type: 'resource', buffered: true});
+}
+const holds = () => {
+    if (performance.timeOrigin === previousOrigin) {
+        return false;
+    }
+    switch (condition) {
+        case 'commit': return true;
+        case 'domcontentloaded': return document.readyState !== 'loading';
+        case 'load': return document.readyState === 'complete';
+        case 'selector': return document.querySelector(selector) !== null;
+        case 'networkidle': return document.readyState === 'complete' && Date.now() - lastResource >= idleTime;
+    }
+    return false;
+};
+const poll = () => {
+    if (holds()) {
+        if (stopLoading && document.readyState !== 'complete') {
+            window.stop();
+        }
+        done(true);
+    } else if (Date.now() - started >= timeout) {
+        done(false);
+    } else {
+        setTimeout(poll, 25);
+    }
+};
+poll();
+"""
+
+# Conditions already true when driver.get returns, per page load strategy of the session
+_REACHED_ON_RETURN = {
+    'normal': ('commit', 'domcontentloaded', 'load'),
+    'eager': ('commit', 'domcontentloaded'),
+    'none': (),
+}
+
 class SeleniumGoToTask(GoToTask):
     def __init__(self, driver : WebDriver):
         super().__init__()
         self.driver = driver
+        self._warned_full_load = False
 
     def execute(self, ctx : GoToParams) -> None:
+        wait_until = ctx.get('wait_until', 'load')
+        condition, selector = parse_wait_until(wait_until)
+        page_load_strategy = self.driver.capabilities.get('pageLoadStrategy', 'normal')
+        if page_load_strategy == 'normal' and (condition != 'load' or ctx.get('stop_loading')) and not self._warned_full_load:
+            # Once per session, a map over many urls would repeat it for every page
+            self._warned_full_load = True
+            logging.warning(f"wait_until {wait_until} only applies after the full page load with page_load_strategy: normal, set page_load_strategy: eager or none in the browser config to return earlier")
+        if condition in _REACHED_ON_RETURN.get(page_load_strategy, ()):
+            self.driver.get(ctx['url'])
+            if ctx.get('stop_loading') and condition != 'load':
+                self.driver.execute_script("if (document.readyState !== 'complete') window.stop()")
+            return
+        # With the 'normal' strategy driver.get already waited for the load event, the previous document is gone
+        previous_origin = self.driver.execute_script("return performance.timeOrigin") if page_load_strategy != 'normal' else None
         self.driver.get(ctx['url'])
+        timeout = ctx.get('timeout', 30)
+        reached, waited = execute_async_wait(
+            self.driver, GOTO_WAIT_SCRIPT, timeout,
+            previous_origin, condition, selector, ctx.get('idle_time', 0.5) * 1000, bool(ctx.get('stop_loading', False)),
+        )
+        if not reached:
+            raise TimeoutError(f"{wait_until} not reached on {ctx['url']} within {timeout} seconds")
+        logging.debug(f"{wait_until} reached on {ctx['url']} after {waited:.3f}s")
 
 
 class SeleniumGoBackTask(GoBackTask):
@@ -3,7 +3,8 @@ import os
 from typing import Any, Optional
 from scrapping_playbook_framework.position import Position
 from scrapping_playbook_framework.task.browser_task import ScreenshotParams
-from scrapping_playbook_framework.task.dom_task import DOMElement, DOMElementGetAttributeParams, GetElementTask, GetElementsTask, SelectorParams
+from scrapping_playbook_framework.core.parsed_dom_element import ParsedDOMElement, parse_fragment, parse_html
+from scrapping_playbook_framework.task.dom_task import DOMElement, DOMElementGetAttributeParams, ExtractParams, ExtractTask, GetElementTask, GetElementsTask, SelectorParams, SnapshotParams, SnapshotTask
 from selenium.webdriver.common.action_chains import ActionChains
 from selenium.webdriver.common.by import By,ByType
 from selenium.webdriver.remote.webdriver import WebDriver
@@ -42,6 +43,14 @@ class SeleniumDOMElement(DOMElement):
     def get_elements(self, ctx: SelectorParams) -> list[DOMElement]:
         return SeleniumGetElementsTask(self.web_driver, WebElementFinder(self.web_element)).execute(ctx)
 
+    def extract(self, ctx: ExtractParams) -> list[dict[str, Any]]:
+        return SeleniumExtractTask(self.web_driver, WebElementFinder(self.web_element)).execute(ctx)
+
+    def get_outer_html(self, ctx: Any) -> str:
+        if isinstance(self.web_element, ShadowRoot):
+            return self.web_driver.execute_script("return arguments[0].innerHTML", self.web_element) or "" # type: ignore
+        return self.web_element.get_property("outerHTML") or "" # type: ignore
+
     def get_shadow_root(self, ctx: Any) -> DOMElement | None: 
         # Selenium does not support shadow DOM natively
         dom = self.web_driver.execute_script("return arguments[0].shadowRoot", self.web_element) # type: ignore
@@ -74,6 +83,11 @@ class SeleniumElementFinder(ABC):
     def find_elements(self, by: ByType, value: str | None) -> list[WebElement]:
         pass
 
+    @abstractmethod
+    def get_script_root(self) -> WebElement | ShadowRoot | None:
+        """Node passed to scripts as the search root, None means the whole document"""
+        pass
+
 class WebDriverElementFinder(SeleniumElementFinder):
     def __init__(self, driver: WebDriver):
         self.driver = driver
@@ -90,6 +104,9 @@ class WebDriverElementFinder(SeleniumElementFinder):
         except:
             return []
 
+    def get_script_root(self) -> WebElement | ShadowRoot | None:
+        return None
+
 class WebElementFinder(SeleniumElementFinder):
     def __init__(self, web_element: WebElement | ShadowRoot):
         self.web_element = web_element
@@ -104,7 +121,10 @@ class WebElementFinder(SeleniumElementFinder):
         try:
             return self.web_element.find_elements(by, value) # type: ignore
         except:
-            return []        
+            return []
+
+    def get_script_root(self) -> WebElement | ShadowRoot | None:
+        return self.web_element
 
 class SeleniumGetElementTask(GetElementTask):
     def __init__(self, web_driver: WebDriver, base: SeleniumElementFinder):
@@ -124,4 +144,57 @@ class SeleniumGetElementsTask(GetElementsTask):
 
     def execute(self, ctx: SelectorParams) -> list[DOMElement]:
         elements = self.base.find_elements(By.CSS_SELECTOR, ctx.get('selector'))
-        return [SeleniumDOMElement(self.web_driver, el) for el in elements if el]
\ No newline at end of file
+        return [SeleniumDOMElement(self.web_driver, el) for el in elements if el]
+
+EXTRACT_SCRIPT = """
+const [root, containerSelector, fields] = arguments;
+return Array.from((root || document).querySelectorAll(containerSelector)).map((container) => {
+    const row = {};
+    for (const [key, field] of fields) {
+        const element = field.selector ? container.querySelector(field.selector) : container;
+        if (!element) {
+            row[key] = null;
+        } else if (field.kind === 'attribute') {
+            row[key] = element.getAttribute(field.name);
+        } else if (field.kind === 'property') {
+            const value = element[field.name];
+            row[key] = value === undefined ? null : value;
+        } else {
+            row[key] = element.innerText;
+        }
+    }
+    return row;
+});
+"""
+
+class SeleniumExtractTask(ExtractTask):
+    def __init__(self, web_driver: WebDriver, base: SeleniumElementFinder):
+        self.web_driver = web_driver
+        self.base = base
+
+    def execute(self, ctx: ExtractParams) -> list[dict[str, Any]]:
+        fields = self.normalize_fields(ctx['fields'])
+        # A single round trip whatever the number of containers and fields
+        rows = self.web_driver.execute_script(EXTRACT_SCRIPT, self.base.get_script_root(), ctx['container'], fields) # type: ignore
+        return rows or []
+
+SNAPSHOT_SCRIPT = """
+const [selector] = arguments;
+const element = selector ? document.querySelector(selector) : document.documentElement;
+return element ? [element.outerHTML, document.baseURI] : null;
+"""
+
+class SeleniumSnapshotTask(SnapshotTask):
+    def __init__(self, web_driver: WebDriver):
+        self.web_driver = web_driver
+
+    def execute(self, ctx: SnapshotParams) -> Optional[DOMElement]:
+        selector = ctx.get('selector')
+        # A single round trip, every query on the returned element then runs in-process
+        snapshot = self.web_driver.execute_script(SNAPSHOT_SCRIPT, selector) # type: ignore
+        if snapshot is None:
+            return None
+        outer_html, base_url = snapshot
+        if selector:
+            return ParsedDOMElement(parse_fragment(outer_html, base_url=base_url))
+        return ParsedDOMElement(parse_html(outer_html, base_url=base_url))
@@ -0,0 +1,229 @@
+import atexit
+import functools
+import logging
+import threading
+import time
+from typing import Callable, Optional
+from urllib.parse import urlsplit
+
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from scrapping_playbook_framework.selenium.selenium_bootstrap import get_driver
+from scrapping_playbook_framework.selenium.selenium_profile import BrowserProfile
+
+class DriverPool:
+    """
+    Keep warm WebDriver sessions between runs instead of launching a new browser each time.
+    A session is checked out with acquire() and given back with release(), which resets its state.
+    """
+
+    def __init__(self, factory: Callable[[], WebDriver] = get_driver, max_idle: int = 4, idle_timeout: float = 300.0, max_sessions: Optional[int] = None):
+        """
+        :param factory: Creates a new driver when no warm session is available.
+        :param max_idle: Maximum number of idle sessions kept warm, extra released sessions are quit.
+        :param idle_timeout: Seconds after which an idle session is quit.
+        :param max_sessions: Maximum number of sessions open at once (idle and checked out), acquire() waits for a release
+            above it. Unlimited if None. A run with a parallel map holds `parallel` + 1 sessions.
+        """
+        if max_sessions is not None and max_sessions < 1:
+            raise ValueError(f"max_sessions must be at least 1, got {max_sessions}")
+        self.factory = factory
+        self.max_idle = max_idle
+        self.idle_timeout = idle_timeout
+        self.max_sessions = max_sessions
+        self._idle: list[tuple[WebDriver, float]] = []
+        self._in_use: set[int] = set()
+        # Sessions being started by the factory, counted against max_sessions
+        self._starting = 0
+        self._lock = threading.Lock()
+        self._available = threading.Condition(self._lock)
+        self._closed = False
+        # A browser rejecting the clear of an origin rejects it on every reset, warned about once
+        self._warned_storage_clear = False
+
+    def acquire(self, timeout: Optional[float] = None) -> WebDriver:
+        """
+        Check out a warm session, or start a new one.
+        :param timeout: Seconds to wait for a session when max_sessions are open, forever if None.
+        :raises TimeoutError: No session was released in time.
+        """
+        if self._closed:
+            raise RuntimeError("Driver pool is shut down")
+        self.evict_idle()
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._available:
+                while not self._idle and not self._has_room():
+                    remaining = None if deadline is None else deadline - time.monotonic()
+                    if remaining is not None and remaining <= 0:
+                        raise TimeoutError(f"No driver session released within {timeout}s, {self.max_sessions} sessions open")
+                    self._available.wait(remaining)
+                    if self._closed:
+                        raise RuntimeError("Driver pool is shut down")
+                # Most recently released first, it is the warmest one
+                driver = self._idle.pop()[0] if self._idle else None
+                if driver is None:
+                    self._starting += 1
+                else:
+                    self._in_use.add(id(driver))
+            if driver is None:
+                logging.debug("Driver pool empty, starting a new session")
+                try:
+                    driver = self.factory()
+                except BaseException:
+                    with self._available:
+                        self._starting -= 1
+                        self._available.notify()
+                    raise
+                with self._available:
+                    self._starting -= 1
+                    self._in_use.add(id(driver))
+                return driver
+            if self._is_alive(driver):
+                return driver
+            logging.warning("Idle driver session is not responding anymore, discarding it")
+            self._discard(driver)
+
+    def release(self, driver: WebDriver) -> None:
+        with self._lock:
+            keep = not self._closed and len(self._idle) < self.max_idle
+        if keep:
+            try:
+                self.reset(driver)
+            except Exception as e:
+                logging.warning(f"Could not reset driver session, discarding it: {e}")
+                keep = False
+        if not keep:
+            self._discard(driver)
+            return
+        with self._available:
+            self._in_use.discard(id(driver))
+            self._idle.append((driver, time.monotonic()))
+            self._available.notify()
+        self.evict_idle()
+
+    def reset(self, driver: WebDriver) -> None:
+        """
+        Bring a session back to a blank state: single tab, no cookies, no storage nor cache of the visited origins, about:blank.
+        """
+        execute_cdp_cmd = getattr(driver, 'execute_cdp_cmd', None)
+        origins: set[str] = set()
+        handles = driver.window_handles
+        for handle in handles[1:] + handles[:1]:
+            driver.switch_to.window(handle)
+            if execute_cdp_cmd is not None:
+                origins.update(self._history_origins(driver))
+            if handle != handles[0]:
+                driver.close()
+
+        try:
+            # sessionStorage is per tab, the CDP clear below does not cover it
+            driver.execute_script("window.localStorage.clear(); window.sessionStorage.clear();")
+        except Exception:
+            # Storage is not accessible on some pages (about:blank, file://, sandboxed frames)
+            pass
+        driver.get('about:blank')
+        if execute_cdp_cmd is None:
+            driver.delete_all_cookies()
+            return
+        # Frames of other origins are not in the history, the cookies they set tell their host
+        for cookie in execute_cdp_cmd('Network.getAllCookies', {}).get('cookies', []):
+            domain = cookie.get('domain', '').lstrip('.')
+            if domain:
+                origins.update((f"https://{domain}", f"http://{domain}"))
+        for origin in sorted(origins):
+            try:
+                execute_cdp_cmd('Storage.clearDataForOrigin', {'origin': origin, 'storageTypes': 'all'})
+            except Exception as e:
+                self._warn_storage_clear(origin, e)
+        execute_cdp_cmd('Network.clearBrowserCookies', {})
+        execute_cdp_cmd('Network.clearBrowserCache', {})
+
+    def _history_origins(self, driver: WebDriver) -> set[str]:
+        """
+        Origins of the pages the current tab navigated to.
+        """
+        history = driver.execute_cdp_cmd('Page.getNavigationHistory', {}) # type: ignore
+        origins: set[str] = set()
+        for entry in history.get('entries', []):
+            url = urlsplit(entry.get('url', ''))
+            if url.scheme in ('http', 'https') and url.netloc:
+                origins.add(f"{url.scheme}://{url.netloc}")
+        return origins
+
+    def _warn_storage_clear(self, origin: str, error: Exception) -> None:
+        with self._lock:
+            warned, self._warned_storage_clear = self._warned_storage_clear, True
+        if warned:
+            logging.debug(f"Could not clear the storage of {origin}: {error}")
+        else:
+            logging.warning(f"Could not clear the storage of {origin}, storage of the visited origins may leak to the next run: {error}")
+
+    def evict_idle(self) -> None:
+        now = time.monotonic()
+        with self._available:
+            expired = [driver for driver, released_at in self._idle if now - released_at > self.idle_timeout]
+            self._idle = [(driver, released_at) for driver, released_at in self._idle if now - released_at <= self.idle_timeout]
+            if expired:
+                self._available.notify(len(expired))
+        for driver in expired:
+            logging.debug("Quitting idle driver session")
+            self._quit(driver)
+
+    def shutdown(self) -> None:
+        """
+        Quit every idle session, sessions still checked out are quit when released.
+        """
+        with self._available:
+            self._closed = True
+            idle = [driver for driver, _ in self._idle]
+            self._idle = []
+            self._available.notify_all()
+        for driver in idle:
+            self._quit(driver)
+
+    def idle_count(self) -> int:
+        with self._lock:
+            return len(self._idle)
+
+    def in_use_count(self) -> int:
+        with self._lock:
+            return len(self._in_use)
+
+    def _has_room(self) -> bool:
+        return self.max_sessions is None or len(self._idle) + len(self._in_use) + self._starting < self.max_sessions
+
+    def _is_alive(self, driver: WebDriver) -> bool:
+        try:
+            driver.window_handles
+            return True
+        except Exception:
+            return False
+
+    def _discard(self, driver: WebDriver) -> None:
+        with self._available:
+            self._in_use.discard(id(driver))
+            self._available.notify()
+        self._quit(driver)
+
+    def _quit(self, driver: WebDriver) -> None:
+        try:
+            driver.quit()
+        except Exception as e:
+            logging.warning(f"Error while quitting driver: {e}")
+
+
+_default_pools: dict[BrowserProfile, DriverPool] = {}
+_default_pool_lock = threading.Lock()
+
+def get_default_pool(profile: Optional[BrowserProfile] = None) -> DriverPool:
+    """
+    Process wide pool shared by every SeleniumWorkerStrategy using the same browser profile, shut down at interpreter exit.
+    """
+    profile = profile or BrowserProfile()
+    with _default_pool_lock:
+        pool = _default_pools.get(profile)
+        if pool is None:
+            pool = _default_pools[profile] = DriverPool(functools.partial(get_driver, profile))
+            atexit.register(pool.shutdown)
+        return pool
@@ -0,0 +1,28 @@
+import functools
+import time
+from typing import Any
+
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from scrapping_playbook_framework.lib.command_stats import record_command
+
+def instrument_driver(driver: WebDriver) -> WebDriver:
+    """
+    Time every command the driver sends to chromedriver, see lib.command_stats.collect_commands.
+    Instrumenting a driver twice (a pooled session) keeps a single wrapper.
+    """
+    command_executor: Any = driver.command_executor
+    execute = command_executor.execute
+    if getattr(execute, '__wrapped__', None) is not None:
+        return driver
+
+    @functools.wraps(execute)
+    def timed_execute(command: str, params: dict[str, Any]) -> Any:
+        started = time.perf_counter()
+        try:
+            return execute(command, params)
+        finally:
+            record_command(command, time.perf_counter() - started)
+
+    command_executor.execute = timed_execute
+    return driver
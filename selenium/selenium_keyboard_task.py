@@ -16,4 +16,8 @@ class SeleniumKeyboardPressTask(KeyboardPressTask):
 class SeleniumKeyboardTypeTask(KeyboardTypeTask):
     def __init__(self, driver: WebDriver, _keyboard_press_task: SeleniumKeyboardPressTask):
         super().__init__(_keyboard_press_task)
-        self.driver = driver
\ No newline at end of file
+        self.driver = driver
+
+    def send_text(self, text: str) -> None:
+        # One command for the whole text, straight to the focused element without the key name mapping
+        self.driver.switch_to.active_element.send_keys(text)
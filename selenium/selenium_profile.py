@@ -0,0 +1,109 @@
+from dataclasses import dataclass
+import json
+import logging
+from typing import TypedDict
+
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from scrapping_playbook_framework.lib.network_stats import record_request
+
+PAGE_LOAD_STRATEGIES = ('normal', 'eager', 'none')
+
+def extension_patterns(*extensions: str) -> tuple[str, ...]:
+    """
+    Patterns matching a file extension at the end of the URL path only, not in a host name ('*.css*' blocks css-tricks.com).
+    """
+    return tuple(pattern for extension in extensions for pattern in (f'*.{extension}', f'*.{extension}?*'))
+
+# URL patterns blocked for each resource type of `block_resources`, matched by Network.setBlockedURLs ('*' wildcards).
+# The blocked URLs apply to the page itself too, a pattern must never match the URL of a document.
+RESOURCE_PATTERNS: dict[str, tuple[str, ...]] = {
+    'image': extension_patterns('png', 'jpg', 'jpeg', 'gif', 'webp', 'avif', 'svg', 'ico', 'bmp'),
+    'font': extension_patterns('woff', 'woff2', 'ttf', 'otf', 'eot'),
+    'media': extension_patterns('mp4', 'webm', 'ogg', 'mp3', 'wav', 'm4a', 'mov', 'm3u8'),
+    'stylesheet': extension_patterns('css'),
+    'tracker': (
+        '*google-analytics.com*', '*googletagmanager.com*', '*doubleclick.net*', '*googlesyndication.com*',
+        '*facebook.net*', '*connect.facebook.com*', '*hotjar.com*', '*segment.io*', '*segment.com/analytics*',
+        '*scorecardresearch.com*', '*criteo.com*', '*taboola.com*', '*outbrain.com*', '*clarity.ms*',
+    ),
+}
+
+class BrowserProfileConfig(TypedDict, total=False):
+    """`browser` section of a playbook config"""
+    headless: bool
+    page_load_strategy: str # normal, eager (DOMContentLoaded) or none
+    block_resources: list[str] # keys of RESOURCE_PATTERNS
+    block_urls: list[str] # URL patterns, '*' wildcards
+
+
+@dataclass(frozen=True)
+class BrowserProfile:
+    """
+    Launch options of a browser session, sessions are only shared between runs with the same profile.
+    """
+    headless: bool = False
+    page_load_strategy: str = 'normal'
+    blocked_resources: tuple[str, ...] = ()
+    blocked_urls: tuple[str, ...] = ()
+
+    @classmethod
+    def from_config(cls, config: BrowserProfileConfig) -> 'BrowserProfile':
+        page_load_strategy = config.get('page_load_strategy', 'normal')
+        if page_load_strategy not in PAGE_LOAD_STRATEGIES:
+            raise ValueError(f"Unknown page_load_strategy: {page_load_strategy}, expected one of {', '.join(PAGE_LOAD_STRATEGIES)}")
+        blocked_resources = tuple(config.get('block_resources') or ())
+        for resource in blocked_resources:
+            if resource not in RESOURCE_PATTERNS:
+                raise ValueError(f"Unknown resource type to block: {resource}, expected one of {', '.join(RESOURCE_PATTERNS)}")
+        return cls(
+            headless=bool(config.get('headless', False)),
+            page_load_strategy=page_load_strategy,
+            blocked_resources=blocked_resources,
+            blocked_urls=tuple(config.get('block_urls') or ()),
+        )
+
+    def blocked_patterns(self) -> list[str]:
+        patterns = [pattern for resource in self.blocked_resources for pattern in RESOURCE_PATTERNS[resource]]
+        return patterns + list(self.blocked_urls)
+
+    @property
+    def reports_network(self) -> bool:
+        # Reading the network log costs a round trip per session, only done when something is blocked
+        return bool(self.blocked_resources or self.blocked_urls)
+
+    def apply(self, options: Options) -> None:
+        if self.headless:
+            options.add_argument('--headless=new')
+        options.page_load_strategy = self.page_load_strategy
+        if self.reports_network:
+            options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+            options.add_experimental_option('perfLoggingPrefs', {'enableNetwork': True, 'enablePage': False})
+
+    def configure(self, driver: WebDriver) -> None:
+        patterns = self.blocked_patterns()
+        if patterns:
+            driver.execute_cdp_cmd('Network.enable', {}) # type: ignore
+            driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': patterns}) # type: ignore
+
+
+def read_network_log(driver: WebDriver) -> None:
+    """
+    Drain the performance log of the session and report each request to lib.network_stats.
+    """
+    requests: dict[str, str] = {}
+    for entry in driver.get_log('performance'): # type: ignore
+        message = json.loads(entry['message'])['message']
+        method = message.get('method')
+        params = message.get('params', {})
+        if method == 'Network.requestWillBeSent':
+            requests[params['requestId']] = params.get('type') or 'Other'
+        elif method == 'Network.loadingFinished':
+            record_request(requests.pop(params['requestId'], 'Other'), False, int(params.get('encodedDataLength') or 0))
+        elif method == 'Network.loadingFailed':
+            # 'inspector' is the reason of the requests blocked by Network.setBlockedURLs
+            blocked = params.get('blockedReason') == 'inspector'
+            record_request(requests.pop(params['requestId'], params.get('type') or 'Other'), blocked)
+    if requests:
+        logging.debug(f"{len(requests)} requests still in flight when reading the network log")
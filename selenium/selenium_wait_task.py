@@ -1,12 +1,41 @@
-
 import logging
 import time
+from typing import Any
+import weakref
+from selenium.common.exceptions import JavascriptException
 from selenium.webdriver.remote.webdriver import WebDriver
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.common.by import By
-from scrapping_playbook_framework.task.dom_task import DOMElement, GetElementTask
-from scrapping_playbook_framework.task.wait_task import WaitTask, WaitTaskParams,WaitForElementTask,WaitForElementTaskParams
+from scrapping_playbook_framework.selenium.selenium_dom_task import SeleniumDOMElement
+from scrapping_playbook_framework.task.dom_task import DOMElement
+from scrapping_playbook_framework.task.wait_task import WaitForDomStableTask, WaitForDomStableTaskParams, WaitForNetworkIdleTask, WaitForNetworkIdleTaskParams, WaitTask, WaitTaskParams,WaitForElementTask,WaitForElementTaskParams
+
+# Seconds granted to an async script on top of its own timeout, the script always answers first
+SCRIPT_TIMEOUT_MARGIN = 5.0
+
+# Script timeout currently set on each driver, avoids a round trip to read or set it on every wait
+_script_timeouts: 'weakref.WeakKeyDictionary[WebDriver, float]' = weakref.WeakKeyDictionary()
+
+def execute_async_wait(driver: WebDriver, script: str, timeout: float, *args: Any) -> tuple[Any, float]:
+    """
+    Run a wait script resolving by itself within timeout seconds, the timeout in ms is passed as first argument.
+    The wait is restarted on the new document when the page navigates while waiting.
+    :return: The script result and the seconds waited.
+    """
+    required = timeout + SCRIPT_TIMEOUT_MARGIN
+    if _script_timeouts.get(driver, 0) < required:
+        driver.set_script_timeout(required)
+        _script_timeouts[driver] = required
+
+    started = time.monotonic()
+    while True:
+        remaining = max(timeout - (time.monotonic() - started), 0)
+        try:
+            result = driver.execute_async_script(script, remaining * 1000, *args)
+            return result, time.monotonic() - started
+        except JavascriptException as e:
+            # The time left is measured after the script, it may have waited for most of it before the unload
+            if 'unloaded' not in str(e) or time.monotonic() - started >= timeout:
+                raise
+            logging.debug("Document unloaded while waiting, waiting again on the new one")
 
 class SeleniumWaitTask(WaitTask):
     def __init__(self, driver: WebDriver):
@@ -15,19 +44,133 @@ class SeleniumWaitTask(WaitTask):
     def execute(self, ctx: WaitTaskParams) -> None:
         time.sleep(ctx['duration'])
 
+WAIT_FOR_ELEMENT_SCRIPT = """
+const [timeout, selector, done] = arguments;
+const found = document.querySelector(selector);
+if (found) {
+    done(found);
+    return;
+}
+let timer = null;
+const observer = new MutationObserver(() => {
+    const element = document.querySelector(selector);
+    if (element) {
+        observer.disconnect();
+        clearTimeout(timer);
+        done(element);
+    }
+});
+observer.observe(document, {childList: true, subtree: true, attributes: true});
+timer = setTimeout(() => {
+    observer.disconnect();
+    done(null);
+}, timeout);
+"""
+
 class SeleniumWaitForElementTask(WaitForElementTask):
-    def __init__(self, driver: WebDriver, _get_element_task: GetElementTask):
+    def __init__(self, driver: WebDriver):
         self.driver = driver
-        self._get_element_task = _get_element_task
 
     def execute(self, ctx: WaitForElementTaskParams) -> DOMElement:
-        timeout = ctx.get('timeout', 10) 
-        WebDriverWait(self.driver, timeout).until(
-            EC.presence_of_element_located((By.CSS_SELECTOR, ctx['selector']))
-        )
-
-        element = self._get_element_task.execute(ctx)
+        timeout = ctx.get('timeout', 10)
+        # The page notifies every DOM change and the element comes back with the answer, no polling
+        element, waited = execute_async_wait(self.driver, WAIT_FOR_ELEMENT_SCRIPT, timeout, ctx['selector'])
         if element is None:
-            logging.warning(f"Element with selector '{ctx['selector']}' not found after waiting {ctx['timeout']} seconds")
-            raise Exception(f"Element with selector '{ctx['selector']}' not found within {ctx['timeout']} seconds")
-        return element
\ No newline at end of file
+            logging.warning(f"Element with selector '{ctx['selector']}' not found after waiting {timeout} seconds")
+            raise TimeoutError(f"Element with selector '{ctx['selector']}' not found within {timeout} seconds")
+        logging.info(f"Element '{ctx['selector']}' found after {waited:.3f}s")
+        return SeleniumDOMElement(self.driver, element)
+
+# Fetch and XHR are counted from the first wait on a document, earlier resources are seen through the Resource Timing API
+WAIT_FOR_NETWORK_IDLE_SCRIPT = """
+const [timeout, idleTime, maxInflight, done] = arguments;
+if (!window.__playbookNetwork) {
+    const state = window.__playbookNetwork = {inflight: 0, lastActivity: 0};
+    for (const entry of performance.getEntriesByType('resource')) {
+        state.lastActivity = Math.max(state.lastActivity, entry.responseEnd);
+    }
+    const start = () => { state.inflight++; state.lastActivity = performance.now(); };
+    const end = () => { state.inflight = Math.max(state.inflight - 1, 0); state.lastActivity = performance.now(); };
+    const originalFetch = window.fetch;
+    if (originalFetch) {
+        window.fetch = function (...args) {
+            start();
+            return originalFetch.apply(this, args).finally(end);
+        };
+    }
+    const originalSend = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function (...args) {
+        start();
+        this.addEventListener('loadend', end, {once: true});
+        return originalSend.apply(this, args);
+    };
+    new PerformanceObserver(() => { state.lastActivity = performance.now(); }).observe({type: 'resource'});
+}
+const state = window.__playbookNetwork;
+const started = performance.now();
+const check = () => {
+    const now = performance.now();
+    const quiet = now - state.lastActivity;
+    if (document.readyState === 'complete' && state.inflight <= maxInflight && quiet >= idleTime) {
+        done(true);
+        return;
+    }
+    if (now - started >= timeout) {
+        done(false);
+        return;
+    }
+    setTimeout(check, Math.max(Math.min(idleTime - quiet, timeout - (now - started)), 20));
+};
+check();
+"""
+
+class SeleniumWaitForNetworkIdleTask(WaitForNetworkIdleTask):
+    def __init__(self, driver: WebDriver):
+        self.driver = driver
+
+    def execute(self, ctx: WaitForNetworkIdleTaskParams) -> float:
+        timeout = ctx.get('timeout', 10)
+        idle, waited = execute_async_wait(self.driver, WAIT_FOR_NETWORK_IDLE_SCRIPT, timeout, ctx.get('idle_time', 0.5) * 1000, ctx.get('max_inflight', 0))
+        if not idle:
+            raise TimeoutError(f"Network not idle within {timeout} seconds")
+        logging.info(f"Network idle after {waited:.3f}s")
+        return waited
+
+WAIT_FOR_DOM_STABLE_SCRIPT = """
+const [timeout, quietTime, selector, done] = arguments;
+const root = selector ? document.querySelector(selector) : document;
+if (!root) {
+    done(null);
+    return;
+}
+const started = performance.now();
+let lastMutation = started;
+const observer = new MutationObserver(() => { lastMutation = performance.now(); });
+observer.observe(root, {childList: true, subtree: true, attributes: true, characterData: true});
+const check = () => {
+    const now = performance.now();
+    const quiet = now - lastMutation;
+    if (quiet >= quietTime || now - started >= timeout) {
+        observer.disconnect();
+        done(quiet >= quietTime);
+        return;
+    }
+    setTimeout(check, Math.max(Math.min(quietTime - quiet, timeout - (now - started)), 10));
+};
+setTimeout(check, Math.min(quietTime, timeout));
+"""
+
+class SeleniumWaitForDomStableTask(WaitForDomStableTask):
+    def __init__(self, driver: WebDriver):
+        self.driver = driver
+
+    def execute(self, ctx: WaitForDomStableTaskParams) -> float:
+        timeout = ctx.get('timeout', 10)
+        selector = ctx.get('selector')
+        stable, waited = execute_async_wait(self.driver, WAIT_FOR_DOM_STABLE_SCRIPT, timeout, ctx.get('quiet_time', 0.5) * 1000, selector)
+        if stable is None:
+            raise Exception(f"Element with selector '{selector}' not found")
+        if not stable:
+            raise TimeoutError(f"DOM still changing after {timeout} seconds")
+        logging.info(f"DOM stable after {waited:.3f}s")
+        return waited
@@ -1,12 +1,34 @@
 from abc import abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+import logging
 import os
-from typing import Any, TypedDict
+import threading
+from typing import Any, Callable, Optional, TypedDict
+from urllib.parse import urlsplit
+from requests.cookies import RequestsCookieJar
+from scrapping_playbook_framework.lib.http_session import cookies_from_browser, get_session
 from scrapping_playbook_framework.task.task import ScrappingTask
-from requests import get
 
-class GoToParams(TypedDict):
+class GoToParams(TypedDict, total=False):
     url: str
-    
+    wait_until: str # commit, domcontentloaded, load (default), networkidle or selector:<css>
+    timeout: float
+    idle_time: float # quiet seconds of networkidle
+    stop_loading: bool # stop loading the rest of the page once the condition holds
+
+WAIT_UNTIL_CONDITIONS = ('commit', 'domcontentloaded', 'load', 'networkidle')
+WAIT_UNTIL_SELECTOR = 'selector:'
+
+def parse_wait_until(wait_until: str) -> tuple[str, Optional[str]]:
+    """
+    :return: The condition of a `wait_until` param and its selector for `selector:<css>`.
+    """
+    if wait_until.startswith(WAIT_UNTIL_SELECTOR):
+        return 'selector', wait_until[len(WAIT_UNTIL_SELECTOR):].strip()
+    if wait_until not in WAIT_UNTIL_CONDITIONS:
+        raise ValueError(f"Unknown wait_until: {wait_until}, expected one of {', '.join(WAIT_UNTIL_CONDITIONS)} or selector:<css>")
+    return wait_until, None
+
 class GoToTask(ScrappingTask[None]):
     def get_task_action_name(self) -> str:
         return "browser.goto"
@@ -36,23 +58,106 @@ class ScreenshotTask(ScrappingTask[None]):
     def execute(self, ctx : ScreenshotParams):
         pass
 
-class DownloadUrlParams(TypedDict):
+class DownloadUrlParams(TypedDict, total=False):
     url: str
     path: str
+    use_browser_cookies: bool # send the cookies of the browser session, for downloads behind a login
+    timeout: float
+
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+def download_file(url: str, path: str, cookies: Optional[RequestsCookieJar] = None, timeout: float = 60) -> int:
+    """
+    Stream a url to disk through the shared session, the file only appears once complete.
+    :return: Number of bytes written.
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    partial_path = f"{path}.part"
+    written = 0
+    try:
+        with get_session().get(url, stream=True, cookies=cookies, timeout=timeout) as response:
+            response.raise_for_status()
+            with open(partial_path, "wb") as f:
+                for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                    f.write(chunk)
+                    written += len(chunk)
+        os.replace(partial_path, path)
+    finally:
+        if os.path.exists(partial_path):
+            os.remove(partial_path)
+    return written
 
 class DownloadUrl(ScrappingTask[None]):
+    def __init__(self, cookies_provider: Optional[Callable[[], list[dict[str, Any]]]] = None):
+        """
+        :param cookies_provider: Returns the cookies of the browser session, used with `use_browser_cookies`.
+        """
+        self.cookies_provider = cookies_provider
+
     def get_task_action_name(self):
         return "browser.download_url"
+
+    def get_cookies(self, ctx: Any) -> Optional[RequestsCookieJar]:
+        if not ctx.get('use_browser_cookies'):
+            return None
+        if self.cookies_provider is None:
+            logging.warning("Browser cookies requested but this engine does not provide them")
+            return None
+        return cookies_from_browser(self.cookies_provider())
     
     def execute(self, ctx: DownloadUrlParams):
-        # make download and store in file
-        
-        path = ctx['path']
-        directory = os.path.dirname(path)
-        if directory:
-            os.makedirs(directory, exist_ok=True)
+        written = download_file(ctx["url"], ctx["path"], self.get_cookies(ctx), ctx.get('timeout', 60))
+        logging.debug(f"Downloaded {written} bytes from {ctx['url']} to {ctx['path']}")
+
+class DownloadItem(TypedDict):
+    url: str
+    path: str
+
+class DownloadResult(TypedDict):
+    url: str
+    path: str
+    ok: bool
+    bytes: int
+    error: Optional[str]
+
+class DownloadManyParams(TypedDict, total=False):
+    downloads: list[DownloadItem]
+    max_workers: int
+    per_host_limit: int # concurrent downloads allowed on a single host
+    use_browser_cookies: bool
+    timeout: float
+
+class DownloadMany(DownloadUrl):
+    """
+    Download a list of url/path pairs on a bounded thread pool, a failed download does not stop the others.
+    """
+    def get_task_action_name(self):
+        return "browser.download_many"
+
+    def execute(self, ctx: DownloadManyParams) -> list[DownloadResult]: # type: ignore
+        downloads = ctx['downloads']
+        cookies = self.get_cookies(ctx)
+        timeout = ctx.get('timeout', 60)
+        per_host_limit = max(int(ctx.get('per_host_limit', 2)), 1)
+        host_semaphores: dict[str, threading.Semaphore] = {}
+        host_semaphores_lock = threading.Lock()
 
-        response = get(ctx["url"])
+        def download(item: DownloadItem) -> DownloadResult:
+            host = urlsplit(item['url']).netloc
+            with host_semaphores_lock:
+                semaphore = host_semaphores.setdefault(host, threading.Semaphore(per_host_limit))
+            with semaphore:
+                try:
+                    written = download_file(item['url'], item['path'], cookies, timeout)
+                    return {'url': item['url'], 'path': item['path'], 'ok': True, 'bytes': written, 'error': None}
+                except Exception as e:
+                    logging.warning(f"Download of {item['url']} failed: {e}")
+                    return {'url': item['url'], 'path': item['path'], 'ok': False, 'bytes': 0, 'error': str(e)}
 
-        with open(ctx["path"], "wb") as f:
-            f.write(response.content)
\ No newline at end of file
+        with ThreadPoolExecutor(max_workers=max(int(ctx.get('max_workers', 8)), 1)) as executor:
+            results = list(executor.map(download, downloads))
+        logging.info(f"Downloaded {sum(result['ok'] for result in results)}/{len(results)} files")
+        return results
@@ -9,6 +9,9 @@ class DOMElementGetAttributeParams(TypedDict):
     attribute_name: str
 
 class DOMElement(ABC):
+    # Whether the element lives in a browser session, it can then only be used from the session that found it
+    session_bound = True
+
     @abstractmethod
     def get_text(self, ctx: Any) -> str | None:
         pass
@@ -43,6 +46,34 @@ class DOMElement(ABC):
     def screenshot(self, ctx: ScreenshotParams) -> None:
         pass
 
+    def extract(self, ctx: 'ExtractParams') -> list[dict[str, Any]]:
+        """
+        Generic extraction, one engine call per container and field. Engines override it to extract in a single call.
+        Property fields need an engine override, there is no generic way to read a DOM property.
+        """
+        fields = ExtractTask.normalize_fields(ctx['fields'])
+        rows: list[dict[str, Any]] = []
+        for container in self.get_elements({'selector': ctx['container']}):
+            row: dict[str, Any] = {}
+            for key, field in fields:
+                element = container.get_element({'selector': field['selector']}) if field['selector'] else container
+                if element is None:
+                    row[key] = None
+                elif field['kind'] == 'attribute':
+                    row[key] = element.get_attribute({'attribute_name': field['name']})
+                elif field['kind'] == 'property':
+                    raise ValueError(f"{type(self).__name__} can not extract the property '{field['name']}' of field '{key}'")
+                else:
+                    row[key] = element.get_text(None)
+            rows.append(row)
+        return rows
+
+    def get_outer_html(self, ctx: Any) -> str | None:
+        """
+        HTML of the element, itself included. None when the engine can not serialize its elements.
+        """
+        return None
+
 class SelectorParams(TypedDict):
     selector: str
 
@@ -60,4 +91,62 @@ class GetElementsTask(ScrappingTask[list[DOMElement]]):
 
     @abstractmethod
     def execute(self, ctx: SelectorParams) -> list[DOMElement]:
-        pass
\ No newline at end of file
+        pass
+
+class ExtractFieldParams(TypedDict, total=False):
+    selector: str # relative to the container, empty means the container itself
+    attribute: str
+    property: str
+
+class ExtractParams(TypedDict):
+    container: str
+    fields: dict[str, str | ExtractFieldParams] # a plain string is a selector whose text is extracted
+
+class ExtractField(TypedDict):
+    selector: str
+    kind: str # text, attribute or property
+    name: str
+
+class ExtractTask(ScrappingTask[list[dict[str, Any]]]):
+    """
+    Pull many fields from many elements at once, each container gives one dict keyed by field name.
+    """
+    def get_task_action_name(self) -> str:
+        return "dom.extract"
+
+    @abstractmethod
+    def execute(self, ctx: ExtractParams) -> list[dict[str, Any]]:
+        pass
+
+    @staticmethod
+    def normalize_fields(fields: dict[str, str | ExtractFieldParams]) -> list[tuple[str, ExtractField]]:
+        normalized: list[tuple[str, ExtractField]] = []
+        for key, spec in fields.items():
+            if isinstance(spec, str):
+                normalized.append((key, {'selector': spec, 'kind': 'text', 'name': ''}))
+                continue
+            if 'attribute' in spec and 'property' in spec:
+                raise ValueError(f"Field '{key}' can not extract both an attribute and a property")
+            selector = spec.get('selector') or ''
+            if 'attribute' in spec:
+                normalized.append((key, {'selector': selector, 'kind': 'attribute', 'name': spec['attribute']}))
+            elif 'property' in spec:
+                normalized.append((key, {'selector': selector, 'kind': 'property', 'name': spec['property']}))
+            else:
+                normalized.append((key, {'selector': selector, 'kind': 'text', 'name': ''}))
+        return normalized
+
+class SnapshotParams(TypedDict, total=False):
+    selector: str # snapshot only the first element matching, the whole document otherwise
+
+class SnapshotTask(ScrappingTask[DOMElement]):
+    """
+    Copy the rendered DOM once and return an element whose queries run locally, without the engine.
+    The copy is static: it does not follow later page changes and can not be clicked.
+    """
+    def get_task_action_name(self) -> str:
+        return "dom.snapshot"
+
+    @abstractmethod
+    def execute(self, ctx: SnapshotParams) -> Optional[DOMElement]:
+        pass
@@ -1,11 +1,14 @@
 
 
-from abc import abstractmethod
+from abc import ABC, abstractmethod
+import json
 import logging
-from typing import Any, TypedDict
+import time
+from typing import Any, Optional, TextIO, TypedDict
 from scrapping_playbook_framework.task.task import ScrappingTask
 import csv
 import os
+import sqlite3
 
 
 class ExportTask(ScrappingTask[None]):
@@ -59,3 +62,252 @@ class CSVExportTask(ExportTask):
             writer.writerows(cleaned_value)
 
         print(f"Successfully exported {len(value)} properties to {file_path}")
+
+
+class SQLiteExportParams(TypedDict, total=False):
+    file_path: str
+    variable: str
+    table: str
+    key: str | list[str] # upsert key, rows with an existing key are updated in place
+    indexes: list[str | list[str]] # secondary indexes, one column or a list of columns each
+    batch_size: int
+
+def _quote_identifier(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+def _sqlite_type(value: Any) -> str:
+    if isinstance(value, (bool, int)):
+        return "INTEGER"
+    if isinstance(value, float):
+        return "REAL"
+    if isinstance(value, bytes):
+        return "BLOB"
+    return "TEXT"
+
+def _sqlite_value(value: Any) -> Any:
+    if value is None or isinstance(value, (bool, int, float, str, bytes)):
+        return value
+    if isinstance(value, (dict, list, tuple)):
+        return json.dumps(value, default=str)
+    return str(value)
+
+class SQLiteTableWriter:
+    """
+    Write row dicts to a table, creating it or adding missing columns from the rows.
+    Each call to write is one transaction.
+    """
+    def __init__(self, connection: sqlite3.Connection, table: str, key: Optional[list[str]] = None, indexes: Optional[list[str | list[str]]] = None):
+        self.connection = connection
+        self.table = table
+        self.key = key or []
+        self.indexes = indexes or []
+        self._columns: Optional[set[str]] = None
+
+    def get_columns(self) -> set[str]:
+        if self._columns is None:
+            rows = self.connection.execute(f"PRAGMA table_info({_quote_identifier(self.table)})").fetchall()
+            self._columns = {row[1] for row in rows}
+        return self._columns
+
+    def ensure_schema(self, rows: list[dict[str, Any]]) -> None:
+        column_types: dict[str, str] = {}
+        for row in rows:
+            for column, value in row.items():
+                if column_types.get(column) is None or value is not None and column_types[column] == "TEXT":
+                    column_types[column] = _sqlite_type(value) if value is not None else "TEXT"
+
+        columns = self.get_columns()
+        if not columns:
+            definitions = ", ".join(f"{_quote_identifier(column)} {column_type}" for column, column_type in column_types.items())
+            self.connection.execute(f"CREATE TABLE IF NOT EXISTS {_quote_identifier(self.table)} ({definitions})")
+            logging.info(f"Created table {self.table} with columns {', '.join(column_types)}")
+        else:
+            for column, column_type in column_types.items():
+                if column not in columns:
+                    self.connection.execute(f"ALTER TABLE {_quote_identifier(self.table)} ADD COLUMN {_quote_identifier(column)} {column_type}")
+                    logging.info(f"Added column {column} to table {self.table}")
+        self._columns = columns | set(column_types)
+
+        if self.key:
+            self._create_index(self.key, unique=True)
+        for index in self.indexes:
+            self._create_index([index] if isinstance(index, str) else list(index), unique=False)
+
+    def _create_index(self, columns: list[str], unique: bool) -> None:
+        missing = [column for column in columns if column not in self.get_columns()]
+        if missing:
+            logging.warning(f"Can not index {self.table} on missing columns: {', '.join(missing)}")
+            return
+        name = f"{'ux' if unique else 'ix'}_{self.table}_{'_'.join(columns)}"
+        statement = (
+            f"CREATE {'UNIQUE ' if unique else ''}INDEX IF NOT EXISTS {_quote_identifier(name)} "
+            f"ON {_quote_identifier(self.table)} ({', '.join(_quote_identifier(column) for column in columns)})"
+        )
+        try:
+            self.connection.execute(statement)
+        except sqlite3.IntegrityError:
+            if not unique:
+                raise
+            # The table was filled before it had a key, upserting its rows would have kept the last one of each key
+            removed = self._remove_duplicates(columns)
+            logging.warning(f"Removed {removed} rows of {self.table} duplicating an earlier row on key {', '.join(columns)}, kept the last one of each key")
+            self.connection.execute(statement)
+
+    def _remove_duplicates(self, columns: list[str]) -> int:
+        table = _quote_identifier(self.table)
+        key_columns = ', '.join(_quote_identifier(column) for column in columns)
+        # Rows with a NULL in their key never conflict, they are kept
+        not_null = ' AND '.join(f"{_quote_identifier(column)} IS NOT NULL" for column in columns)
+        cursor = self.connection.execute(
+            f"DELETE FROM {table} WHERE {not_null} AND rowid NOT IN (SELECT MAX(rowid) FROM {table} WHERE {not_null} GROUP BY {key_columns})"
+        )
+        return cursor.rowcount
+
+    def write(self, rows: list[dict[str, Any]]) -> None:
+        if not rows:
+            return
+        with self.connection:
+            self.ensure_schema(rows)
+            # Rows are grouped by key set, a missing field must not overwrite a stored value with NULL
+            groups: dict[tuple[str, ...], list[dict[str, Any]]] = {}
+            for row in rows:
+                missing_key = [column for column in self.key if row.get(column) is None]
+                if missing_key:
+                    raise Exception(f"Row is missing upsert key {', '.join(missing_key)}: {row}")
+                groups.setdefault(tuple(row.keys()), []).append(row)
+            for columns, group in groups.items():
+                self.connection.executemany(self._insert_statement(columns), [[_sqlite_value(row[column]) for column in columns] for row in group])
+
+    def _insert_statement(self, columns: tuple[str, ...]) -> str:
+        statement = (
+            f"INSERT INTO {_quote_identifier(self.table)} ({', '.join(_quote_identifier(column) for column in columns)}) "
+            f"VALUES ({', '.join('?' for _ in columns)})"
+        )
+        if not self.key:
+            return statement
+        updates = [f"{_quote_identifier(column)} = excluded.{_quote_identifier(column)}" for column in columns if column not in self.key]
+        conflict_target = ', '.join(_quote_identifier(column) for column in self.key)
+        if not updates:
+            return f"{statement} ON CONFLICT ({conflict_target}) DO NOTHING"
+        return f"{statement} ON CONFLICT ({conflict_target}) DO UPDATE SET {', '.join(updates)}"
+
+class SQLiteExportTask(ExportTask):
+    def get_task_action_name(self):
+        return "export.sqlite"
+
+    def execute(self, ctx: SQLiteExportParams):
+        file_path = ctx["file_path"]
+
+        value : Any = ctx[ctx['variable']] # type: ignore
+        if not isinstance(value, list) or not all(isinstance(p, dict) for p in value): # type: ignore
+            raise Exception(f"Value of variable '{ctx['variable']}' is not a list of dictionaries.")
+        value : list[dict[str, Any]] = value # type: ignore
+        if len(value) == 0:
+            logging.warning(f"Variable '{ctx['variable']}' is empty.")
+            return
+
+        directory = os.path.dirname(file_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        key = ctx.get('key')
+        batch_size = max(int(ctx.get('batch_size', 500)), 1)
+        connection = sqlite3.connect(file_path)
+        try:
+            writer = SQLiteTableWriter(
+                connection,
+                ctx.get('table') or ctx['variable'],
+                key=[key] if isinstance(key, str) else key,
+                indexes=ctx.get('indexes'),
+            )
+            for start in range(0, len(value), batch_size):
+                writer.write(value[start:start + batch_size])
+        finally:
+            connection.close()
+
+        logging.info(f"Exported {len(value)} rows to {file_path}")
+
+class StreamingExporter(ABC):
+    """
+    Append rows to a file as they are produced, used by map tasks to export each iteration once it completes.
+    Rows are buffered and written when the buffer holds `flush_every` rows or `flush_interval` seconds went by.
+    """
+    def __init__(self, file_path: str, flush_every: int = 100, flush_interval: float = 5.0):
+        self.file_path = file_path
+        self.flush_every = max(flush_every, 1)
+        self.flush_interval = flush_interval
+        self.rows_written = 0
+        self._buffer: list[dict[str, Any]] = []
+        self._file: Optional[TextIO] = None
+        self._last_flush = time.monotonic()
+
+    def open(self) -> 'StreamingExporter':
+        directory = os.path.dirname(self.file_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = open(self.file_path, "w", newline="", encoding="utf-8")
+        self._last_flush = time.monotonic()
+        return self
+
+    def write(self, row: dict[str, Any]) -> None:
+        self._buffer.append(row)
+        if len(self._buffer) >= self.flush_every or time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self) -> None:
+        if self._file is None:
+            raise Exception(f"Exporter for {self.file_path} is not open.")
+        if self._buffer:
+            self.write_rows(self._file, self._buffer)
+            self.rows_written += len(self._buffer)
+            self._buffer = []
+        self._file.flush()
+        self._last_flush = time.monotonic()
+
+    def close(self) -> None:
+        if self._file is None:
+            return
+        try:
+            self.flush()
+        finally:
+            self._file.close()
+            self._file = None
+        logging.info(f"Exported {self.rows_written} rows to {self.file_path}")
+
+    @abstractmethod
+    def write_rows(self, file: TextIO, rows: list[dict[str, Any]]) -> None:
+        pass
+
+class CSVStreamingExporter(StreamingExporter):
+    """
+    Columns are the sorted keys of the first row, later rows can not add columns.
+    """
+    def __init__(self, file_path: str, flush_every: int = 100, flush_interval: float = 5.0):
+        super().__init__(file_path, flush_every, flush_interval)
+        self._writer: Optional[csv.DictWriter[str]] = None
+
+    def write_rows(self, file: TextIO, rows: list[dict[str, Any]]) -> None:
+        if self._writer is None:
+            self._writer = csv.DictWriter(file, fieldnames=sorted(rows[0].keys()), extrasaction='ignore')
+            self._writer.writeheader()
+        self._writer.writerows(rows)
+
+class JSONLStreamingExporter(StreamingExporter):
+    def write_rows(self, file: TextIO, rows: list[dict[str, Any]]) -> None:
+        file.writelines(json.dumps(row, default=str) + "\n" for row in rows)
+
+class StreamingExporterFactory:
+    @staticmethod
+    def create(config: dict[str, Any]) -> StreamingExporter:
+        exporter_type = config.get('type')
+        options = {
+            'file_path': config['file_path'],
+            'flush_every': config.get('flush_every', 100),
+            'flush_interval': config.get('flush_interval', 5.0),
+        }
+        if exporter_type == 'csv':
+            return CSVStreamingExporter(**options)
+        elif exporter_type == 'jsonl':
+            return JSONLStreamingExporter(**options)
+        else:
+            raise ValueError(f"Unknown exporter type: {exporter_type}")
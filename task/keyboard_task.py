@@ -1,5 +1,6 @@
-from abc import abstractmethod
-from typing import TypedDict
+from abc import ABC, abstractmethod
+import logging
+from typing import Any, Optional, TypedDict
 from scrapping_playbook_framework.task.task import ScrappingTask
 import time
 import random
@@ -15,29 +16,148 @@ class KeyboardPressTask(ScrappingTask[None]):
     def execute(self, ctx: KeyboardPressTaskParams) -> None:
         pass
 
-class KeyboardTypeParams(TypedDict):
+
+class DelayDistribution(ABC):
+    @abstractmethod
+    def sample(self) -> float:
+        """Draw a delay in seconds"""
+        pass
+
+class ConstantDelay(DelayDistribution):
+    def __init__(self, value: float):
+        self.value = value
+
+    def sample(self) -> float:
+        return self.value
+
+class UniformDelay(DelayDistribution):
+    def __init__(self, low: float, high: float):
+        self.low = low
+        self.high = high
+
+    def sample(self) -> float:
+        return random.uniform(self.low, self.high)
+
+class GaussianDelay(DelayDistribution):
+    def __init__(self, mean: float, stddev: float, minimum: float = 0.0):
+        self.mean = mean
+        self.stddev = stddev
+        self.minimum = minimum
+
+    def sample(self) -> float:
+        return max(random.gauss(self.mean, self.stddev), self.minimum)
+
+class DelayDistributionFactory:
+    @staticmethod
+    def create(config: dict[str, Any] | float) -> DelayDistribution:
+        if isinstance(config, (int, float)):
+            return ConstantDelay(config)
+        distribution_type = config.get('type')
+        if distribution_type == 'constant':
+            return ConstantDelay(config['value'])
+        elif distribution_type == 'uniform':
+            return UniformDelay(config['low'], config['high'])
+        elif distribution_type == 'gaussian':
+            return GaussianDelay(config['mean'], config['stddev'], config.get('minimum', 0.0))
+        else:
+            raise ValueError(f"Unknown delay distribution type: {distribution_type}")
+
+
+class TypingProfile:
+    def __init__(self, char_delay: Optional[DelayDistribution] = None, space_delay: Optional[DelayDistribution] = None, pause_probability: float = 0.0, pause_delay: Optional[DelayDistribution] = None, bulk: bool = False):
+        """
+        :param char_delay: Delay after each character.
+        :param space_delay: Added to char_delay after a space.
+        :param pause_probability: Chance of a longer "thinking" pause after a character.
+        :param bulk: Send the whole text at once, delays are ignored.
+        """
+        self.char_delay = char_delay
+        self.space_delay = space_delay
+        self.pause_probability = pause_probability
+        self.pause_delay = pause_delay
+        self.bulk = bulk
+
+    def delay_after(self, char: str) -> float:
+        delay = self.char_delay.sample() if self.char_delay else 0.0
+        if char == ' ' and self.space_delay:
+            delay += self.space_delay.sample()
+        if self.pause_delay and random.random() < self.pause_probability:
+            delay += self.pause_delay.sample()
+        return delay
+
+class TypingProfileFactory:
+    profiles: dict[str, TypingProfile] = {
+        # One keystroke command for the whole text
+        'instant': TypingProfile(bulk=True),
+        'fast': TypingProfile(char_delay=UniformDelay(0.02, 0.06)),
+        # Slightly random delays, longer after spaces and an occasional pause
+        'human': TypingProfile(
+            char_delay=UniformDelay(0.1, 0.6),
+            space_delay=UniformDelay(0.05, 0.25),
+            pause_probability=0.06,
+            pause_delay=UniformDelay(0.5, 1.2),
+        ),
+    }
+
+    @staticmethod
+    def register(name: str, profile: TypingProfile) -> None:
+        TypingProfileFactory.profiles[name] = profile
+
+    @staticmethod
+    def create(config: str | dict[str, Any]) -> TypingProfile:
+        """
+        :param config: A profile name, or a dict overriding the delays of its 'base' profile (human by default).
+        """
+        if isinstance(config, str):
+            profile = TypingProfileFactory.profiles.get(config)
+            if profile is None:
+                raise ValueError(f"Unknown typing profile: {config}")
+            return profile
+        base = TypingProfileFactory.create(config.get('base', 'human'))
+        return TypingProfile(
+            char_delay=DelayDistributionFactory.create(config['char_delay']) if 'char_delay' in config else base.char_delay,
+            space_delay=DelayDistributionFactory.create(config['space_delay']) if 'space_delay' in config else base.space_delay,
+            pause_probability=config.get('pause_probability', base.pause_probability),
+            pause_delay=DelayDistributionFactory.create(config['pause_delay']) if 'pause_delay' in config else base.pause_delay,
+            bulk=config.get('bulk', base.bulk),
+        )
+
+
+class KeyboardTypeParams(TypedDict, total=False):
     text: str
+    typing_profile: str | dict[str, Any]
 
-class KeyboardTypeTask(ScrappingTask[None]):
+class KeyboardTypeTask(ScrappingTask[float]):
     def __init__(self, _keyboard_press_task: KeyboardPressTask):
         self._keyboard_press_task = _keyboard_press_task
 
     def get_task_action_name(self):
         return "keyboard.type"
 
-    def execute(self, ctx: KeyboardTypeParams) -> None:
-        text = ctx.get('text', '')
+    def send_text(self, text: str) -> None:
+        """
+        Send free text as typed characters, it is never read as a key name ('#enter' types '#enter').
+        Engines override it to send the whole text in a single command.
+        """
         for char in text:
-            # press the key
             self._keyboard_press_task.execute({'key': char})
 
-            # small, slightly random delay to mimic human typing
-            delay = random.uniform(0.1, 0.6)
-            if char == ' ':
-                # a bit longer pause for spaces
-                delay += random.uniform(0.05, 0.25)
-            time.sleep(delay)
-
-            # occasional longer "thinking" pause
-            if random.random() < 0.06:
-                time.sleep(random.uniform(0.5, 1.2))
\ No newline at end of file
+    def execute(self, ctx: KeyboardTypeParams) -> float:
+        """
+        :return: Seconds spent typing.
+        """
+        text = ctx.get('text', '')
+        # Set on the task or once for the whole playbook in config
+        profile_config = ctx.get('typing_profile') or 'human'
+        profile = TypingProfileFactory.create(profile_config)
+        started = time.monotonic()
+        if profile.bulk:
+            if text:
+                self.send_text(text)
+        else:
+            for char in text:
+                self._keyboard_press_task.execute({'key': char})
+                time.sleep(profile.delay_after(char))
+        elapsed = time.monotonic() - started
+        logging.info(f"Typed {len(text)} characters in {elapsed:.2f}s ({profile_config if isinstance(profile_config, str) else 'custom'} profile)")
+        return elapsed
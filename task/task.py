@@ -1,4 +1,7 @@
 from abc import ABC, abstractmethod
+import asyncio
+import contextvars
+from concurrent.futures import Executor
 from typing import Any, Generic, TypeVar, Optional
 
 T = TypeVar("T")
@@ -13,3 +16,37 @@ class ScrappingTask(ABC, Generic[T]):
     def execute(self, ctx: Any) -> Optional[T]:
         """Execute the task. Default implementation returns None."""
         return None
+
+
+class AsyncScrappingTask(ABC, Generic[T]):
+    @abstractmethod
+    def get_task_action_name(self) -> str:
+        pass
+
+    @abstractmethod
+    async def execute(self, ctx: Any) -> Optional[T]:
+        """Execute the task without blocking the event loop."""
+        return None
+
+
+class SyncTaskAdapter(AsyncScrappingTask[T]):
+    """
+    Run a synchronous task in an executor, until an engine provides native async tasks.
+    """
+    def __init__(self, task: ScrappingTask[T], executor: Optional[Executor] = None):
+        self.task = task
+        self.executor = executor
+
+    def get_task_action_name(self) -> str:
+        return self.task.get_task_action_name()
+
+    async def execute(self, ctx: Any) -> Optional[T]:
+        # Context variables (current task, tracing...) must follow the call into the executor thread
+        return await asyncio.get_running_loop().run_in_executor(self.executor, contextvars.copy_context().run, self.task.execute, ctx)
+
+
+def to_async_tasks(tasks_availables_dict: dict[str, Any], executor: Optional[Executor] = None) -> dict[str, AsyncScrappingTask[Any]]:
+    return {
+        name: task if isinstance(task, AsyncScrappingTask) else SyncTaskAdapter(task, executor)
+        for name, task in tasks_availables_dict.items()
+    }
@@ -29,3 +29,37 @@ class WaitForElementTask(ScrappingTask[DOMElement]):
     @abstractmethod
     def execute(self, ctx: WaitForElementTaskParams) -> DOMElement:
         pass
+
+class WaitForNetworkIdleTaskParams(TypedDict, total=False):
+    timeout: float
+    idle_time: float
+    max_inflight: int
+
+class WaitForNetworkIdleTask(ScrappingTask[float]):
+    """
+    Wait until the page is loaded and no request is running for idle_time seconds.
+    :return: Seconds actually waited.
+    """
+    def get_task_action_name(self) -> str:
+        return 'wait.for_network_idle'
+
+    @abstractmethod
+    def execute(self, ctx: WaitForNetworkIdleTaskParams) -> float:
+        pass
+
+class WaitForDomStableTaskParams(TypedDict, total=False):
+    timeout: float
+    quiet_time: float
+    selector: str
+
+class WaitForDomStableTask(ScrappingTask[float]):
+    """
+    Wait until the DOM (or the element matching selector) has not changed for quiet_time seconds.
+    :return: Seconds actually waited.
+    """
+    def get_task_action_name(self) -> str:
+        return 'wait.for_dom_stable'
+
+    @abstractmethod
+    def execute(self, ctx: WaitForDomStableTaskParams) -> float:
+        pass
@@ -0,0 +1,12 @@
+import importlib.util
+import os
+import sys
+import types
+
+# The modules import each other as `scrapping_playbook_framework.*`, expose the checkout under that name
+# when it is not already importable (e.g. cloned under another directory name)
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if importlib.util.find_spec('scrapping_playbook_framework') is None:
+    package = types.ModuleType('scrapping_playbook_framework')
+    package.__path__ = [ROOT]
+    sys.modules['scrapping_playbook_framework'] = package
@@ -0,0 +1,50 @@
+from typing import Any, Optional
+
+
+class FakeClock:
+    """time.monotonic replacement, only moves when a fake script runs"""
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FakeWebDriver:
+    """
+    WebDriver answering scripts from a queue: each execute_async_script call pops the next result, exceptions are raised.
+    Every call is recorded in `calls` as (command, first argument, other arguments).
+    :param clock: Advanced by `script_duration` seconds by every async script.
+    """
+    def __init__(self, page_load_strategy: str = 'normal', async_results: Optional[list[Any]] = None, clock: Optional[FakeClock] = None, script_duration: float = 0.0):
+        self.capabilities = {'pageLoadStrategy': page_load_strategy}
+        self.async_results = list(async_results or [])
+        self.calls: list[tuple[str, Any, tuple[Any, ...]]] = []
+        self.script_timeout: Optional[float] = None
+        self.time_origin = 1000.0
+        self.clock = clock
+        self.script_duration = script_duration
+
+    def get(self, url: str) -> None:
+        self.calls.append(('get', url, ()))
+
+    def execute_script(self, script: str, *args: Any) -> Any:
+        self.calls.append(('execute_script', script, args))
+        if 'timeOrigin' in script:
+            return self.time_origin
+        return None
+
+    def execute_async_script(self, script: str, *args: Any) -> Any:
+        self.calls.append(('execute_async_script', script, args))
+        result = self.async_results.pop(0)
+        if self.clock is not None:
+            self.clock.now += self.script_duration
+        if isinstance(result, BaseException):
+            raise result
+        return result
+
+    def set_script_timeout(self, timeout: float) -> None:
+        self.script_timeout = timeout
+
+    def commands(self) -> list[str]:
+        return [command for command, _, _ in self.calls]
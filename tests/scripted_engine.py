@@ -0,0 +1,60 @@
+import threading
+import time
+from collections import Counter
+from typing import Any, Callable, Optional
+
+from scrapping_playbook_framework.playbook_reader import PlaybookDict, yaml_playbook_to_dict
+from scrapping_playbook_framework.task.task import ScrappingTask
+from scrapping_playbook_framework.worker import Worker, WorkerEngine
+from scrapping_playbook_framework.worker_strategies.worker_strategy import WorkerStrategy
+
+
+class ScriptedTask(ScrappingTask[Any]):
+    def __init__(self, name: str, function: Callable[[Any], Any], calls: Counter, lock: threading.Lock):
+        self.name = name
+        self.function = function
+        self.calls = calls
+        self.lock = lock
+
+    def get_task_action_name(self) -> str:
+        return self.name
+
+    def execute(self, ctx: Any) -> Any:
+        with self.lock:
+            self.calls[self.name] += 1
+        return self.function(ctx)
+
+
+def echo(ctx: Any) -> Any:
+    return ctx['value']
+
+def sleep(ctx: Any) -> None:
+    time.sleep(float(ctx['seconds']))
+
+def fail(ctx: Any) -> None:
+    raise RuntimeError(f"failed on {ctx.get('value')}")
+
+
+class ScriptedWorkerStrategy(WorkerStrategy):
+    """
+    Engine without browser whose tasks are plain functions, every call is counted by action name.
+    test.echo returns its `value` param, test.sleep waits `seconds`, test.fail raises.
+    """
+    def __init__(self, extra_tasks: Optional[dict[str, Callable[[Any], Any]]] = None):
+        self.functions: dict[str, Callable[[Any], Any]] = {'test.echo': echo, 'test.sleep': sleep, 'test.fail': fail, **(extra_tasks or {})}
+        self.calls: Counter = Counter()
+        self.sessions = 0
+        self._lock = threading.Lock()
+
+    def get_available_tasks(self) -> dict[str, ScrappingTask[Any]]:
+        with self._lock:
+            self.sessions += 1
+        return {name: ScriptedTask(name, function, self.calls, self._lock) for name, function in self.functions.items()}
+
+
+def playbook(yaml_content: str) -> PlaybookDict:
+    return yaml_playbook_to_dict(yaml_content)
+
+
+def run(yaml_content: str, strategy: Optional[WorkerStrategy] = None, **options: Any) -> dict[str, Any]:
+    return Worker(playbook(yaml_content), WorkerEngine.SELENIUM, strategy=strategy or ScriptedWorkerStrategy(), **options).start()
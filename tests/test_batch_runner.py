@@ -0,0 +1,71 @@
+import os
+from typing import Any
+
+import pytest
+
+from scrapping_playbook_framework.batch_runner import BatchRunner
+from scrapping_playbook_framework.benchmarks.fake_engine import FakeWorkerStrategy
+from scrapping_playbook_framework.playbook_reader import yaml_playbook_to_dict
+from scrapping_playbook_framework.task.browser_task import GoToParams, GoToTask
+from scrapping_playbook_framework.task.task import ScrappingTask
+from scrapping_playbook_framework.worker import WorkerEngine, strategies
+
+PLAYBOOK = """
+config: {}
+tasks:
+  - {name: Open, action: browser.goto, url: '{{page}}', output: opened}
+"""
+
+
+class CrashingGoToTask(GoToTask):
+    def execute(self, ctx: GoToParams) -> Any:
+        if ctx['url'] == 'crash':
+            # Like an OOM kill or a browser taking its process down
+            os._exit(1)
+        if ctx['url'] == 'fail':
+            raise RuntimeError("page failed")
+        return ctx['url']
+
+
+class CrashingWorkerStrategy(FakeWorkerStrategy):
+    def get_available_tasks(self) -> dict[str, ScrappingTask[Any]]:
+        tasks = super().get_available_tasks()
+        go_to_task = CrashingGoToTask()
+        tasks[go_to_task.get_task_action_name()] = go_to_task
+        return tasks
+
+
+@pytest.fixture
+def engine(monkeypatch) -> WorkerEngine:
+    # Pool processes are forked, they see the patched strategies
+    monkeypatch.setitem(strategies, WorkerEngine.PLAYWRIGHT, CrashingWorkerStrategy)
+    return WorkerEngine.PLAYWRIGHT
+
+
+def run(engine: WorkerEngine, urls: list[str], **options: Any) -> list:
+    runner = BatchRunner(yaml_playbook_to_dict(PLAYBOOK), engine, **options)
+    return list(runner.run({'page': url} for url in urls))
+
+
+def test_results_in_input_order(engine):
+    urls = [f"page-{index}" for index in range(20)]
+    results = run(engine, urls, processes=3, ordered=True)
+    assert [result.index for result in results] == list(range(20))
+    assert [result.outputs['opened'] for result in results] == urls
+
+
+def test_failing_record_is_isolated(engine):
+    results = sorted(run(engine, ['a', 'fail', 'b'], processes=2), key=lambda result: result.index)
+    assert [result.ok for result in results] == [True, False, True]
+    assert 'page failed' in results[1].error
+
+
+def test_dead_process_does_not_abort_the_batch(engine):
+    urls = [f"page-{index}" for index in range(10)] + ['crash'] + [f"page-{index}" for index in range(10, 30)]
+    results = run(engine, urls, processes=2, ordered=True)
+    assert [result.index for result in results] == list(range(len(urls)))
+    crashed = results[10]
+    assert not crashed.ok and 'BrokenProcessPool' in crashed.error
+    assert crashed.record == {'page': 'crash'}
+    # Records in flight with the crashed one fail with it, the ones submitted afterwards run on a new pool
+    assert all(result.ok for result in results[-10:])
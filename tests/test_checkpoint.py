@@ -0,0 +1,174 @@
+import os
+import sys
+from typing import Any
+
+import pytest
+
+from scripted_engine import ScriptedWorkerStrategy, playbook
+from scrapping_playbook_framework.lib.iteration_store import IterationStore
+from scrapping_playbook_framework.playbook_reader import from_yaml_file
+from scrapping_playbook_framework.task.dom_task import DOMElement
+from scrapping_playbook_framework.worker import Worker, WorkerEngine
+
+CHECKPOINTED_MAP = """
+config: {{checkpoint: '{store}'}}
+tasks:
+  - name: Visit
+    action: map
+    map: items
+    item_name: item
+    output: visits
+    tasks:
+      - {{name: Open, action: test.open, value: '{{{{item}}}}', output: page}}
+"""
+
+# Two sibling maps with the same name over the same items
+INCREMENTAL_MAPS = """
+config: {incremental_max_age_days: 30}
+tasks:
+  - name: Read
+    action: map
+    map: items
+    item_name: item
+    incremental: true
+    output: first
+    tasks:
+      - {name: Open, action: test.open, value: 'first {{item}}', output: page}
+  - name: Read
+    action: map
+    map: items
+    item_name: item
+    incremental: true
+    output: second
+    tasks:
+      - {name: Open, action: test.open, value: 'second {{item}}', output: page}
+"""
+
+
+class CrashingOpen:
+    """test.open returning its value, raising on the values of `crash_on`"""
+    def __init__(self):
+        self.opened: list[str] = []
+        self.crash_on: set[str] = set()
+
+    def __call__(self, ctx: Any) -> str:
+        if ctx['value'] in self.crash_on:
+            raise RuntimeError(f"crashed on {ctx['value']}")
+        self.opened.append(ctx['value'])
+        return ctx['value']
+
+
+def run(yaml_content: str, open_task: CrashingOpen, **options: Any) -> dict[str, Any]:
+    strategy = ScriptedWorkerStrategy({'test.open': open_task})
+    return Worker(playbook(yaml_content) if isinstance(yaml_content, str) else yaml_content, WorkerEngine.SELENIUM, strategy=strategy, **options).start()
+
+
+def test_crashed_run_resumes_after_completed_iterations(tmp_path):
+    store = str(tmp_path / 'checkpoint.sqlite')
+    yaml_content = CHECKPOINTED_MAP.format(store=store)
+    items = ['a', 'b', 'c', 'd']
+    open_task = CrashingOpen()
+    open_task.crash_on = {'c'}
+    with pytest.raises(RuntimeError):
+        run(yaml_content, open_task, variables={'items': items})
+    assert open_task.opened == ['a', 'b']
+
+    open_task = CrashingOpen()
+    outputs = run(yaml_content, open_task, variables={'items': items})
+    assert open_task.opened == ['c', 'd']
+    assert [visit['page'] for visit in outputs['visits']] == items
+    # The run completed, its checkpoints are gone and the next run starts over
+    open_task = CrashingOpen()
+    run(yaml_content, open_task, variables={'items': items})
+    assert open_task.opened == items
+
+
+def test_checkpoint_of_other_inputs_is_not_restored(tmp_path):
+    yaml_content = CHECKPOINTED_MAP.format(store=str(tmp_path / 'checkpoint.sqlite'))
+    open_task = CrashingOpen()
+    open_task.crash_on = {'b'}
+    with pytest.raises(RuntimeError):
+        run(yaml_content, open_task, variables={'items': ['a', 'b']})
+    open_task = CrashingOpen()
+    run(yaml_content, open_task, variables={'items': ['a', 'b', 'c']})
+    assert open_task.opened == ['a', 'b', 'c']
+
+
+def test_unchanged_items_are_reused_per_map(tmp_path):
+    store = IterationStore(str(tmp_path / 'incremental.sqlite'))
+    open_task = CrashingOpen()
+    outputs = run(INCREMENTAL_MAPS, open_task, variables={'items': ['a', 'b']}, incremental=store)
+    assert [visit['page'] for visit in outputs['second']] == ['second a', 'second b']
+
+    open_task = CrashingOpen()
+    outputs = run(INCREMENTAL_MAPS, open_task, variables={'items': ['a', 'b', 'c']}, incremental=store)
+    # Sibling maps with the same name keep their own iterations
+    assert open_task.opened == ['first c', 'second c']
+    assert [visit['page'] for visit in outputs['first']] == ['first a', 'first b', 'first c']
+    assert [visit['page'] for visit in outputs['second']] == ['second a', 'second b', 'second c']
+
+
+def test_same_playbook_in_two_files_does_not_share_iterations(tmp_path):
+    store = IterationStore(str(tmp_path / 'incremental.sqlite'))
+    paths = []
+    for name in ('a.yaml', 'b.yaml'):
+        path = tmp_path / name
+        path.write_text(INCREMENTAL_MAPS, encoding='utf-8')
+        paths.append(str(path))
+    run(from_yaml_file(paths[0]), CrashingOpen(), variables={'items': ['a']}, incremental=store)
+    open_task = CrashingOpen()
+    run(from_yaml_file(paths[1]), open_task, variables={'items': ['a']}, incremental=store)
+    assert open_task.opened == ['first a', 'second a']
+    open_task = CrashingOpen()
+    run(from_yaml_file(paths[0]), open_task, variables={'items': ['a']}, incremental=store)
+    assert open_task.opened == []
+
+
+@pytest.mark.skipif(sys.platform in ('win32', 'darwin'), reason="XDG_CACHE_HOME is only read on Linux")
+def test_default_incremental_store_is_in_the_user_cache(tmp_path, monkeypatch):
+    monkeypatch.setenv('XDG_CACHE_HOME', str(tmp_path / 'cache'))
+    monkeypatch.chdir(tmp_path)
+    run(INCREMENTAL_MAPS, CrashingOpen(), variables={'items': ['a']})
+    assert os.path.exists(tmp_path / 'cache' / 'browser-playbook' / 'incremental.sqlite')
+    assert os.listdir(tmp_path) == ['cache']
+
+
+class TextElement(DOMElement):
+    """Element of an engine that can not serialize its HTML"""
+    def __init__(self, text: str):
+        self.text = text
+
+    def __str__(self) -> str:
+        return self.text
+
+    def get_text(self, ctx: Any) -> str:
+        return self.text
+
+    def get_attribute(self, ctx: Any) -> None:
+        return None
+
+    def get_position(self, ctx: Any) -> None:
+        return None
+
+    def click(self, ctx: Any) -> None:
+        pass
+
+    def get_element(self, ctx: Any) -> None:
+        return None
+
+    def get_elements(self, ctx: Any) -> list[DOMElement]:
+        return []
+
+    def get_shadow_root(self, ctx: Any) -> None:
+        return None
+
+    def screenshot(self, ctx: Any) -> None:
+        pass
+
+
+def test_elements_without_html_are_fingerprinted_by_their_text(tmp_path):
+    store = IterationStore(str(tmp_path / 'incremental.sqlite'))
+    run(INCREMENTAL_MAPS, CrashingOpen(), variables={'items': [TextElement('a'), TextElement('b')]}, incremental=store)
+    open_task = CrashingOpen()
+    run(INCREMENTAL_MAPS, open_task, variables={'items': [TextElement('a'), TextElement('c')]}, incremental=store)
+    assert open_task.opened == ['first c', 'second c']
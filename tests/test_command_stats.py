@@ -0,0 +1,119 @@
+from concurrent.futures import ThreadPoolExecutor
+import contextvars
+from types import SimpleNamespace
+from typing import Any
+
+from scripted_engine import ScriptedWorkerStrategy, playbook
+from scrapping_playbook_framework.lib.command_stats import OUTSIDE_TASKS, CommandStat, CommandStats, collect_commands, record_command, task_scope
+from scrapping_playbook_framework.selenium.selenium_instrumentation import instrument_driver
+from scrapping_playbook_framework.worker import Worker, WorkerEngine
+
+
+class FakeCommandExecutor:
+    def __init__(self):
+        self.executed: list[str] = []
+
+    def execute(self, command: str, params: dict[str, Any]) -> dict[str, Any]:
+        self.executed.append(command)
+        return {'value': params}
+
+
+def test_driver_commands_are_recorded_once_when_instrumented_twice():
+    executor = FakeCommandExecutor()
+    driver: Any = SimpleNamespace(command_executor=executor)
+    instrument_driver(driver)
+    wrapper = executor.execute
+    instrument_driver(driver)
+    assert executor.execute is wrapper
+
+    stats = CommandStats()
+    with collect_commands(stats), task_scope('Open'):
+        assert driver.command_executor.execute('get', {'url': 'https://example.com'}) == {'value': {'url': 'https://example.com'}}
+    driver.command_executor.execute('get', {})
+    assert executor.executed == ['get', 'get']
+    # Only the command sent while collecting is recorded
+    assert list(stats.stats) == [('Open', 'get')]
+    assert stats.stats[('Open', 'get')].count == 1
+
+
+def test_failed_commands_are_recorded():
+    class FailingExecutor:
+        def execute(self, command: str, params: dict[str, Any]) -> None:
+            raise ConnectionError(command)
+
+    driver: Any = SimpleNamespace(command_executor=FailingExecutor())
+    instrument_driver(driver)
+    stats = CommandStats()
+    with collect_commands(stats):
+        try:
+            driver.command_executor.execute('findElement', {})
+        except ConnectionError:
+            pass
+    assert stats.stats[(OUTSIDE_TASKS, 'findElement')].count == 1
+
+
+def test_commands_sent_from_threads_keep_their_task():
+    stats = CommandStats()
+
+    def send(command: str) -> None:
+        record_command(command, 0.001)
+
+    with collect_commands(stats), ThreadPoolExecutor(max_workers=4) as pool:
+        futures = []
+        for task_name in ('Open', 'Read'):
+            with task_scope(task_name):
+                futures += [pool.submit(contextvars.copy_context().run, send, 'get') for _ in range(5)]
+        # Without a copy of the context the thread sees no stats to record in
+        futures.append(pool.submit(send, 'lost'))
+        for future in futures:
+            future.result()
+    assert {key: stat.count for key, stat in stats.stats.items()} == {('Open', 'get'): 5, ('Read', 'get'): 5}
+
+
+def test_parallel_map_commands_are_attributed_to_their_task():
+    strategy = ScriptedWorkerStrategy({
+        'test.open': lambda ctx: record_command('get', 0.002),
+        'test.read': lambda ctx: record_command('findElement', 0.001),
+    })
+    worker = Worker(playbook("""
+config: {items: [1, 2, 3, 4, 5, 6]}
+tasks:
+  - name: Visit
+    action: map
+    map: items
+    parallel: 3
+    tasks:
+      - {name: Open, action: test.open}
+      - {name: Read, action: test.read}
+"""), WorkerEngine.SELENIUM, strategy=strategy)
+    worker.start()
+    counts = {key: stat.count for key, stat in worker.command_stats.stats.items()}
+    assert counts == {('Open', 'get'): 6, ('Read', 'findElement'): 6}
+
+
+def test_percentile_is_the_upper_bound_of_its_bucket():
+    stat = CommandStat()
+    for _ in range(10):
+        stat.add(0.0005)
+    stat.add(0.03)
+    assert stat.count == 11 and stat.max == 0.03
+    assert stat.percentile(0.5) == 0.001
+    # The bucket bound (50 ms) is above every recorded latency, the max is closer
+    assert stat.percentile(0.95) == 0.03
+    stat.add(7.0)
+    assert stat.percentile(1.0) == 7.0
+    assert CommandStat().percentile(0.5) == 0.0
+
+
+def test_summary_lists_the_slowest_pairs_first():
+    stats = CommandStats()
+    for _ in range(3):
+        stats.record('Open', 'get', 0.2)
+    stats.record('Read', 'findElement', 0.004)
+    stats.record('Read', 'getElementText', 0.001)
+    lines = stats.summary(limit=2).splitlines()
+    assert lines[0] == "5 commands, 0.61s of round trips"
+    assert lines[1].split() == ['task', 'command', 'count', 'total', 'ms', 'mean', 'ms', 'p50', 'ms', 'p95', 'ms', 'max', 'ms']
+    assert lines[2].split() == ['Open', 'get', '3', '600.0', '200.0', '200.0', '200.0', '200.0']
+    assert lines[3].split() == ['Read', 'findElement', '1', '4.0', '4.0', '4.0', '4.0', '4.0']
+    assert lines[4] == "... 1 more"
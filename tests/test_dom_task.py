@@ -0,0 +1,83 @@
+from typing import Any, Optional
+
+import pytest
+
+from scrapping_playbook_framework.core.parsed_dom_element import ParsedDOMElement, parse_html
+from scrapping_playbook_framework.task.dom_task import DOMElement, ExtractTask
+
+PAGE = """
+<ul>
+  <li class="product"><a href="/a">Product A</a><span class="price">1 EUR</span></li>
+  <li class="product"><a href="/b">Product B</a></li>
+</ul>
+"""
+FIELDS = {'title': 'a', 'link': {'selector': 'a', 'attribute': 'href'}, 'price': '.price', 'id': {'attribute': 'class'}}
+
+
+class QueryOnlyElement(DOMElement):
+    """
+    Element of an engine implementing only the abstract methods, extract is the generic one.
+    """
+    def __init__(self, element: ParsedDOMElement):
+        self.element = element
+
+    def get_text(self, ctx: Any) -> str:
+        return self.element.get_text(ctx)
+
+    def get_attribute(self, ctx: Any) -> Optional[str]:
+        return self.element.get_attribute(ctx)
+
+    def get_position(self, ctx: Any) -> None:
+        return None
+
+    def click(self, ctx: Any) -> None:
+        pass
+
+    def get_element(self, ctx: Any) -> Optional[DOMElement]:
+        element = self.element.get_element(ctx)
+        return QueryOnlyElement(element) if element is not None else None # type: ignore
+
+    def get_elements(self, ctx: Any) -> list[DOMElement]:
+        return [QueryOnlyElement(element) for element in self.element.get_elements(ctx)] # type: ignore
+
+    def get_shadow_root(self, ctx: Any) -> None:
+        return None
+
+    def screenshot(self, ctx: Any) -> None:
+        pass
+
+    def get_outer_html(self, ctx: Any) -> str:
+        return self.element.get_outer_html(ctx)
+
+
+def test_generic_extract_matches_engine_extract():
+    document = ParsedDOMElement(parse_html(PAGE, base_url='https://example.com/'))
+    params = {'container': 'li.product', 'fields': FIELDS}
+    rows = QueryOnlyElement(document).extract(params) # type: ignore
+    assert rows == document.extract(params) # type: ignore
+    assert rows == [
+        {'title': 'Product A', 'link': 'https://example.com/a', 'price': '1 EUR', 'id': 'product'},
+        {'title': 'Product B', 'link': 'https://example.com/b', 'price': None, 'id': 'product'},
+    ]
+
+
+def test_generic_extract_rejects_property_fields():
+    document = QueryOnlyElement(ParsedDOMElement(parse_html(PAGE)))
+    with pytest.raises(ValueError, match="can not extract the property 'innerHTML' of field 'html'"):
+        document.extract({'container': 'li', 'fields': {'html': {'property': 'innerHTML'}}}) # type: ignore
+
+
+def test_outer_html_is_optional():
+    class WithoutHTML(QueryOnlyElement):
+        get_outer_html = DOMElement.get_outer_html
+    assert WithoutHTML(ParsedDOMElement(parse_html(PAGE))).get_outer_html(None) is None
+
+
+def test_fields_are_normalized():
+    assert ExtractTask.normalize_fields({'a': '.x', 'b': {'attribute': 'href'}, 'c': {'selector': 'p', 'property': 'value'}}) == [
+        ('a', {'selector': '.x', 'kind': 'text', 'name': ''}),
+        ('b', {'selector': '', 'kind': 'attribute', 'name': 'href'}),
+        ('c', {'selector': 'p', 'kind': 'property', 'name': 'value'}),
+    ]
+    with pytest.raises(ValueError):
+        ExtractTask.normalize_fields({'a': {'attribute': 'href', 'property': 'href'}})
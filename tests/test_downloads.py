@@ -0,0 +1,131 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import os
+import threading
+import time
+from typing import Iterator
+
+import pytest
+from requests import HTTPError
+
+from scrapping_playbook_framework.task.browser_task import DOWNLOAD_CHUNK_SIZE, DownloadMany, DownloadUrl, download_file
+
+FILE_SIZE = DOWNLOAD_CHUNK_SIZE * 3 + 123
+
+
+class Server(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(('127.0.0.1', 0), Handler)
+        # Holds the streamed response after its first chunk until set
+        self.resume = threading.Event()
+        self.active = 0
+        self.max_active = 0
+        self.counter_lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_port}"
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    server: Server
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+    def do_GET(self) -> None:
+        if self.path == '/stream':
+            self.send_response(200)
+            self.send_header('Transfer-Encoding', 'chunked')
+            self.end_headers()
+            payload = b'x' * FILE_SIZE
+            self.write_chunk(payload[:DOWNLOAD_CHUNK_SIZE])
+            self.server.resume.wait(5)
+            self.write_chunk(payload[DOWNLOAD_CHUNK_SIZE:])
+            self.write_chunk(b'')
+        elif self.path == '/private':
+            if 'session=secret' not in (self.headers.get('Cookie') or ''):
+                self.send_body(403, b'forbidden')
+            else:
+                self.send_body(200, b'private content', [('Set-Cookie', 'tracking=1; Path=/')])
+        elif self.path.startswith('/slow/'):
+            with self.server.counter_lock:
+                self.server.active += 1
+                self.server.max_active = max(self.server.max_active, self.server.active)
+            time.sleep(0.05)
+            with self.server.counter_lock:
+                self.server.active -= 1
+            self.send_body(200, self.path.encode('utf-8'))
+        else:
+            self.send_body(404, b'not found')
+
+    def write_chunk(self, data: bytes) -> None:
+        self.wfile.write(f"{len(data):x}\r\n".encode('ascii') + data + b"\r\n")
+        self.wfile.flush()
+
+    def send_body(self, status: int, body: bytes, headers: list[tuple[str, str]] = []) -> None:
+        self.send_response(status)
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in headers:
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def server() -> Iterator[Server]:
+    server = Server()
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    yield server
+    server.resume.set()
+    server.shutdown()
+    server.server_close()
+
+
+def test_streams_to_part_file_then_renames(server, tmp_path):
+    path = str(tmp_path / 'files' / 'stream.bin')
+    written: list[int] = []
+    download = threading.Thread(target=lambda: written.append(download_file(f"{server.url}/stream", path)))
+    download.start()
+    deadline = time.monotonic() + 5
+    while not os.path.exists(f"{path}.part") or os.path.getsize(f"{path}.part") == 0:
+        assert time.monotonic() < deadline, "the first chunk never reached the .part file"
+        time.sleep(0.01)
+    # Only the first chunk was sent, nothing appears under the final name yet
+    assert not os.path.exists(path)
+    server.resume.set()
+    download.join(5)
+    assert written == [FILE_SIZE]
+    assert os.path.getsize(path) == FILE_SIZE
+    assert os.listdir(tmp_path / 'files') == ['stream.bin']
+
+
+def test_failed_download_leaves_no_file(server, tmp_path):
+    path = str(tmp_path / 'missing.bin')
+    with pytest.raises(HTTPError):
+        download_file(f"{server.url}/missing", path)
+    assert os.listdir(tmp_path) == []
+
+
+def test_browser_cookies_are_sent_but_never_kept(server, tmp_path):
+    browser_cookies = [{'name': 'session', 'value': 'secret', 'domain': '127.0.0.1', 'path': '/'}]
+    task = DownloadUrl(cookies_provider=lambda: browser_cookies)
+    path = str(tmp_path / 'private.txt')
+    task.execute({'url': f"{server.url}/private", 'path': path, 'use_browser_cookies': True})
+    assert open(path, 'rb').read() == b'private content'
+    # Neither the browser cookie nor the one set by the response leak into the next download
+    with pytest.raises(HTTPError):
+        task.execute({'url': f"{server.url}/private", 'path': str(tmp_path / 'other.txt')})
+
+
+def test_download_many_caps_concurrency_per_host(server, tmp_path):
+    downloads = [{'url': f"{server.url}/slow/{index}", 'path': str(tmp_path / f"{index}.txt")} for index in range(8)]
+    downloads.append({'url': f"{server.url}/missing", 'path': str(tmp_path / 'missing.txt')})
+    results = DownloadMany().execute({'downloads': downloads, 'max_workers': 8, 'per_host_limit': 2})
+    assert server.max_active == 2
+    assert [result['ok'] for result in results] == [True] * 8 + [False]
+    assert open(tmp_path / '3.txt', 'rb').read() == b'/slow/3'
+    assert not os.path.exists(tmp_path / 'missing.txt')
@@ -0,0 +1,214 @@
+import logging
+import threading
+import time
+
+import pytest
+
+from scrapping_playbook_framework.selenium.selenium_driver_pool import DriverPool
+
+
+class FakeSwitchTo:
+    def __init__(self, driver: 'FakeDriver'):
+        self.driver = driver
+
+    def window(self, handle: str) -> None:
+        self.driver.current_handle = handle
+
+
+class FakeDriver:
+    def __init__(self, name: str):
+        self.name = name
+        self.handles = ['tab-0']
+        self.current_handle = 'tab-0'
+        self.switch_to = FakeSwitchTo(self)
+        self.commands: list[tuple[str, dict]] = []
+        self.scripts: list[str] = []
+        self.url = 'https://example.com'
+        self.quit_count = 0
+        self.alive = True
+        # Urls each tab navigated to, and the cookies of the browser
+        self.history: dict[str, list[str]] = {'tab-0': []}
+        self.cookies: list[dict] = []
+        self.rejected_origins: set[str] = set()
+
+    @property
+    def window_handles(self) -> list[str]:
+        if not self.alive:
+            raise ConnectionError("session is gone")
+        return list(self.handles)
+
+    def close(self) -> None:
+        self.handles.remove(self.current_handle)
+
+    def execute_script(self, script: str) -> None:
+        self.scripts.append(script)
+
+    def execute_cdp_cmd(self, command: str, params: dict) -> dict:
+        self.commands.append((command, params))
+        if command == 'Page.getNavigationHistory':
+            return {'currentIndex': 0, 'entries': [{'url': url} for url in ['about:blank'] + self.history.get(self.current_handle, [])]}
+        if command == 'Network.getAllCookies':
+            return {'cookies': self.cookies}
+        if command == 'Storage.clearDataForOrigin' and params['origin'] in self.rejected_origins:
+            raise RuntimeError(f"Invalid origin {params['origin']}")
+        return {}
+
+    def cleared_origins(self) -> list[str]:
+        return [params['origin'] for command, params in self.commands if command == 'Storage.clearDataForOrigin']
+
+    def get(self, url: str) -> None:
+        self.url = url
+
+    def quit(self) -> None:
+        self.quit_count += 1
+
+
+class FakeFactory:
+    def __init__(self):
+        self.drivers: list[FakeDriver] = []
+
+    def __call__(self) -> FakeDriver:
+        driver = FakeDriver(f"driver-{len(self.drivers)}")
+        self.drivers.append(driver)
+        return driver
+
+
+@pytest.fixture
+def factory() -> FakeFactory:
+    return FakeFactory()
+
+
+def test_released_session_is_reused(factory):
+    pool = DriverPool(factory)
+    driver = pool.acquire()
+    assert pool.in_use_count() == 1
+    pool.release(driver)
+    assert pool.idle_count() == 1 and pool.in_use_count() == 0
+    assert pool.acquire() is driver
+    assert len(factory.drivers) == 1
+
+
+def test_concurrent_checkouts_get_distinct_sessions(factory):
+    pool = DriverPool(factory)
+    first, second = pool.acquire(), pool.acquire()
+    assert first is not second
+    assert pool.in_use_count() == 2
+
+
+def test_release_resets_the_session(factory):
+    pool = DriverPool(factory)
+    driver = pool.acquire()
+    driver.handles += ['tab-1', 'tab-2']
+    driver.history = {
+        'tab-0': ['https://example.com/products', 'https://example.com/products?page=2', 'http://shop.example.org:8080/cart'],
+        'tab-2': ['https://accounts.example.net/login', 'file:///tmp/page.html'],
+    }
+    driver.cookies = [{'name': 'id', 'domain': '.tracker.example'}]
+    pool.release(driver)
+    assert driver.handles == ['tab-0']
+    assert driver.url == 'about:blank'
+    assert driver.cleared_origins() == [
+        'http://shop.example.org:8080', 'http://tracker.example', 'https://accounts.example.net', 'https://example.com', 'https://tracker.example',
+    ]
+    assert ('Storage.clearDataForOrigin', {'origin': 'https://example.com', 'storageTypes': 'all'}) in driver.commands
+    assert ('Network.clearBrowserCookies', {}) in driver.commands
+    assert any('sessionStorage.clear()' in script for script in driver.scripts)
+
+
+def test_rejected_origin_clear_keeps_the_session_and_warns_once(factory, caplog):
+    pool = DriverPool(factory)
+    driver = pool.acquire()
+    driver.history = {'tab-0': ['https://a.example/', 'https://b.example/']}
+    driver.rejected_origins = {'https://a.example', 'https://b.example'}
+    with caplog.at_level(logging.WARNING):
+        pool.release(driver)
+        assert pool.acquire() is driver
+        pool.release(driver)
+    assert driver.quit_count == 0
+    assert driver.cleared_origins() == ['https://a.example', 'https://b.example'] * 2
+    assert len([record for record in caplog.records if 'Could not clear the storage' in record.getMessage()]) == 1
+
+
+def test_session_failing_to_reset_is_quit(factory):
+    pool = DriverPool(factory)
+    driver = pool.acquire()
+    driver.execute_cdp_cmd = None
+    driver.delete_all_cookies = lambda: (_ for _ in ()).throw(RuntimeError("crashed"))
+    pool.release(driver)
+    assert driver.quit_count == 1
+    assert pool.idle_count() == 0 and pool.in_use_count() == 0
+
+
+def test_dead_idle_session_is_replaced(factory):
+    pool = DriverPool(factory)
+    driver = pool.acquire()
+    pool.release(driver)
+    driver.alive = False
+    replacement = pool.acquire()
+    assert replacement is not driver
+    assert driver.quit_count == 1
+
+
+def test_sessions_above_max_idle_are_quit(factory):
+    pool = DriverPool(factory, max_idle=1)
+    first, second = pool.acquire(), pool.acquire()
+    pool.release(first)
+    pool.release(second)
+    assert pool.idle_count() == 1
+    assert second.quit_count == 1 and first.quit_count == 0
+
+
+def test_idle_sessions_are_evicted_after_timeout(factory):
+    pool = DriverPool(factory, idle_timeout=0.01)
+    driver = pool.acquire()
+    pool.release(driver)
+    time.sleep(0.02)
+    pool.evict_idle()
+    assert pool.idle_count() == 0
+    assert driver.quit_count == 1
+
+
+def test_max_sessions_blocks_until_a_release(factory):
+    pool = DriverPool(factory, max_sessions=1)
+    driver = pool.acquire()
+    with pytest.raises(TimeoutError):
+        pool.acquire(timeout=0.01)
+    acquired: list[FakeDriver] = []
+    waiting = threading.Thread(target=lambda: acquired.append(pool.acquire(timeout=5)))
+    waiting.start()
+    time.sleep(0.01)
+    pool.release(driver)
+    waiting.join()
+    assert acquired == [driver]
+    assert len(factory.drivers) == 1
+
+
+def test_shutdown_quits_idle_sessions_and_later_releases(factory):
+    pool = DriverPool(factory)
+    idle, in_use = pool.acquire(), pool.acquire()
+    pool.release(idle)
+    pool.shutdown()
+    assert idle.quit_count == 1
+    assert in_use.quit_count == 0
+    pool.release(in_use)
+    assert in_use.quit_count == 1
+    with pytest.raises(RuntimeError):
+        pool.acquire()
+
+
+def test_shutdown_wakes_up_waiting_checkouts(factory):
+    pool = DriverPool(factory, max_sessions=1)
+    pool.acquire()
+    errors: list[Exception] = []
+
+    def acquire() -> None:
+        try:
+            pool.acquire(timeout=5)
+        except RuntimeError as e:
+            errors.append(e)
+    waiting = threading.Thread(target=acquire)
+    waiting.start()
+    time.sleep(0.01)
+    pool.shutdown()
+    waiting.join()
+    assert len(errors) == 1
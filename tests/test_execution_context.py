@@ -0,0 +1,82 @@
+import pytest
+
+from scrapping_playbook_framework.execution_context import ExecutionContext
+from scrapping_playbook_framework.lib.value_resolver import UnresolvedVariableError
+
+
+def test_child_writes_do_not_reach_the_parent():
+    parent = ExecutionContext().inject_variables({'page': 1, 'query': 'laptop'})
+    child = parent.clone()
+    child.set_variable('page', 2)
+    assert child.get_variable('page') == 2
+    assert child.get_variable('query') == 'laptop'
+    assert parent.get_variable('page') == 1
+
+
+def test_delete_hides_the_parent_value_without_touching_the_parent():
+    parent = ExecutionContext().inject_variables({'popup': 'cookie banner', 'page': 1})
+    child = parent.clone()
+    child.delete('popup')
+    assert child.get_variable('popup') is None
+    assert not child.has_variable('popup')
+    assert child.get_keys() == ['page']
+    assert child.provide_variables() == {'page': 1}
+    assert parent.get_variable('popup') == 'cookie banner'
+    assert parent.has_variable('popup')
+
+    # A grandchild inherits the deletion, and can define the variable again
+    grandchild = child.clone()
+    assert not grandchild.has_variable('popup')
+    grandchild.set_variable('popup', 'newsletter')
+    assert grandchild.get_variable('popup') == 'newsletter'
+    assert child.get_variable('popup') is None
+
+
+def test_delete_of_an_own_variable_removes_it():
+    context = ExecutionContext().inject_variables({'page': 1})
+    context.delete('page')
+    context.delete('missing')
+    assert not context.has_variable('page')
+    assert context.get_keys() == []
+
+
+def test_dotted_keys_walk_nested_values():
+    context = ExecutionContext().inject_variables({'product': {'price': {'amount': 42}}})
+    assert context.get_variable('product.price.amount') == 42
+    assert context.get_variable('product.name', 'unknown') == 'unknown'
+
+
+def test_view_resolves_variables_when_read():
+    context = ExecutionContext().inject_variables({'host': 'example.com', 'url': 'https://{{host}}/', 'broken': '{{empty}}', 'empty': None})
+    view = context.view()
+    assert view['url'] == 'https://example.com/'
+    assert set(view) == {'host', 'url', 'broken', 'empty'} and len(view) == 4
+    # Only the variables a task reads are resolved
+    with pytest.raises(UnresolvedVariableError):
+        view['broken']
+    with pytest.raises(KeyError):
+        view['missing']
+
+
+def test_view_follows_writes_and_deletions():
+    parent = ExecutionContext().inject_variables({'host': 'example.com', 'url': 'https://{{host}}/', 'popup': 'cookie banner'})
+    child = parent.clone()
+    view = child.view()
+    assert view['url'] == 'https://example.com/'
+    parent.set_variable('host', 'example.org')
+    assert view['url'] == 'https://example.org/'
+    child.delete('popup')
+    assert 'popup' not in view
+    assert 'popup' in parent.view()
+
+
+def test_parent_templates_resolve_in_the_parent():
+    parent = ExecutionContext().inject_variables({'base_url': 'https://example.com', 'label': 'row {{INDEX}} of {{item}}', 'listing': '{{base_url}}/products'})
+    child = parent.clone().inject_variables({'INDEX': 0, 'item': 1, 'base_url': 'https://example.org'})
+    # Like the resolved copy of the parent variables a clone used to take, iteration variables are not seen
+    assert child.get_variable('label') == 'row  of '
+    assert child.view()['label'] == 'row  of '
+    assert child.get_variable('listing') == 'https://example.com/products'
+    # Templates of the child still read its variables and those of its parents
+    child.set_variable('title', '{{label}} at {{base_url}}')
+    assert child.get_variable('title') == 'row  of  at https://example.org'
@@ -0,0 +1,76 @@
+from types import SimpleNamespace
+
+import pytest
+
+from scripted_engine import playbook
+from scrapping_playbook_framework.execution_context import ExecutionContext
+from scrapping_playbook_framework.execution_plan import CompiledCondition, VariableReference, compile_playbook
+from scrapping_playbook_framework.playbook_reader import PlaybookCondition
+
+PLAYBOOK = """
+config: {base_url: 'https://example.com'}
+tasks:
+  - {name: Open, action: browser.goto, url: '{{base_url}}/products', cache: 60}
+  - name: Read products
+    action: map
+    map: products
+    item_name: product
+    parallel: 0
+    when: [{variable: products, is_defined: true}]
+    filters: [{variable: product.price, less_than: '{{limit}}'}]
+    tasks:
+      - {name: Read title, action: $product.get_text, output: title, post_process: [{type: strip}]}
+      - {name: Read link, action: $product.get_attribute, attribute_name: href, target: $product.link}
+"""
+
+
+def test_tasks_are_compiled_once_with_their_position():
+    plan = compile_playbook(playbook(PLAYBOOK))
+    open_task, read_products = plan.tasks
+    assert plan.config['base_url'] == 'https://example.com'
+    assert open_task.static_params == {'url': '{{base_url}}/products'}
+    assert open_task.cache_ttl == 60
+    assert read_products.is_map and read_products.item_name == 'product'
+    assert read_products.parallel == 1
+    assert {task.path_segment for task in plan.iter_tasks()} == {'0:Open', '1:Read products', '1.0:Read title', '1.1:Read link'}
+    assert plan.has_cached_tasks()
+    assert not plan.has_incremental_maps()
+    read_title = read_products.tasks[0]
+    assert read_title.post_processors is not None and read_title.post_processors.process('  Laptop ') == 'Laptop'
+
+
+def test_compiled_plan_is_immutable():
+    plan = compile_playbook(playbook(PLAYBOOK))
+    with pytest.raises(TypeError):
+        plan.tasks[0].static_params['url'] = 'https://example.org' # type: ignore
+    with pytest.raises(AttributeError):
+        plan.tasks[0].name = 'Other' # type: ignore
+
+
+def test_variable_params_are_resolved_per_context():
+    read_link = compile_playbook(playbook(PLAYBOOK)).tasks[1].tasks[1]
+    assert read_link.variable_params == (('target', VariableReference('$product.link', 'product', ('link',))),)
+    context = ExecutionContext().inject_variables({'product': {'link': '/laptop'}})
+    assert read_link.resolve_params(context) == {'attribute_name': 'href', 'target': '/laptop'}
+    # Attributes are walked too, and an unresolved reference keeps the raw string
+    context = ExecutionContext().inject_variables({'product': SimpleNamespace(link='/phone')})
+    assert read_link.resolve_params(context)['target'] == '/phone'
+    assert read_link.resolve_params(ExecutionContext())['target'] == '$product.link'
+
+
+def test_conditions_only_keep_the_checks_that_are_set():
+    condition = CompiledCondition.compile(PlaybookCondition(variable='price', greater_than=10, less_than='{{limit}}'))
+    assert [is_template for _, _, is_template in condition.checks] == [False, True]
+    context = ExecutionContext().inject_variables({'price': 42.0, 'limit': 100})
+    assert condition.evaluate(context)
+    context.set_variable('limit', 40)
+    assert not condition.evaluate(context)
+
+
+def test_is_defined_conditions():
+    defined = CompiledCondition.compile(PlaybookCondition(variable='popup', is_defined=True))
+    undefined = CompiledCondition.compile(PlaybookCondition(variable='popup', is_defined=False))
+    context = ExecutionContext()
+    assert undefined.evaluate(context) and not defined.evaluate(context)
+    context.set_variable('popup', 'cookie banner')
+    assert defined.evaluate(context) and not undefined.evaluate(context)
@@ -0,0 +1,89 @@
+import csv
+import json
+import logging
+import sqlite3
+
+import pytest
+
+from scrapping_playbook_framework.task.export_task import SQLiteExportTask, StreamingExporterFactory
+
+
+def export_sqlite(file_path: str, rows: list[dict], **params) -> None:
+    SQLiteExportTask().execute({'file_path': file_path, 'variable': 'rows', 'rows': rows, 'table': 'products', **params})
+
+
+def select(file_path: str, query: str) -> list[tuple]:
+    connection = sqlite3.connect(file_path)
+    try:
+        return connection.execute(query).fetchall()
+    finally:
+        connection.close()
+
+
+def test_sqlite_creates_table_and_adds_columns(tmp_path):
+    file_path = str(tmp_path / 'out.sqlite')
+    export_sqlite(file_path, [{'sku': 'a', 'price': 1.5, 'tags': ['x', 'y']}])
+    export_sqlite(file_path, [{'sku': 'b', 'price': 2.0, 'stock': 3}])
+    assert select(file_path, "SELECT sku, price, tags, stock FROM products ORDER BY sku") == [('a', 1.5, '["x", "y"]', None), ('b', 2.0, None, 3)]
+
+
+def test_sqlite_upserts_on_key_without_clearing_missing_fields(tmp_path):
+    file_path = str(tmp_path / 'out.sqlite')
+    export_sqlite(file_path, [{'sku': 'a', 'price': 1, 'name': 'A'}, {'sku': 'b', 'price': 2, 'name': 'B'}], key='sku')
+    export_sqlite(file_path, [{'sku': 'a', 'price': 10}, {'sku': 'c', 'price': 3, 'name': 'C'}], key='sku', batch_size=1)
+    assert select(file_path, "SELECT sku, price, name FROM products ORDER BY sku") == [('a', 10, 'A'), ('b', 2, 'B'), ('c', 3, 'C')]
+
+
+def test_sqlite_key_added_to_a_table_holding_duplicates(tmp_path, caplog):
+    file_path = str(tmp_path / 'out.sqlite')
+    export_sqlite(file_path, [{'sku': 'a', 'price': 1}, {'sku': 'a', 'price': 2}, {'sku': None, 'price': 3}, {'sku': None, 'price': 4}])
+    with caplog.at_level(logging.WARNING):
+        export_sqlite(file_path, [{'sku': 'b', 'price': 5}], key='sku')
+    assert 'Removed 1 rows' in caplog.text
+    assert select(file_path, "SELECT sku, price FROM products ORDER BY price") == [('a', 2), (None, 3), (None, 4), ('b', 5)]
+    export_sqlite(file_path, [{'sku': 'a', 'price': 20}], key='sku')
+    assert select(file_path, "SELECT price FROM products WHERE sku = 'a'") == [(20,)]
+
+
+def test_sqlite_creates_secondary_indexes(tmp_path):
+    file_path = str(tmp_path / 'out.sqlite')
+    export_sqlite(file_path, [{'sku': 'a', 'category': 'c', 'brand': 'b'}], key=['sku'], indexes=['category', ['brand', 'category']])
+    names = {row[0] for row in select(file_path, "SELECT name FROM sqlite_master WHERE type = 'index'")}
+    assert names == {'ux_products_sku', 'ix_products_category', 'ix_products_brand_category'}
+
+
+def test_sqlite_rejects_rows_missing_the_key(tmp_path):
+    with pytest.raises(Exception, match='missing upsert key'):
+        export_sqlite(str(tmp_path / 'out.sqlite'), [{'price': 1}], key='sku')
+
+
+def test_sqlite_logs_instead_of_printing(tmp_path, caplog, capsys):
+    with caplog.at_level(logging.INFO):
+        export_sqlite(str(tmp_path / 'out.sqlite'), [{'sku': 'a'}])
+    assert capsys.readouterr().out == ''
+    assert 'Exported 1 rows' in caplog.text
+
+
+@pytest.mark.parametrize('exporter_type', ['csv', 'jsonl'])
+def test_streaming_exporter_flushes_every_n_rows(tmp_path, exporter_type):
+    file_path = str(tmp_path / f"out.{exporter_type}")
+    exporter = StreamingExporterFactory.create({'type': exporter_type, 'file_path': file_path, 'flush_every': 2, 'flush_interval': 3600}).open()
+    exporter.write({'a': 1, 'b': 'x'})
+    assert open(file_path, encoding='utf-8').read() == ''
+    exporter.write({'a': 2, 'b': 'y'})
+    flushed = open(file_path, encoding='utf-8').read()
+    assert flushed != ''
+    exporter.write({'a': 3, 'b': 'z'})
+    exporter.close()
+    with open(file_path, newline='', encoding='utf-8') as file:
+        if exporter_type == 'csv':
+            rows = [{key: int(value) if key == 'a' else value for key, value in row.items()} for row in csv.DictReader(file)]
+        else:
+            rows = [json.loads(line) for line in file]
+    assert rows == [{'a': 1, 'b': 'x'}, {'a': 2, 'b': 'y'}, {'a': 3, 'b': 'z'}]
+    assert exporter.rows_written == 3
+
+
+def test_unknown_streaming_exporter_type(tmp_path):
+    with pytest.raises(ValueError):
+        StreamingExporterFactory.create({'type': 'xml', 'file_path': str(tmp_path / 'out.xml')})
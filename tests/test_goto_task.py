@@ -0,0 +1,97 @@
+import logging
+
+import pytest
+from selenium.common.exceptions import JavascriptException
+
+from fake_webdriver import FakeWebDriver
+from scrapping_playbook_framework.selenium.selenium_browser import GOTO_WAIT_SCRIPT, SeleniumGoToTask
+
+URL = 'https://example.com/products'
+
+
+def goto(driver: FakeWebDriver, **params) -> None:
+    SeleniumGoToTask(driver).execute({'url': URL, **params}) # type: ignore
+
+
+@pytest.mark.parametrize('page_load_strategy, wait_until', [
+    ('normal', 'load'),
+    ('eager', 'commit'),
+    ('eager', 'domcontentloaded'),
+])
+def test_conditions_reached_when_get_returns_do_not_wait(page_load_strategy, wait_until):
+    driver = FakeWebDriver(page_load_strategy)
+    goto(driver, wait_until=wait_until)
+    assert driver.calls == [('get', URL, ())]
+
+
+@pytest.mark.parametrize('page_load_strategy, wait_until, condition, selector', [
+    ('none', 'commit', 'commit', None),
+    ('none', 'domcontentloaded', 'domcontentloaded', None),
+    ('none', 'load', 'load', None),
+    ('eager', 'load', 'load', None),
+    ('eager', 'networkidle', 'networkidle', None),
+    ('none', 'selector:.product-title', 'selector', '.product-title'),
+])
+def test_other_conditions_wait_on_the_new_document(page_load_strategy, wait_until, condition, selector):
+    driver = FakeWebDriver(page_load_strategy, async_results=[True])
+    goto(driver, wait_until=wait_until, timeout=5, idle_time=0.2)
+    assert driver.commands() == ['execute_script', 'get', 'execute_async_script']
+    _, script, args = driver.calls[2]
+    assert script == GOTO_WAIT_SCRIPT
+    timeout, previous_origin, *rest = args
+    assert 0 < timeout <= 5000
+    # The previous document is told apart by its time origin, read before navigating
+    assert previous_origin == driver.time_origin
+    assert rest == [condition, selector, 200, False]
+
+
+def test_stop_loading_is_passed_to_the_wait_script():
+    driver = FakeWebDriver('none', async_results=[True])
+    goto(driver, wait_until='domcontentloaded', stop_loading=True)
+    assert driver.calls[2][2][-1] is True
+
+
+def test_stop_loading_on_return_stops_the_page():
+    driver = FakeWebDriver('eager')
+    goto(driver, wait_until='domcontentloaded', stop_loading=True)
+    assert driver.commands() == ['get', 'execute_script']
+    assert 'window.stop()' in driver.calls[1][1]
+
+
+def test_condition_not_reached_raises_a_timeout():
+    driver = FakeWebDriver('none', async_results=[False])
+    with pytest.raises(TimeoutError, match='selector:.missing not reached'):
+        goto(driver, wait_until='selector:.missing', timeout=1)
+
+
+def test_wait_restarts_when_the_document_unloads():
+    driver = FakeWebDriver('none', async_results=[JavascriptException('javascript error: document unloaded while waiting for result'), True])
+    goto(driver, wait_until='load')
+    assert driver.commands() == ['execute_script', 'get', 'execute_async_script', 'execute_async_script']
+
+
+def test_unknown_condition_is_rejected():
+    with pytest.raises(ValueError, match='Unknown wait_until'):
+        goto(FakeWebDriver(), wait_until='idle')
+
+
+def test_normal_strategy_falls_back_to_waiting_after_the_load(caplog):
+    driver = FakeWebDriver('normal', async_results=[True, True])
+    task = SeleniumGoToTask(driver) # type: ignore
+    with caplog.at_level(logging.WARNING):
+        task.execute({'url': URL, 'wait_until': 'selector:.product-title'})
+        task.execute({'url': URL, 'wait_until': 'networkidle'})
+    # driver.get already waited for the load event, the previous document is not read
+    assert driver.commands() == ['get', 'execute_async_script', 'get', 'execute_async_script']
+    assert driver.calls[1][2][1] is None
+    warnings = [record for record in caplog.records if 'page_load_strategy: eager or none' in record.getMessage()]
+    assert len(warnings) == 1
+
+
+@pytest.mark.parametrize('params', [{'wait_until': 'commit'}, {'wait_until': 'domcontentloaded'}, {'stop_loading': True}])
+def test_normal_strategy_warns_that_early_return_is_not_possible(params, caplog):
+    driver = FakeWebDriver('normal')
+    with caplog.at_level(logging.WARNING):
+        goto(driver, **params)
+    assert 'page_load_strategy: eager or none' in caplog.text
+    assert driver.commands()[0] == 'get'
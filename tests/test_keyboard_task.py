@@ -0,0 +1,56 @@
+from typing import Any
+
+import pytest
+
+from scrapping_playbook_framework.selenium.selenium_keyboard_task import SeleniumKeyboardPressTask, SeleniumKeyboardTypeTask
+from scrapping_playbook_framework.task.keyboard_task import ConstantDelay, KeyboardPressTask, KeyboardTypeTask, TypingProfileFactory
+
+
+class RecordingPressTask(KeyboardPressTask):
+    def __init__(self):
+        self.keys: list[str] = []
+
+    def execute(self, ctx: Any) -> None:
+        self.keys.append(ctx['key'])
+
+
+class FakeActiveElement:
+    def __init__(self):
+        self.sent: list[str] = []
+
+    def send_keys(self, keys: str) -> None:
+        self.sent.append(keys)
+
+
+class FakeDriver:
+    def __init__(self):
+        self.active_element = FakeActiveElement()
+        self.switch_to = self
+
+
+@pytest.mark.parametrize('profile', ['instant', {'base': 'fast', 'char_delay': 0}])
+def test_text_looking_like_a_key_name_is_typed_as_text(profile):
+    press_task = RecordingPressTask()
+    KeyboardTypeTask(press_task).execute({'text': '#enter', 'typing_profile': profile})
+    assert press_task.keys == list('#enter')
+
+
+def test_selenium_instant_profile_sends_text_in_one_command():
+    driver = FakeDriver()
+    press_task = SeleniumKeyboardPressTask(driver) # type: ignore
+    SeleniumKeyboardTypeTask(driver, press_task).execute({'text': '#enter now', 'typing_profile': 'instant'}) # type: ignore
+    assert driver.active_element.sent == ['#enter now']
+
+
+def test_press_still_maps_key_names():
+    driver = FakeDriver()
+    SeleniumKeyboardPressTask(driver).execute({'key': 'a'}) # type: ignore
+    assert driver.active_element.sent == ['a']
+
+
+def test_custom_profile_overrides_its_base():
+    profile = TypingProfileFactory.create({'base': 'fast', 'char_delay': 0.5})
+    assert isinstance(profile.char_delay, ConstantDelay) and profile.delay_after('a') == 0.5
+    assert TypingProfileFactory.create('instant').bulk
+    with pytest.raises(ValueError):
+        TypingProfileFactory.create('unknown')
@@ -0,0 +1,114 @@
+import pytest
+
+from scrapping_playbook_framework.core import parsed_dom_element
+from scrapping_playbook_framework.core.parsed_dom_element import ParsedDOMElement, compile_selector, parse_fragment, parse_html
+
+
+def texts(element: ParsedDOMElement, selector: str) -> list[str]:
+    return [child.get_text(None) for child in element.get_elements({'selector': selector})]
+
+
+def test_fragment_of_body_with_several_children():
+    body = parse_fragment('<body><div>a</div><div>b</div></body>')
+    assert body.tag == 'body'
+    assert texts(ParsedDOMElement(body), 'div') == ['a', 'b']
+
+
+def test_fragment_of_body_with_leading_text_and_attributes():
+    body = parse_fragment('<body class="x">text <div>a</div></body>')
+    assert body.tag == 'body'
+    assert body.get('class') == 'x'
+    assert ParsedDOMElement(body).get_text(None) == 'text\na'
+
+
+def test_fragment_of_head_keeps_the_head():
+    head = parse_fragment('<head><title>Title</title><meta name="a" content="b"></head>')
+    assert head.tag == 'head'
+    assert [child.tag for child in head] == ['title', 'meta']
+
+
+def test_fragment_of_html_is_the_document():
+    document = parse_fragment('<html lang="en"><head></head><body><p>a</p></body></html>')
+    assert document.tag == 'html'
+    assert document.get('lang') == 'en'
+    assert texts(ParsedDOMElement(document), 'p') == ['a']
+
+
+def test_fragment_of_context_dependent_tags():
+    cell = parse_fragment('<td>a</td>')
+    assert cell.tag == 'td'
+    assert cell.getparent() is None
+    item = parse_fragment('<li>a <a href="/x">x</a></li>', base_url='https://example.com/list')
+    assert item.tag == 'li'
+    assert ParsedDOMElement(item).get_element({'selector': 'a'}).get_attribute({'attribute_name': 'href'}) == 'https://example.com/x'
+
+
+SCOPED_PAGE = """
+<body>
+  <ul id="list"><li>a</li><li>b <ul><li>c</li></ul></li></ul>
+  <ol><li>outside</li></ol>
+</body>
+"""
+
+
+def scoped_list() -> ParsedDOMElement:
+    return ParsedDOMElement(parse_html(SCOPED_PAGE)).get_element({'selector': '#list'}) # type: ignore
+
+
+@pytest.mark.parametrize('selector, expected', [
+    ('li', ['a', 'b\nc', 'c']),
+    ('body li', ['a', 'b\nc', 'c']),
+    ('ul > li', ['a', 'b\nc', 'c']),
+    ('#list > li', ['a', 'b\nc']),
+    ('ul ul li', ['c']),
+    ('li:first-child', ['a', 'c']),
+    ('ol li', []),
+    ('ul', ['c']),
+    ('li:has(> ul)', ['b\nc']),
+    ('li + li', ['b\nc']),
+    ('li ~ li', ['b\nc']),
+    ('ol li, #list > li', ['a', 'b\nc']),
+    ('ul ul li, li:first-child', ['a', 'c']),
+    ('ul:has(ul li) > li', ['a', 'b\nc']),
+])
+def test_element_scoped_query_matches_like_query_selector_all(selector, expected):
+    assert texts(scoped_list(), selector) == expected
+
+
+def test_query_on_a_snapshot_stops_at_the_snapshot_root():
+    item = ParsedDOMElement(parse_fragment('<li><a>x</a></li>'))
+    assert texts(item, 'li a') == ['x']
+    assert texts(item, 'body a') == []
+
+
+CARDS_PAGE = """
+<body>
+  <section class="cards">
+    <div class="card"><h2 class="title">A</h2><p>a</p><p class="note">x</p></div>
+    <div class="card featured"><h2 class="title">B</h2><div class="card"><h2 class="title">C</h2></div></div>
+  </section>
+  <aside><h2 class="title">outside</h2></aside>
+</body>
+"""
+
+
+@pytest.mark.parametrize('selector', [
+    '.card .title', 'section .title', 'body > section .card > h2', '.cards > .card', 'h2 + p', 'h2 ~ .note',
+    '.featured .card .title', 'section h2, aside h2', 'div:not(.featured) > .title', 'body div', 'p:last-child',
+])
+def test_scoped_query_matches_the_whole_document_query(selector):
+    document = parse_html(CARDS_PAGE)
+    for element in document.iter():
+        expected = [match for match in compile_selector(selector)(document) if any(ancestor is element for ancestor in match.iterancestors())]
+        assert ParsedDOMElement(element).query(selector) == expected, element
+
+
+def test_combinators_are_matched_from_the_element_subtree(monkeypatch):
+    cards = ParsedDOMElement(parse_html(CARDS_PAGE)).get_elements({'selector': '.card'})
+    compiled = parsed_dom_element.compile_selector
+
+    def subtree_only(selector):
+        assert ' ' not in selector, f"{selector} matched against the whole document"
+        return compiled(selector)
+    monkeypatch.setattr(parsed_dom_element, 'compile_selector', subtree_only)
+    assert [texts(card, 'section .title') for card in cards] == [['A'], ['B', 'C'], ['C']]
@@ -0,0 +1,85 @@
+import json
+import os
+
+from scrapping_playbook_framework.playbook_reader import PlaybookCondition, PlaybookTask, from_yaml_file, playbook_cache_key, playbook_cache_path
+
+PLAYBOOK = """
+config: {base_url: 'https://example.com'}
+tasks:
+  - name: Read list
+    action: map
+    map: items
+    output: titles
+    custom_param: 3
+    when: [{variable: base_url, is_defined: true}]
+    tasks:
+      - {name: Get title, action: $item.get_element, selector: '.title', output: title}
+"""
+
+
+def write_playbook(tmp_path, content: str = PLAYBOOK) -> str:
+    file_path = tmp_path / 'playbook.yaml'
+    file_path.write_text(content, encoding='utf-8')
+    return str(file_path)
+
+
+def test_cache_is_opt_in(tmp_path, monkeypatch):
+    monkeypatch.setenv('XDG_CACHE_HOME', str(tmp_path / 'user-cache'))
+    from_yaml_file(write_playbook(tmp_path))
+    assert not (tmp_path / 'user-cache').exists()
+    assert os.listdir(tmp_path) == ['playbook.yaml']
+
+
+def test_cached_playbook_round_trips(tmp_path):
+    file_path = write_playbook(tmp_path)
+    cache_dir = str(tmp_path / 'cache')
+    fresh = from_yaml_file(file_path, cache=True, cache_dir=cache_dir)
+    assert len(os.listdir(cache_dir)) == 1
+    cached = from_yaml_file(file_path, cache=True, cache_dir=cache_dir)
+    assert cached.model_dump() == fresh.model_dump()
+    task = cached.tasks[0]
+    assert isinstance(task, PlaybookTask)
+    assert isinstance(task.when[0], PlaybookCondition)
+    assert isinstance(task.tasks[0], PlaybookTask)
+    assert task.custom_param == 3
+    assert task.tasks[0].selector == '.title'
+
+
+def test_cache_of_another_content_is_ignored(tmp_path):
+    file_path = write_playbook(tmp_path)
+    cache_dir = str(tmp_path / 'cache')
+    from_yaml_file(file_path, cache=True, cache_dir=cache_dir)
+    content = open(file_path, 'rb').read()
+    cache_path = playbook_cache_path(playbook_cache_key(content), cache_dir)
+    with open(cache_path, 'r', encoding='utf-8') as cache_file:
+        cached = json.load(cache_file)
+    cached['key'] = 'another key'
+    cached['playbook']['config'] = {'base_url': 'https://tampered.example.com'}
+    with open(cache_path, 'w', encoding='utf-8') as cache_file:
+        json.dump(cached, cache_file)
+    assert from_yaml_file(file_path, cache=True, cache_dir=cache_dir).config == {'base_url': 'https://example.com'}
+
+
+def test_unreadable_cache_is_ignored(tmp_path):
+    file_path = write_playbook(tmp_path)
+    cache_dir = tmp_path / 'cache'
+    cache_dir.mkdir()
+    content = open(file_path, 'rb').read()
+    (cache_dir / os.path.basename(playbook_cache_path(playbook_cache_key(content)))).write_bytes(b'\x80\x04not json')
+    assert from_yaml_file(file_path, cache=True, cache_dir=str(cache_dir)).tasks[0].name == 'Read list'
+
+
+def test_playbook_that_is_not_json_is_not_cached(tmp_path):
+    file_path = write_playbook(tmp_path, "config: {start: 2024-01-01}\ntasks: []\n")
+    cache_dir = tmp_path / 'cache'
+    playbook = from_yaml_file(file_path, cache=True, cache_dir=str(cache_dir))
+    assert str(playbook.config['start']) == '2024-01-01'
+    assert not cache_dir.exists() or os.listdir(cache_dir) == []
+
+
+def test_playbook_knows_its_file(tmp_path):
+    file_path = write_playbook(tmp_path)
+    assert from_yaml_file(file_path).source_path == os.path.abspath(file_path)
+    cache_dir = str(tmp_path / 'cache')
+    from_yaml_file(file_path, cache=True, cache_dir=cache_dir)
+    assert from_yaml_file(file_path, cache=True, cache_dir=cache_dir).source_path == os.path.abspath(file_path)
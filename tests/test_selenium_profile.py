@@ -0,0 +1,37 @@
+import re
+
+import pytest
+
+from scrapping_playbook_framework.selenium.selenium_profile import BrowserProfile
+
+
+def is_blocked(patterns: list[str], url: str) -> bool:
+    # Network.setBlockedURLs patterns: '*' is the only wildcard and the whole URL must match
+    return any(re.fullmatch('.*'.join(map(re.escape, pattern.split('*'))), url) for pattern in patterns)
+
+
+@pytest.mark.parametrize('resources, url', [
+    (['stylesheet'], 'https://www.css-tricks.com/'),
+    (['media'], 'https://www.movies.com/list'),
+    (['image'], 'https://icons.example.com/'),
+    (['image', 'font', 'media', 'stylesheet'], 'https://example.com/png-to-jpg/converter.html'),
+])
+def test_pages_are_not_blocked(resources, url):
+    assert not is_blocked(BrowserProfile(blocked_resources=tuple(resources)).blocked_patterns(), url)
+
+
+@pytest.mark.parametrize('resources, url', [
+    (['stylesheet'], 'https://www.css-tricks.com/style.css'),
+    (['stylesheet'], 'https://example.com/app.css?v=3'),
+    (['media'], 'https://www.movies.com/trailer.mov'),
+    (['image'], 'https://example.com/favicon.ico'),
+    (['font'], 'https://fonts.example.com/font.woff2?display=swap'),
+    (['tracker'], 'https://www.google-analytics.com/analytics.js'),
+])
+def test_resources_are_blocked(resources, url):
+    assert is_blocked(BrowserProfile(blocked_resources=tuple(resources)).blocked_patterns(), url)
+
+
+def test_unknown_resource_type_is_rejected():
+    with pytest.raises(ValueError):
+        BrowserProfile.from_config({'block_resources': ['video']})
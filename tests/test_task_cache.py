@@ -0,0 +1,107 @@
+import os
+import sys
+from typing import Any
+
+import pytest
+
+from scripted_engine import ScriptedWorkerStrategy, playbook
+from scrapping_playbook_framework.lib import task_cache
+from scrapping_playbook_framework.lib.task_cache import TaskCache
+from scrapping_playbook_framework.playbook_reader import from_yaml_file
+from scrapping_playbook_framework.worker import Worker, WorkerEngine
+
+CACHED_PAGE = """
+config: {}
+tasks:
+  - {name: Open, action: browser.goto, url: 'https://example.com/{{page}}', cache: true}
+  - {name: Read, action: test.echo, value: 'title of {{page}}', cache: 3600, output: title}
+"""
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(task_cache.time, 'time', clock)
+    return clock
+
+
+def run(playbook_dict: Any, cache: Any, **variables: Any) -> tuple[dict[str, Any], ScriptedWorkerStrategy]:
+    strategy = ScriptedWorkerStrategy({'browser.goto': lambda ctx: None})
+    if isinstance(playbook_dict, str):
+        playbook_dict = playbook(playbook_dict)
+    outputs = Worker(playbook_dict, WorkerEngine.SELENIUM, variables=variables, strategy=strategy, cache=cache).start()
+    return outputs, strategy
+
+
+def test_cached_page_is_not_loaded_again(tmp_path):
+    cache = TaskCache(str(tmp_path / 'cache.sqlite'))
+    outputs, strategy = run(CACHED_PAGE, cache, page='a')
+    assert outputs['title'] == 'title of a'
+    assert strategy.calls == {'browser.goto': 1, 'test.echo': 1}
+
+    outputs, strategy = run(CACHED_PAGE, cache, page='a')
+    assert outputs['title'] == 'title of a'
+    assert strategy.calls == {}
+    # Another page misses the cache
+    outputs, strategy = run(CACHED_PAGE, cache, page='b')
+    assert outputs['title'] == 'title of b'
+    assert strategy.calls == {'browser.goto': 1, 'test.echo': 1}
+
+
+def test_expired_entries_are_missed(tmp_path, clock):
+    cache = TaskCache(str(tmp_path / 'cache.sqlite'))
+    assert cache.set('key', {'title': 'a'}, ttl=60)
+    clock.now += 59
+    assert cache.get('key') == (True, {'title': 'a'})
+    clock.now += 1
+    assert cache.get('key') == (False, None)
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path, clock):
+    cache = TaskCache(str(tmp_path / 'cache.sqlite'), max_size=100)
+    for key in ('a', 'b', 'c'):
+        cache.set(key, 'x' * 28, ttl=60)
+        clock.now += 1
+    # Reading 'a' makes 'b' the least recently used entry
+    cache.get('a')
+    clock.now += 1
+    cache.set('d', 'x' * 28, ttl=60)
+    assert cache.get('b') == (False, None)
+    assert all(cache.get(key)[0] for key in ('a', 'c', 'd'))
+
+
+def test_outputs_that_are_not_json_are_not_cached(tmp_path):
+    cache = TaskCache(str(tmp_path / 'cache.sqlite'))
+    assert not cache.set('key', object(), ttl=60)
+    assert cache.get('key') == (False, None)
+
+
+def test_same_playbook_in_two_files_does_not_share_outputs(tmp_path):
+    cache = TaskCache(str(tmp_path / 'cache.sqlite'))
+    paths = []
+    for name in ('a.yaml', 'b.yaml'):
+        path = tmp_path / name
+        path.write_text(CACHED_PAGE, encoding='utf-8')
+        paths.append(str(path))
+    run(from_yaml_file(paths[0]), cache, page='a')
+    _, strategy = run(from_yaml_file(paths[1]), cache, page='a')
+    assert strategy.calls == {'browser.goto': 1, 'test.echo': 1}
+    _, strategy = run(from_yaml_file(paths[0]), cache, page='a')
+    assert strategy.calls == {}
+
+
+@pytest.mark.skipif(sys.platform in ('win32', 'darwin'), reason="XDG_CACHE_HOME is only read on Linux")
+def test_default_cache_is_in_the_user_cache(tmp_path, monkeypatch):
+    monkeypatch.setenv('XDG_CACHE_HOME', str(tmp_path / 'cache'))
+    monkeypatch.chdir(tmp_path)
+    run(CACHED_PAGE, None, page='a')
+    assert os.path.exists(tmp_path / 'cache' / 'browser-playbook' / 'task_cache.sqlite')
+    assert os.listdir(tmp_path) == ['cache']
@@ -0,0 +1,114 @@
+import asyncio
+import json
+
+import pytest
+
+from scripted_engine import ScriptedWorkerStrategy, playbook
+from scrapping_playbook_framework.lib.tracer import Tracer
+from scrapping_playbook_framework.worker import Worker, WorkerEngine
+
+URL_MAP = """
+config: {{urls: [a, b, c]}}
+tasks:
+  - name: Visit
+    action: map
+    map: urls
+    item_name: u
+    parallel: {parallel}
+    output: pages
+    tasks:
+      - {{name: Open, action: browser.goto, url: 'https://example.com/{{{{u}}}}'}}
+      - {{name: Read, action: test.echo, value: '{{{{u}}}}', selector: '#title-{{{{INDEX}}}}', output: title}}
+"""
+
+
+def traced_worker(parallel: int = 1) -> tuple[Worker, Tracer]:
+    tracer = Tracer()
+    strategy = ScriptedWorkerStrategy({'browser.goto': lambda ctx: None})
+    return Worker(playbook(URL_MAP.format(parallel=parallel)), WorkerEngine.SELENIUM, strategy=strategy, tracer=tracer), tracer
+
+
+def assert_nested(tracer: Tracer) -> None:
+    spans = {span.span_id: span for span in tracer.spans}
+    by_name = {span.name: span for span in tracer.spans}
+    playbook_span, visit = by_name['playbook'], by_name['Visit']
+    assert playbook_span.parent_id is None
+    assert visit.parent_id == playbook_span.span_id and visit.kind == 'task' and visit.action == 'map'
+    iterations = sorted((span for span in tracer.spans if span.kind == 'iteration'), key=lambda span: span.attributes['index'])
+    assert [span.name for span in iterations] == ['Visit[0]', 'Visit[1]', 'Visit[2]']
+    assert all(span.parent_id == visit.span_id for span in iterations)
+    opened = [span for span in tracer.spans if span.name == 'Open']
+    assert len(opened) == 3
+    # Every task span belongs to the iteration of its url
+    for span in opened:
+        iteration = spans[span.parent_id]
+        assert span.attributes['url'] == f"https://example.com/{'abc'[iteration.attributes['index']]}"
+
+
+@pytest.mark.parametrize('parallel', [1, 3])
+def test_spans_are_nested_in_their_iteration(parallel):
+    worker, tracer = traced_worker(parallel)
+    worker.start()
+    assert_nested(tracer)
+
+
+def test_spans_are_nested_in_their_iteration_async():
+    worker, tracer = traced_worker()
+    asyncio.run(worker.start_async())
+    assert_nested(tracer)
+
+
+def test_span_attributes_are_the_resolved_params():
+    worker, tracer = traced_worker()
+    worker.start()
+    read = sorted((span for span in tracer.spans if span.name == 'Read'), key=lambda span: span.start)
+    assert [span.attributes for span in read] == [
+        {'value': 'a', 'selector': '#title-0'},
+        {'value': 'b', 'selector': '#title-1'},
+        {'value': 'c', 'selector': '#title-2'},
+    ]
+
+
+def test_failed_and_skipped_spans():
+    tracer = Tracer()
+    with pytest.raises(RuntimeError):
+        Worker(playbook("""
+config: {}
+tasks:
+  - {name: Skipped, action: test.echo, value: 1, when: [{variable: missing, is_defined: true}]}
+  - {name: Broken, action: test.fail, value: 2}
+"""), WorkerEngine.SELENIUM, strategy=ScriptedWorkerStrategy(), tracer=tracer).start()
+    by_name = {span.name: span for span in tracer.spans}
+    assert by_name['Skipped'].status == 'skipped'
+    assert by_name['Broken'].status == 'error' and by_name['Broken'].error == 'RuntimeError: failed on 2'
+    assert by_name['playbook'].status == 'error'
+
+
+def test_chrome_trace_export(tmp_path):
+    worker, tracer = traced_worker()
+    worker.start()
+    file_path = tmp_path / 'trace' / 'trace.json'
+    tracer.export(str(file_path))
+    trace = json.loads(file_path.read_text(encoding='utf-8'))
+    events = trace['traceEvents']
+    assert len(events) == len(tracer.spans)
+    assert all(event['ph'] == 'X' and event['ts'] >= 0 and event['dur'] >= 0 for event in events)
+    by_id = {event['args']['span_id']: event for event in events}
+    opened = next(event for event in events if event['name'] == 'Open')
+    parent = by_id[opened['args']['parent_id']]
+    assert parent['cat'] == 'iteration'
+    # A child starts and ends within its parent
+    assert parent['ts'] <= opened['ts'] and opened['ts'] + opened['dur'] <= parent['ts'] + parent['dur']
+    assert opened['args']['url'].startswith('https://example.com/')
+
+
+def test_jsonl_export(tmp_path):
+    worker, tracer = traced_worker()
+    worker.start()
+    file_path = tmp_path / 'spans.jsonl'
+    tracer.export(str(file_path))
+    spans = [json.loads(line) for line in file_path.read_text(encoding='utf-8').splitlines()]
+    assert len(spans) == len(tracer.spans)
+    assert [span['start'] for span in spans] == sorted(span['start'] for span in spans)
+    assert spans[0]['name'] == 'playbook'
+    assert {'span_id', 'parent_id', 'kind', 'action', 'duration', 'status', 'attributes'} <= set(spans[0])
@@ -0,0 +1,37 @@
+import pytest
+
+from scrapping_playbook_framework.execution_context import ExecutionContext
+from scrapping_playbook_framework.lib import value_resolver
+from scrapping_playbook_framework.lib.value_resolver import Placeholder, UnresolvedVariableError, compile_template
+
+
+def test_templates_are_split_into_segments():
+    assert compile_template('{{base_url}}/page/{{ page }}') == (Placeholder('base_url', '{{base_url}}'), '/page/', Placeholder('page', '{{ page }}'))
+    assert compile_template('no placeholder') == ('no placeholder',)
+
+
+def test_nested_templates_are_resolved():
+    context = ExecutionContext().inject_variables({'host': 'example.com', 'base_url': 'https://{{host}}', 'listing_url': '{{base_url}}/products'})
+    assert value_resolver.resolve(context, '{{listing_url}}?page=2') == 'https://example.com/products?page=2'
+    # Values without template are returned as is
+    assert value_resolver.resolve(context, 3) == 3
+
+
+def test_circular_references_are_left_unresolved(caplog):
+    context = ExecutionContext().inject_variables({'a': 'a={{b}}', 'b': 'b={{a}}', 'self': 'self={{self}}'})
+    assert value_resolver.resolve(context, '{{a}}') == 'a=b={{a}}'
+    assert value_resolver.resolve(context, '{{self}}') == 'self={{self}}'
+    assert 'circular reference' in caplog.text
+    # The detection does not leak to the next resolutions
+    context.set_variable('b', 'done')
+    assert value_resolver.resolve(context, '{{a}}') == 'a=done'
+
+
+def test_missing_variables_are_rendered_empty():
+    assert value_resolver.resolve(ExecutionContext(), 'page {{missing}}') == 'page '
+
+
+def test_variables_set_to_none_are_unresolved():
+    context = ExecutionContext().inject_variables({'page': None})
+    with pytest.raises(UnresolvedVariableError):
+        value_resolver.resolve(context, 'page {{page}}')
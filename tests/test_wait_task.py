@@ -0,0 +1,94 @@
+import pytest
+from selenium.common.exceptions import JavascriptException
+
+from fake_webdriver import FakeClock, FakeWebDriver
+from scrapping_playbook_framework.selenium import selenium_wait_task
+from scrapping_playbook_framework.selenium.selenium_dom_task import SeleniumDOMElement
+from scrapping_playbook_framework.selenium.selenium_wait_task import (
+    SCRIPT_TIMEOUT_MARGIN, SeleniumWaitForDomStableTask, SeleniumWaitForElementTask, SeleniumWaitForNetworkIdleTask, execute_async_wait,
+)
+
+UNLOADED = JavascriptException('javascript error: document unloaded while waiting for result')
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(selenium_wait_task.time, 'monotonic', clock)
+    return clock
+
+
+def test_script_gets_the_timeout_and_returns_the_waited_time(clock):
+    driver = FakeWebDriver(async_results=['done'], clock=clock, script_duration=1.5)
+    result, waited = execute_async_wait(driver, 'script', 10, 'argument') # type: ignore
+    assert result == 'done'
+    assert waited == 1.5
+    assert driver.calls == [('execute_async_script', 'script', (10000, 'argument'))]
+    assert driver.script_timeout == 10 + SCRIPT_TIMEOUT_MARGIN
+
+
+def test_script_timeout_is_only_raised_when_needed():
+    driver = FakeWebDriver(async_results=[1, 2, 3])
+    execute_async_wait(driver, 'script', 10) # type: ignore
+    driver.script_timeout = None
+    execute_async_wait(driver, 'script', 5) # type: ignore
+    assert driver.script_timeout is None
+    execute_async_wait(driver, 'script', 20) # type: ignore
+    assert driver.script_timeout == 20 + SCRIPT_TIMEOUT_MARGIN
+
+
+def test_wait_restarts_on_the_new_document_with_the_remaining_time(clock):
+    driver = FakeWebDriver(async_results=[UNLOADED, UNLOADED, 'done'], clock=clock, script_duration=2)
+    result, waited = execute_async_wait(driver, 'script', 10) # type: ignore
+    assert result == 'done'
+    assert [args[0] for _, _, args in driver.calls] == [10000, 8000, 6000]
+    assert waited == 6
+
+
+def test_unload_after_the_timeout_is_raised(clock):
+    driver = FakeWebDriver(async_results=[UNLOADED, UNLOADED, 'done'], clock=clock, script_duration=6)
+    with pytest.raises(JavascriptException):
+        execute_async_wait(driver, 'script', 10) # type: ignore
+    # The second script got the 4 seconds left, unloading again leaves nothing to wait for
+    assert [args[0] for _, _, args in driver.calls] == [10000, 4000]
+
+
+def test_other_script_errors_are_raised():
+    driver = FakeWebDriver(async_results=[JavascriptException('javascript error: document.foo is not a function'), 'done'])
+    with pytest.raises(JavascriptException):
+        execute_async_wait(driver, 'script', 10) # type: ignore
+    assert len(driver.calls) == 1
+
+
+def test_wait_for_element_returns_the_element(clock):
+    element = object()
+    driver = FakeWebDriver(async_results=[UNLOADED, element], clock=clock, script_duration=1)
+    found = SeleniumWaitForElementTask(driver).execute({'selector': '.product', 'timeout': 3}) # type: ignore
+    assert isinstance(found, SeleniumDOMElement) and found.web_element is element
+    assert driver.calls[-1][2] == (2000, '.product')
+
+
+def test_wait_for_element_timeout():
+    driver = FakeWebDriver(async_results=[None])
+    with pytest.raises(TimeoutError, match="'.product' not found within 3 seconds"):
+        SeleniumWaitForElementTask(driver).execute({'selector': '.product', 'timeout': 3}) # type: ignore
+
+
+def test_wait_for_network_idle(clock):
+    driver = FakeWebDriver(async_results=[True], clock=clock, script_duration=0.75)
+    waited = SeleniumWaitForNetworkIdleTask(driver).execute({'timeout': 5, 'idle_time': 0.25, 'max_inflight': 2}) # type: ignore
+    assert waited == 0.75
+    assert driver.calls[0][2] == (5000, 250.0, 2)
+    with pytest.raises(TimeoutError, match='Network not idle within 5 seconds'):
+        SeleniumWaitForNetworkIdleTask(FakeWebDriver(async_results=[False])).execute({'timeout': 5}) # type: ignore
+
+
+def test_wait_for_dom_stable(clock):
+    driver = FakeWebDriver(async_results=[True], clock=clock, script_duration=0.75)
+    waited = SeleniumWaitForDomStableTask(driver).execute({'timeout': 5, 'quiet_time': 0.1, 'selector': '#list'}) # type: ignore
+    assert waited == 0.75
+    assert driver.calls[0][2] == (5000, 100.0, '#list')
+    with pytest.raises(TimeoutError, match='DOM still changing after 5 seconds'):
+        SeleniumWaitForDomStableTask(FakeWebDriver(async_results=[False])).execute({'timeout': 5}) # type: ignore
+    with pytest.raises(Exception, match="'#missing' not found"):
+        SeleniumWaitForDomStableTask(FakeWebDriver(async_results=[None])).execute({'selector': '#missing'}) # type: ignore
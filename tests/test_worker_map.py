@@ -0,0 +1,131 @@
+import asyncio
+import json
+import os
+import time
+from typing import Any
+
+import pytest
+
+from scripted_engine import ScriptedWorkerStrategy, playbook, run
+from scrapping_playbook_framework.core.parsed_dom_element import ParsedDOMElement, parse_html
+from scrapping_playbook_framework.worker import Worker, WorkerEngine
+
+# The first item is the slowest, it waits for the exporter to hold the rows of the others
+UNORDERED_MAP = """
+config: {{}}
+tasks:
+  - name: Visit
+    action: map
+    map: items
+    item_name: item
+    parallel: 3
+    ordered: false
+    flatten: {flatten}
+    output: visits
+    export:
+      - {{type: jsonl, file_path: '{file_path}', flush_every: 1}}
+    tasks:
+      - {{name: Wait, action: test.wait_for_export, value: '{{{{item}}}}'}}
+      - {{name: Keep, action: test.echo, value: '{{{{item}}}}', output: last}}
+"""
+
+def exported_rows(file_path: str) -> list[dict[str, Any]]:
+    if not os.path.exists(file_path):
+        return []
+    with open(file_path, 'r', encoding='utf-8') as file:
+        return [json.loads(line) for line in file]
+
+def strategy_waiting_for(file_path: str, rows: int) -> ScriptedWorkerStrategy:
+    def wait_for_export(ctx: Any) -> None:
+        if ctx['value'] != 'item-0':
+            return
+        deadline = time.monotonic() + 5
+        while len(exported_rows(file_path)) < rows:
+            if time.monotonic() > deadline:
+                raise AssertionError("the rows of the completed iterations were never exported")
+            time.sleep(0.01)
+    return ScriptedWorkerStrategy({'test.wait_for_export': wait_for_export})
+
+ITEMS = [f"item-{index}" for index in range(6)]
+
+
+@pytest.mark.parametrize('flatten', ['true', 'false'])
+def test_unordered_parallel_map_streams_in_completion_order(tmp_path, flatten):
+    file_path = str(tmp_path / 'visits.jsonl')
+    outputs = run(UNORDERED_MAP.format(flatten=flatten, file_path=file_path), strategy_waiting_for(file_path, 5), variables={'items': ITEMS})
+    rows = [row['last'] for row in exported_rows(file_path)]
+    assert sorted(rows) == ITEMS
+    # Exported while the first item was still running
+    assert rows[-1] == 'item-0'
+    if flatten == 'true':
+        # Merged as in list order, whatever the completion order is
+        assert outputs['last'] == 'item-5'
+    else:
+        assert sorted(visit['last'] for visit in outputs['visits']) == ITEMS
+
+
+def test_unordered_parallel_map_streams_async(tmp_path):
+    file_path = str(tmp_path / 'visits.jsonl')
+    worker = Worker(playbook(UNORDERED_MAP.format(flatten='true', file_path=file_path)), WorkerEngine.SELENIUM, variables={'items': ITEMS}, strategy=strategy_waiting_for(file_path, 5))
+    outputs = asyncio.run(worker.start_async())
+    assert [row['last'] for row in exported_rows(file_path)][-1] == 'item-0'
+    assert outputs['last'] == 'item-5'
+
+
+def test_ordered_map_exports_in_list_order(tmp_path):
+    file_path = str(tmp_path / 'visits.csv')
+    outputs = run(f"""
+config: {{}}
+tasks:
+  - name: Visit
+    action: map
+    map: items
+    item_name: item
+    parallel: 2
+    output: visits
+    export: [{{type: csv, file_path: '{file_path}'}}]
+    tasks:
+      - {{name: Keep, action: test.echo, value: '{{{{item}}}}', output: last}}
+""", variables={'items': ITEMS})
+    assert [visit['last'] for visit in outputs['visits']] == ITEMS
+    with open(file_path, 'r', encoding='utf-8') as file:
+        assert file.read().split() == ['last'] + ITEMS
+
+
+class SessionElement(ParsedDOMElement):
+    """Element of a browser session, only usable from that session"""
+    session_bound = True
+
+
+PARALLEL_ELEMENTS_MAP = """
+config: {}
+tasks:
+  - name: Visit
+    action: map
+    map: items
+    item_name: item
+    parallel: 2
+    output: visits
+    tasks:
+      - {name: Read, action: $item.get_text, output: text}
+"""
+
+
+def elements(element_class: type) -> list[ParsedDOMElement]:
+    return [element_class(element) for element in parse_html('<ul><li>a</li><li>b</li></ul>').iter('li')]
+
+
+def test_parallel_map_rejects_elements_of_a_session():
+    strategy = ScriptedWorkerStrategy()
+    with pytest.raises(ValueError, match='item 0 is an element of the main page'):
+        run(PARALLEL_ELEMENTS_MAP, strategy, variables={'items': elements(SessionElement)})
+    # Failed before any iteration started a session
+    assert strategy.sessions == 1
+    worker = Worker(playbook(PARALLEL_ELEMENTS_MAP), WorkerEngine.SELENIUM, variables={'items': elements(SessionElement)}, strategy=ScriptedWorkerStrategy())
+    with pytest.raises(ValueError, match='item 0 is an element of the main page'):
+        asyncio.run(worker.start_async())
+
+
+def test_parallel_map_over_parsed_elements():
+    outputs = run(PARALLEL_ELEMENTS_MAP, variables={'items': elements(ParsedDOMElement)})
+    assert [visit['text'] for visit in outputs['visits']] == ['a', 'b']
@@ -1,13 +1,27 @@
+import asyncio
+import contextvars
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, ThreadPoolExecutor, wait
 from enum import Enum
+import inspect
 import logging
-from typing import Any
+import threading
+from typing import Any, AsyncIterator, Iterator, Optional
 
-from scrapping_playbook_framework.core.post_processor import PostProcessorFactory
 from scrapping_playbook_framework.lib import value_resolver
+from scrapping_playbook_framework.lib.checkpoint import Checkpoint, Incremental, MapCheckpoint
 from scrapping_playbook_framework.lib.chronos import Chronos
-from scrapping_playbook_framework.playbook_reader import PlaybookDict, PlaybookTask, PlaybookTask_ATTRIBUTES
-from scrapping_playbook_framework.task.task import ScrappingTask
+from scrapping_playbook_framework.lib.command_stats import CommandStats, collect_commands, task_scope
+from scrapping_playbook_framework.lib.network_stats import NetworkStats, collect_network
+from scrapping_playbook_framework.lib.iteration_store import IterationStore, default_incremental_path, stable_hash
+from scrapping_playbook_framework.lib.task_cache import NAVIGATION_ACTION, PAGE_INDEPENDENT_ACTIONS, PageState, TaskCache, cached_files_exist
+from scrapping_playbook_framework.lib.tracer import Tracer, current_span, trace
+from scrapping_playbook_framework.execution_plan import CompiledTask, ExecutionPlan, compile_playbook
+from scrapping_playbook_framework.playbook_reader import PlaybookDict
+from scrapping_playbook_framework.task.dom_task import DOMElement
+from scrapping_playbook_framework.task.export_task import StreamingExporter, StreamingExporterFactory
+from scrapping_playbook_framework.task.task import AsyncScrappingTask, ScrappingTask, to_async_tasks
 from scrapping_playbook_framework.execution_context import ExecutionContext
+from scrapping_playbook_framework.worker_strategies.http_worker_strategy import HttpWorkerStrategy
 from scrapping_playbook_framework.worker_strategies.selenium_worker_strategy import SeleniumWorkerStrategy
 from scrapping_playbook_framework.worker_strategies.worker_strategy import WorkerStrategy
 
@@ -16,13 +30,15 @@ need_break = False
 class WorkerEngine(Enum):
     SELENIUM = "selenium"
     PLAYWRIGHT = "playwright"
+    HTTP = "http"
 
 strategies : dict[WorkerEngine, type[WorkerStrategy]] = {
     WorkerEngine.SELENIUM: SeleniumWorkerStrategy,
+    WorkerEngine.HTTP: HttpWorkerStrategy,
 }
 
 class TaskInvoker:
-    def __init__(self, name : str, action: str, ctx: ExecutionContext, tasks_availables_dict : dict[str, ScrappingTask[Any]]):
+    def __init__(self, name : str, action: str, ctx: ExecutionContext, tasks_availables_dict : dict[str, Any]):
         self.name = name
         self.action = action
         self.ctx = ctx
@@ -33,7 +49,7 @@ class TaskInvoker:
             return self.invoke_variable_method()
         return self.invoke_standard_task()
 
-    def invoke_variable_method(self) -> Any:
+    def get_variable_method(self) -> Any:
         task_name = self.name
         task_action = self.action
         ctx = self.ctx
@@ -49,151 +65,592 @@ class TaskInvoker:
         if not method:
             logging.warning(f"Method {method_name} not found on variable {variable_name} for task {task_name}")
             return None
-        return method(ctx.provide_variables()) # type: ignore
+        return method
+
+    def get_standard_task(self) -> Any:
+        executor_task = self.tasks_availables_dict.get(self.action)
+        if not executor_task:
+            logging.warning(f"Task action not found: {self.action} for task {self.name}")
+            return None
+        return executor_task
+
+    def invoke_variable_method(self) -> Any:
+        method = self.get_variable_method()
+        if method is None:
+            return None
+        return method(self.ctx.view())
     
     def invoke_standard_task(self) -> Any:
-        task_name = self.name
-        task_action = self.action
-        ctx = self.ctx
-        tasks_availables_dict = self.tasks_availables_dict
+        executor_task = self.get_standard_task()
+        if executor_task is None:
+            return None
+        return executor_task.execute(self.ctx.view())
 
-        executor_task = tasks_availables_dict.get(task_action)
-        if not executor_task:
-            logging.warning(f"Task action not found: {task_action} for task {task_name}")
+
+class AsyncTaskInvoker(TaskInvoker):
+    """
+    Invoke a task from an event loop, variable methods (DOMElement...) are blocking and run in the executor.
+    """
+    def __init__(self, name : str, action: str, ctx: ExecutionContext, tasks_availables_dict : dict[str, AsyncScrappingTask[Any]], executor: Optional[Executor] = None):
+        super().__init__(name, action, ctx, tasks_availables_dict)
+        self.executor = executor
+
+    async def __call__(self) -> Any:
+        if self.action.startswith("$"):
+            method = self.get_variable_method()
+            if method is None:
+                return None
+            if inspect.iscoroutinefunction(method):
+                return await method(self.ctx.view())
+            return await asyncio.get_running_loop().run_in_executor(self.executor, contextvars.copy_context().run, method, self.ctx.view())
+        executor_task = self.get_standard_task()
+        if executor_task is None:
             return None
-        return executor_task.execute(ctx.provide_variables())
+        return await executor_task.execute(self.ctx.view())
 
 
 class Worker:
-    def __init__(self, playbook_dict: PlaybookDict, engine: WorkerEngine):
+    def __init__(self, playbook_dict: PlaybookDict, engine: WorkerEngine, variables: Optional[dict[str, Any]] = None, strategy: Optional[WorkerStrategy] = None, plan: Optional[ExecutionPlan] = None, tracer: Optional[Tracer] = None, checkpoint: Optional[str | IterationStore] = None, incremental: Optional[str | IterationStore] = None, cache: Optional[str | TaskCache] = None):
+        """
+        :param variables: Injected on top of the playbook config, e.g. one input record of a batch.
+        :param strategy: Use this strategy instead of creating one for the engine.
+        :param plan: Already compiled plan of the playbook, compiled from playbook_dict if None.
+        :param tracer: Records a span per task and map iteration, tracing is disabled if None.
+        :param checkpoint: Store, or SQLite file path, keeping completed map iterations so a crashed run resumes where it stopped.
+            Defaults to the `checkpoint` path of the playbook config, checkpointing is disabled if neither is set.
+        :param incremental: Store, or SQLite file path, keeping the iterations of `incremental` maps from run to run.
+            Defaults to the `incremental_path` of the playbook config.
+        :param cache: Cache, or SQLite file path, of the tasks with a `cache` attribute. Defaults to the `cache_path` of the playbook config.
+        """
         self.playbook_dict = playbook_dict
         self.engine = engine
-        self.context = ExecutionContext().inject_variables(self.playbook_dict.config)
+        self.plan = plan or compile_playbook(self.playbook_dict)
+        self.context = ExecutionContext().inject_variables(dict(self.plan.config)).inject_variables(variables or {})
+        self.executor: Optional[Executor] = None
+        self._strategy = strategy
+        self.tracer = tracer
+        # Engine round trips of the last run, per task and command
+        self.command_stats = CommandStats()
+        # Browser requests of the last run, blocked ones included
+        self.network_stats = NetworkStats()
+        self.checkpoint: Optional[Checkpoint] = None
+        checkpoint = checkpoint or self.plan.config.get('checkpoint')
+        if checkpoint:
+            store = IterationStore(checkpoint) if isinstance(checkpoint, str) else checkpoint
+            # Same playbook and same inputs, same run
+            self.checkpoint = Checkpoint(store, stable_hash(playbook_dict.source_path, playbook_dict.model_dump(mode='json'), variables or {}))
+        self.incremental: Optional[Incremental] = None
+        if self.plan.has_incremental_maps():
+            incremental = incremental or self.plan.config.get('incremental_path') or default_incremental_path()
+            store = IterationStore(incremental) if isinstance(incremental, str) else incremental
+            # Same playbook, same outputs for an unchanged item whatever the inputs of the run
+            max_age = float(self.plan.config.get('incremental_max_age_days', 30)) * 86400
+            self.incremental = Incremental(store, stable_hash('incremental', playbook_dict.source_path, playbook_dict.model_dump(mode='json')), max_age)
+        self.task_cache: Optional[TaskCache] = None
+        if self.plan.has_cached_tasks():
+            cache = cache or self.plan.config.get('cache_path')
+            self.task_cache = cache if isinstance(cache, TaskCache) else TaskCache(cache, int(self.plan.config.get('cache_max_size_mb', 256)) * 1024 * 1024)
+        # What the cache knows of the page of each session, by id of the session tasks dict
+        self._page_states: dict[int, PageState] = {}
+        self._page_states_lock = threading.Lock()
         
     def get_strategy(self) -> WorkerStrategy:
+        if self._strategy is not None:
+            return self._strategy
         strategy_class = strategies.get(self.engine)
         if not strategy_class:
             raise ValueError(f"No strategy found for engine: {self.engine}")
-        return strategy_class()
+        return strategy_class.from_config(self.plan.config)
     
     def start(self) -> dict[str, Any]:
-        strategy = self.get_strategy()
+        self.command_stats = CommandStats()
+        self.network_stats = NetworkStats()
+        try:
+            with collect_commands(self.command_stats), collect_network(self.network_stats):
+                self.strategy = self.get_strategy()
+                tasks_availables_dict = self.strategy.get_available_tasks()
+                try:
+                    with trace(self.tracer, 'playbook', 'playbook', engine=self.engine.value):
+                        outputs = self.worker_loop(self.plan.tasks, self.context, tasks_availables_dict)
+                    if self.checkpoint is not None:
+                        self.checkpoint.clear()
+                    if self.incremental is not None:
+                        self.incremental.prune()
+                    return outputs
+                finally:
+                    self.forget_page_state(tasks_availables_dict)
+                    self.strategy.release_available_tasks(tasks_availables_dict)
+        finally:
+            self.log_run_stats()
+
+    def log_run_stats(self) -> None:
+        if self.command_stats.total_count():
+            logging.info(f"Engine commands of the run:\n{self.command_stats.summary()}")
+        if self.network_stats.total_requests():
+            logging.info(f"Network requests of the run:\n{self.network_stats.summary()}")
+
+    def map_iterations(self, task: CompiledTask, context: ExecutionContext, list_to_map: list[Any]) -> Iterator[tuple[int, ExecutionContext]]:
+        """
+        Yield the sub context of each loop iteration that passes the task filters.
+        """
+        for index, item in enumerate(list_to_map):
+            if(task.debug):
+                logging.info(f"Debugging task {task.name} - Iteration {index}")
+                breakpoint()
+            sub_context = context.clone()
+            sub_context.set_variable('INDEX',index)
+            sub_context.set_variable(task.item_name, item)
+            if not all(f.evaluate(sub_context) for f in task.filters):
+                continue
+            yield index, sub_context
+
+    def map_checkpoint(self, task: CompiledTask) -> Optional[MapCheckpoint]:
+        """
+        Where the iterations of a map are kept, if anywhere. An incremental map saves every iteration as it completes,
+        so it resumes a crashed run without a checkpoint.
+        """
+        if task.incremental and self.incremental is not None:
+            return self.incremental.for_map(task.path_segment, task.checkpoint_key, task.item_name, task.fingerprint)
+        if self.checkpoint is not None:
+            return self.checkpoint.for_map(task.path_segment, task.checkpoint_key)
+        return None
+
+    def run_iteration(self, task: CompiledTask, index: int, sub_context: ExecutionContext, tasks_availables_dict: dict[str, ScrappingTask[Any]], checkpoint: Optional[MapCheckpoint] = None) -> dict[str, Any]:
+        with trace(self.tracer, f"{task.name}[{index}]", 'iteration', index=index) as span:
+            if checkpoint is None:
+                return self.worker_loop(task.tasks, sub_context, tasks_availables_dict)
+            item_key, fingerprint = checkpoint.identify(index, sub_context)
+            restored = checkpoint.restore(item_key, fingerprint)
+            if restored is not None:
+                if span is not None:
+                    span.status = checkpoint.restored_status
+                return restored
+            with checkpoint.iteration(task.path_segment, item_key):
+                outputs = self.worker_loop(task.tasks, sub_context, tasks_availables_dict)
+            checkpoint.save(item_key, outputs, fingerprint)
+            return outputs
+
+    def parallel_map(self, task: CompiledTask, iterations: Iterator[tuple[int, ExecutionContext]], checkpoint: Optional[MapCheckpoint] = None) -> Iterator[tuple[int, dict[str, Any]]]:
+        """
+        Spread loop iterations over `task.parallel` browser sessions, each thread of the pool owns its own session.
+        Items must not be bound to another session (urls, dicts... not elements of the main page).
+        :return: (index, outputs) pairs in list order, or in completion order when the task is not ordered.
+        """
+        strategy = self.strategy
+        sessions: list[dict[str, ScrappingTask[Any]]] = []
+        sessions_lock = threading.Lock()
+        thread_local = threading.local()
+
+        def run_iteration(index: int, sub_context: ExecutionContext) -> dict[str, Any]:
+            tasks_availables_dict = getattr(thread_local, 'tasks_availables_dict', None)
+            if tasks_availables_dict is None:
+                tasks_availables_dict = strategy.get_available_tasks()
+                thread_local.tasks_availables_dict = tasks_availables_dict
+                with sessions_lock:
+                    sessions.append(tasks_availables_dict)
+            return self.run_iteration(task, index, sub_context, tasks_availables_dict, checkpoint)
+
+        # Bound the iterations in flight (and buffered when ordered) to keep memory flat on long lists
+        max_in_flight = task.parallel * 2
+        executor = ThreadPoolExecutor(max_workers=task.parallel, thread_name_prefix=f"map-{task.name}")
+        pending: dict[Future[dict[str, Any]], tuple[int, int]] = {}
+        completed: dict[int, tuple[int, dict[str, Any]]] = {}
+        submitted = 0
+        next_to_yield = 0
+        exhausted = False
+        try:
+            while True:
+                while not exhausted and len(pending) + len(completed) < max_in_flight:
+                    next_iteration = next(iterations, None)
+                    if next_iteration is None:
+                        exhausted = True
+                        break
+                    index, sub_context = next_iteration
+                    # Run in a copy of this context, the iteration span keeps the map task span as parent
+                    pending[executor.submit(contextvars.copy_context().run, run_iteration, index, sub_context)] = (submitted, index)
+                    submitted += 1
+                if not pending:
+                    break
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    sequence, index = pending.pop(future)
+                    if task.ordered:
+                        completed[sequence] = (index, future.result())
+                    else:
+                        yield index, future.result()
+                while next_to_yield in completed:
+                    yield completed.pop(next_to_yield)
+                    next_to_yield += 1
+        finally:
+            for future in pending:
+                future.cancel()
+            executor.shutdown(wait=True)
+            for tasks_availables_dict in sessions:
+                self.forget_page_state(tasks_availables_dict)
+                strategy.release_available_tasks(tasks_availables_dict)
+
+    def invoke_task(self, task: CompiledTask, context: ExecutionContext, tasks_availables_dict: dict[str, ScrappingTask[Any]]) -> Any:
+        invoker = TaskInvoker(task.name, task.action, context, tasks_availables_dict)
+        if self.task_cache is None:
+            return invoker()
+        page = self.page_state(tasks_availables_dict)
+        params = self.resolve_cache_params(task, context)
+        if task.action == NAVIGATION_ACTION and task.cache_ttl is not None:
+            # Navigate only once a task following the goto misses the cache
+            page.defer(params)
+            return None
+        key, hit, output = self.lookup_cache(task, params, page)
+        if hit:
+            return output
+        # Downloads do not need the page, a deferred goto stays deferred
+        if task.action not in PAGE_INDEPENDENT_ACTIONS:
+            pending_goto = page.take_pending()
+            if pending_goto is not None and task.action != NAVIGATION_ACTION:
+                tasks_availables_dict[NAVIGATION_ACTION].execute(pending_goto)
+        output = invoker()
+        self.store_cache(task, key, output)
+        page.after_task(task.action, params)
+        return output
+
+    async def invoke_task_async(self, task: CompiledTask, context: ExecutionContext, tasks_availables_dict: dict[str, AsyncScrappingTask[Any]]) -> Any:
+        invoker = AsyncTaskInvoker(task.name, task.action, context, tasks_availables_dict, self.executor)
+        if self.task_cache is None:
+            return await invoker()
+        page = self.page_state(tasks_availables_dict)
+        params = self.resolve_cache_params(task, context)
+        if task.action == NAVIGATION_ACTION and task.cache_ttl is not None:
+            page.defer(params)
+            return None
+        key, hit, output = self.lookup_cache(task, params, page)
+        if hit:
+            return output
+        # Downloads do not need the page, a deferred goto stays deferred
+        if task.action not in PAGE_INDEPENDENT_ACTIONS:
+            pending_goto = page.take_pending()
+            if pending_goto is not None and task.action != NAVIGATION_ACTION:
+                await tasks_availables_dict[NAVIGATION_ACTION].execute(pending_goto)
+        output = await invoker()
+        self.store_cache(task, key, output)
+        page.after_task(task.action, params)
+        return output
+
+    def page_state(self, tasks_availables_dict: dict[str, Any]) -> PageState:
+        with self._page_states_lock:
+            return self._page_states.setdefault(id(tasks_availables_dict), PageState())
+
+    def forget_page_state(self, tasks_availables_dict: dict[str, Any]) -> None:
+        with self._page_states_lock:
+            self._page_states.pop(id(tasks_availables_dict), None)
+
+    def resolve_cache_params(self, task: CompiledTask, context: ExecutionContext) -> dict[str, Any]:
+        """
+        Params the cache depends on: all of them for a cached task, the url of a goto, none otherwise.
+        """
+        if task.cache_ttl is None and task.action != NAVIGATION_ACTION:
+            return {}
+        return {key: value_resolver.resolve(context, value) for key, value in task.resolve_params(context).items()}
+
+    def lookup_cache(self, task: CompiledTask, params: dict[str, Any], page: PageState) -> tuple[Optional[str], bool, Any]:
+        """
+        :return: The cache key of the task, None if it can not be cached on this page, whether a fresh output exists and that output.
+        """
+        if task.cache_ttl is None or self.task_cache is None:
+            return None, False, None
+        if task.action in PAGE_INDEPENDENT_ACTIONS:
+            key = stable_hash(self.playbook_dict.source_path, task.action, params)
+        elif page.url is not None:
+            key = stable_hash(self.playbook_dict.source_path, page.url, task.action, params)
+        else:
+            logging.debug(f"Page of task {task.name} is unknown, not cached")
+            return None, False, None
+        hit, output = self.task_cache.get(key)
+        if hit and cached_files_exist(task.action, params, output):
+            logging.info(f"Cache hit for task {task.name}")
+            return key, True, output
+        return key, False, None
+
+    def store_cache(self, task: CompiledTask, key: Optional[str], output: Any) -> None:
+        if key is not None and self.task_cache is not None and task.cache_ttl is not None:
+            self.task_cache.set(key, output, task.cache_ttl)
+
+    def resolve_span_params(self, params: dict[str, Any], context: ExecutionContext) -> dict[str, Any]:
+        """
+        Params as the task sees them, a templated url or selector is what tells two spans apart.
+        """
+        resolved: dict[str, Any] = {}
+        for key, value in params.items():
+            try:
+                resolved[key] = value_resolver.resolve(context, value)
+            except value_resolver.UnresolvedVariableError:
+                resolved[key] = value
+        return resolved
+
+    def prepare_task(self, task: CompiledTask, context: ExecutionContext) -> bool:
+        """
+        Inject the task params in the context and evaluate its conditions.
+        :return: False if the task must be skipped.
+        """
+        params = task.resolve_params(context)
+        span = current_span()
+        if span is not None:
+            # Resolved before the params shadow the variables they are templated from ('{{url}}' in a map over url)
+            span.set_params(self.resolve_span_params(params, context))
+        context.inject_variables(params)
+
+        if(task.debug):
+            logging.info(f"Debugging task {task.name} - Start Point")
+            breakpoint()
+
+        # Evaluate conditions
+        conditions_met = all(condition.evaluate(context) for condition in task.conditions)
+        if not conditions_met:
+            logging.info(f"Skipping task {task.name} due to unmet conditions.")
+        return conditions_met
+
+    def get_list_to_map(self, task: CompiledTask, context: ExecutionContext) -> list[Any]:
+        list_to_map = context.get_variable(task.map) # type: ignore
+
+        if not isinstance(list_to_map, list):
+            raise ValueError(f"Variable to map is not a list: {task.map}")
+        logging.debug(f"Mapping over list: {len(list_to_map)} items for task {task.name}") # type: ignore
+        if task.parallel > 1:
+            for index, item in enumerate(list_to_map): # type: ignore
+                if isinstance(item, DOMElement) and item.session_bound:
+                    # Its commands would go to the session of the main page from every thread of the map
+                    raise ValueError(f"Map {task.name} runs on {task.parallel} sessions but item {index} is an element of the main page, map over urls or extracted values instead (dom.extract, dom.snapshot)")
+        return list_to_map # type: ignore
+
+    def merge_map_output(self, task: CompiledTask, index: int, output: Optional[list[Any]], outputs_from_sub: dict[str, Any], outputs: dict[str, Any], exporters: list[StreamingExporter], flattened_indexes: dict[str, int]) -> Optional[list[Any]]:
+        """
+        Merge the outputs of one iteration, exporters receive them as they come (completion order of an unordered map).
+        :param flattened_indexes: Index of the iteration each flattened variable comes from, filled in by this method.
+        """
+        for exporter in exporters:
+            exporter.write(outputs_from_sub)
+        if(task.flatten):
+            # The iteration latest in list order wins whatever the completion order is, like a merge in list order
+            for key, value in outputs_from_sub.items():
+                if flattened_indexes.get(key, -1) <= index:
+                    outputs[key] = value
+                    flattened_indexes[key] = index
+            return None
+        if task.output is not None:
+            # Without output variable the list would be dropped anyway, don't keep every iteration in memory
+            output.append(outputs_from_sub) # type: ignore
+        return output
+
+    def open_exporters(self, task: CompiledTask, context: ExecutionContext) -> list[StreamingExporter]:
+        exporters: list[StreamingExporter] = []
+        try:
+            for exporter_config in task.exporters:
+                config = {**exporter_config, 'file_path': value_resolver.resolve(context, exporter_config['file_path'])}
+                exporters.append(StreamingExporterFactory.create(config).open())
+        except Exception:
+            self.close_exporters(exporters)
+            raise
+        return exporters
+
+    def close_exporters(self, exporters: list[StreamingExporter]) -> None:
+        for exporter in exporters:
+            try:
+                exporter.close()
+            except Exception as e:
+                logging.error(f"Could not close exporter for {exporter.file_path}: {e}")
+
+    def finish_task(self, task: CompiledTask, context: ExecutionContext, output: Any, outputs: dict[str, Any]) -> None:
+        if task.post_processors is not None and output is not None:
+            output = task.post_processors.process(output)
+        
+        task_output_var_name = value_resolver.resolve(context, task.output)
+        if task_output_var_name and output is not None:
+            context.set_variable(task_output_var_name, output)
+            if(not task_output_var_name.startswith('_')):
+                outputs[task_output_var_name] = output
+
+        if(task.debug):
+            logging.info(f"Debugging task {task.name} - End Point")
+            breakpoint()
+
+    def worker_loop(self, tasks_to_execute : tuple[CompiledTask, ...], context: ExecutionContext, tasks_availables_dict : dict[str, ScrappingTask[Any]]) -> dict[str, Any]:
+        outputs : dict[str, Any] = {}
         
-        def replace_variable_placeholders(params: dict[str, Any], context: ExecutionContext) -> dict[str, Any]:
-            for key, value in params.items():
-                if isinstance(value, str) and value.startswith("$"):
-                    variable_path = value[1:]
-                    parts = variable_path.split('.')
-                    variable_name = parts[0]
-                    variable_value = context.get_variable(variable_name)
+        for task in tasks_to_execute:
+            with Chronos() as chrono, trace(self.tracer, task.name, 'task', task.action) as span, task_scope(task.name):
+                logging.info(f"Starting task {task.name}")
+                if not self.prepare_task(task, context):
+                    if span is not None:
+                        span.status = 'skipped'
+                    continue
+                
+                output = None
+                
+                if task.is_map:
                     """
-                    Can handle variables with a simple "." path like "variable.property" with depth of 1, usefull tu acces return by iterate task
+                    A Map loop create a subcontext, all var created in the loop is in a sub context, the result can be outputed
                     """
-                    if variable_value is not None and len(parts) > 1:
-                        for part in parts[1:]:
-                            if hasattr(variable_value, part): # type: ignore
-                                variable_value = getattr(variable_value, part) # type: ignore
-                            elif isinstance(variable_value, dict) and part in variable_value:
-                                variable_value = variable_value[part] # type: ignore
-                            else:
-                                logging.warning(f"Could not resolve {part} in {variable_path}")
-                                variable_value = None
-                                break
-
-                    if variable_value is not None:
-                        params[key] = variable_value
+                    output= []
+                    iterations = self.map_iterations(task, context, self.get_list_to_map(task, context))
+                    checkpoint = self.map_checkpoint(task)
+                    if task.parallel > 1:
+                        results = self.parallel_map(task, iterations, checkpoint)
                     else:
-                        logging.warning(f"Variable {variable_name} not found in context for parameter {key}")
+                        results = ((index, self.run_iteration(task, index, sub_context, tasks_availables_dict, checkpoint)) for index, sub_context in iterations)
 
-            return params
-    
-        def apply_post_processors(value: Any, processors_config: list[dict[str, Any]]) -> Any:
-            """Apply a chain of post-processors to a value"""
-            result = value
-            for processor_config in processors_config:
-                processor = PostProcessorFactory.create(processor_config)
-                result = processor.process(result)
-            
-            return result
+                    flattened_indexes: dict[str, int] = {}
+                    exporters = self.open_exporters(task, context)
+                    try:
+                        for index, outputs_from_sub in results:
+                            output = self.merge_map_output(task, index, output, outputs_from_sub, outputs, exporters, flattened_indexes)
+                    finally:
+                        self.close_exporters(exporters)
+                else :  
+                    logging.debug(f"Invoking task {task.name} with action {task.action}")
+                    output = self.invoke_task(task, context, tasks_availables_dict)
 
-        
-        def worker_loop(tasks_to_execute : list[PlaybookTask], context: ExecutionContext, tasks_availables_dict : dict[str, ScrappingTask[Any]]) -> dict[str, Any]:
-            
-            global need_break
-            outputs : dict[str, Any] = {}
-            
-            for task_dict in tasks_to_execute:
-                with Chronos() as chrono:
-                    logging.info(f"Starting task {task_dict.name}")
-                    task_name = task_dict.name
-                    task_action = task_dict.action
-                    task_conditions = task_dict.when or []
-                    params = {k: v for k, v in task_dict.model_dump().items() if k not in PlaybookTask_ATTRIBUTES}
-                    params = replace_variable_placeholders(params, context)
-                    context.inject_variables(params)
-
-                    if(task_dict.debug):
-                        logging.info(f"Debugging task {task_dict.name} - Start Point")
-                        breakpoint()
-
-                    # Evaluate conditions
-                    conditions_met = len(task_conditions) == 0 or all(condition.evaluate(context) for condition in task_conditions)
-                    if not conditions_met:
-                        logging.info(f"Skipping task {task_name} due to unmet conditions.")
+                self.finish_task(task, context, output, outputs)
+
+            logging.info(f"Finished task {task.name} in {chrono.elapsed_time:.2f}s")
+
+        return outputs
+
+    async def start_async(self, executor: Optional[Executor] = None) -> dict[str, Any]:
+        """
+        Run the playbook on the running event loop, many workers can run concurrently with asyncio.gather.
+        Blocking engine calls (session start, synchronous tasks) go through `executor`, the loop default one if None.
+        """
+        loop = asyncio.get_running_loop()
+        self.command_stats = CommandStats()
+        self.network_stats = NetworkStats()
+        try:
+            with collect_commands(self.command_stats), collect_network(self.network_stats):
+                self.strategy = self.get_strategy()
+                self.executor = executor
+                tasks_availables_dict = await loop.run_in_executor(executor, contextvars.copy_context().run, self.strategy.get_available_tasks)
+                async_tasks_dict = to_async_tasks(tasks_availables_dict, executor)
+                try:
+                    with trace(self.tracer, 'playbook', 'playbook', engine=self.engine.value):
+                        outputs = await self.worker_loop_async(self.plan.tasks, self.context, async_tasks_dict)
+                    if self.checkpoint is not None:
+                        self.checkpoint.clear()
+                    if self.incremental is not None:
+                        self.incremental.prune()
+                    return outputs
+                finally:
+                    self.forget_page_state(async_tasks_dict)
+                    await loop.run_in_executor(executor, contextvars.copy_context().run, self.strategy.release_available_tasks, tasks_availables_dict)
+        finally:
+            self.log_run_stats()
+
+    async def worker_loop_async(self, tasks_to_execute : tuple[CompiledTask, ...], context: ExecutionContext, tasks_availables_dict : dict[str, AsyncScrappingTask[Any]]) -> dict[str, Any]:
+        outputs : dict[str, Any] = {}
+
+        for task in tasks_to_execute:
+            with trace(self.tracer, task.name, 'task', task.action) as span, task_scope(task.name):
+                async with Chronos() as chrono:
+                    logging.info(f"Starting task {task.name}")
+                    if not self.prepare_task(task, context):
+                        if span is not None:
+                            span.status = 'skipped'
                         continue
-                    
+
                     output = None
-                    
-                    if task_dict.map is not None and task_dict.tasks is not None:
-                        """
-                        A Map loop create a subcontext, all var created in the loop is in a sub context, the result can be outputed
-                        """
-                        list_to_map = context.get_variable(task_dict.map)
-
-                        if not isinstance(list_to_map, list):
-                            raise ValueError(f"Variable to map is not a list: {task_dict.map}")
-                        logging.debug(f"Mapping over list: {len(list_to_map)} items for task {task_name}") # type: ignore
+
+                    if task.is_map:
                         output= []
-                        for index, item in enumerate(list_to_map): # type: ignore
-                            if(task_dict.debug):
-                                logging.info(f"Debugging task {task_dict.name} - Iteration {index}")
-                                breakpoint()
-                            sub_context = context.clone()
-                            sub_context.set_variable('INDEX',index)
-                            sub_context.set_variable(task_dict.item_name or "item", item)
-                            if(task_dict.filters is not None):
-                                if not all(f.evaluate(sub_context) for f in task_dict.filters):
-                                    continue
-
-                            outputs_from_sub = worker_loop(task_dict.tasks, sub_context, tasks_availables_dict)
-                            if(task_dict.flatten): # type:ignore
-                                output = None
-                                outputs.update(outputs_from_sub) # type: ignore
+                        iterations = self.map_iterations(task, context, self.get_list_to_map(task, context))
+                        checkpoint = self.map_checkpoint(task)
+                        flattened_indexes: dict[str, int] = {}
+                        exporters = self.open_exporters(task, context)
+                        try:
+                            if task.parallel > 1:
+                                async for index, outputs_from_sub in self.parallel_map_async(task, iterations, checkpoint):
+                                    output = self.merge_map_output(task, index, output, outputs_from_sub, outputs, exporters, flattened_indexes)
                             else:
-                                output.append(outputs_from_sub) # type: ignore
-                    else :  
-                        logging.debug(f"Invoking task {task_name} with action {task_action}")
-                        invoker = TaskInvoker(task_name, task_action, context, tasks_availables_dict)
-                        output = invoker()
-
+                                for index, sub_context in iterations:
+                                    outputs_from_sub = await self.run_iteration_async(task, index, sub_context, tasks_availables_dict, checkpoint)
+                                    output = self.merge_map_output(task, index, output, outputs_from_sub, outputs, exporters, flattened_indexes)
+                        finally:
+                            self.close_exporters(exporters)
+                    else :
+                        logging.debug(f"Invoking task {task.name} with action {task.action}")
+                        output = await self.invoke_task_async(task, context, tasks_availables_dict)
 
-                    if task_dict.post_process is not None and output is not None:
-                        output = apply_post_processors(output, task_dict.post_process)
-                    
-                    task_output_var_name = value_resolver.resolve(context, task_dict.output)
-                    if task_output_var_name and output is not None:
-                        context.set_variable(task_output_var_name, output)
-                        if(not task_output_var_name.startswith('_')):
-                            outputs[task_output_var_name] = output
+                    self.finish_task(task, context, output, outputs)
 
-                    if(task_dict.debug):
-                        logging.info(f"Debugging task {task_dict.name} - End Point")
-                        breakpoint()
+                logging.info(f"Finished task {task.name} in {chrono.elapsed_time:.2f}s")
 
-                logging.info(f"Finished task {task_name} in {chrono.elapsed_time:.2f}s")
+        return outputs
 
+    async def run_iteration_async(self, task: CompiledTask, index: int, sub_context: ExecutionContext, tasks_availables_dict: dict[str, AsyncScrappingTask[Any]], checkpoint: Optional[MapCheckpoint] = None) -> dict[str, Any]:
+        with trace(self.tracer, f"{task.name}[{index}]", 'iteration', index=index) as span:
+            if checkpoint is None:
+                return await self.worker_loop_async(task.tasks, sub_context, tasks_availables_dict)
+            # Fingerprinting an element reads the page, keep it off the event loop
+            item_key, fingerprint = await asyncio.get_running_loop().run_in_executor(self.executor, contextvars.copy_context().run, checkpoint.identify, index, sub_context)
+            restored = checkpoint.restore(item_key, fingerprint)
+            if restored is not None:
+                if span is not None:
+                    span.status = checkpoint.restored_status
+                return restored
+            with checkpoint.iteration(task.path_segment, item_key):
+                outputs = await self.worker_loop_async(task.tasks, sub_context, tasks_availables_dict)
+            checkpoint.save(item_key, outputs, fingerprint)
             return outputs
 
+    async def parallel_map_async(self, task: CompiledTask, iterations: Iterator[tuple[int, ExecutionContext]], checkpoint: Optional[MapCheckpoint] = None) -> AsyncIterator[tuple[int, dict[str, Any]]]:
+        """
+        Async counterpart of parallel_map, at most `task.parallel` iterations run at once, each on its own session.
+        """
+        loop = asyncio.get_running_loop()
+        strategy = self.strategy
+        # Each session with its async tasks, adapted once so the session keeps the same tasks dict
+        sessions: list[tuple[dict[str, ScrappingTask[Any]], dict[str, AsyncScrappingTask[Any]]]] = []
+        free_sessions: list[tuple[dict[str, ScrappingTask[Any]], dict[str, AsyncScrappingTask[Any]]]] = []
 
-        return worker_loop(self.playbook_dict.tasks, self.context, strategy.get_available_tasks())
+        async def run_iteration(index: int, sub_context: ExecutionContext) -> dict[str, Any]:
+            if free_sessions:
+                session = free_sessions.pop()
+            else:
+                tasks_availables_dict = await loop.run_in_executor(self.executor, contextvars.copy_context().run, strategy.get_available_tasks)
+                session = (tasks_availables_dict, to_async_tasks(tasks_availables_dict, self.executor))
+                sessions.append(session)
+            try:
+                return await self.run_iteration_async(task, index, sub_context, session[1], checkpoint)
+            finally:
+                free_sessions.append(session)
 
+        pending: dict[asyncio.Task[dict[str, Any]], tuple[int, int]] = {}
+        completed: dict[int, tuple[int, dict[str, Any]]] = {}
+        submitted = 0
+        next_to_yield = 0
+        exhausted = False
+        try:
+            while True:
+                while not exhausted and len(pending) < task.parallel and len(pending) + len(completed) < task.parallel * 2:
+                    next_iteration = next(iterations, None)
+                    if next_iteration is None:
+                        exhausted = True
+                        break
+                    index, sub_context = next_iteration
+                    pending[asyncio.ensure_future(run_iteration(index, sub_context))] = (submitted, index)
+                    submitted += 1
+                if not pending:
+                    break
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for future in done:
+                    sequence, index = pending.pop(future)
+                    if task.ordered:
+                        completed[sequence] = (index, future.result())
+                    else:
+                        yield index, future.result()
+                while next_to_yield in completed:
+                    yield completed.pop(next_to_yield)
+                    next_to_yield += 1
+        finally:
+            for future in pending:
+                future.cancel()
+            if pending:
+                await asyncio.wait(pending)
+            for tasks_availables_dict, async_tasks_dict in sessions:
+                self.forget_page_state(async_tasks_dict)
+                await loop.run_in_executor(self.executor, contextvars.copy_context().run, strategy.release_available_tasks, tasks_availables_dict)
@@ -0,0 +1,13 @@
+from typing import Any
+from scrapping_playbook_framework.http_engine.http_bootstrap import get_http_tasks
+from scrapping_playbook_framework.http_engine.http_browser import HttpPage
+from scrapping_playbook_framework.task.task import ScrappingTask
+from scrapping_playbook_framework.worker_strategies.worker_strategy import WorkerStrategy
+
+class HttpWorkerStrategy(WorkerStrategy):
+    """
+    Browserless strategy for server rendered pages: pages are fetched over HTTP and queried with a local parser.
+    """
+    def get_available_tasks(self) -> dict[str, ScrappingTask[Any]]:
+        tasks_availables = get_http_tasks(HttpPage())
+        return {task.get_task_action_name(): task for task in tasks_availables}
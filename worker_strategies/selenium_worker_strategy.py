@@ -1,14 +1,47 @@
-
-from typing import Any
-from scrapping_playbook_framework.selenium.selenium_bootstrap import get_driver, get_selenium_tasks
+import logging
+from typing import Any, Mapping, Optional
+from selenium.webdriver.remote.webdriver import WebDriver
+from scrapping_playbook_framework.selenium.selenium_bootstrap import get_selenium_tasks
+from scrapping_playbook_framework.selenium.selenium_driver_pool import DriverPool, get_default_pool
+from scrapping_playbook_framework.selenium.selenium_instrumentation import instrument_driver
+from scrapping_playbook_framework.selenium.selenium_profile import BrowserProfile, read_network_log
 from scrapping_playbook_framework.task.task import ScrappingTask
 from scrapping_playbook_framework.worker_strategies.worker_strategy import WorkerStrategy
 
 class SeleniumWorkerStrategy(WorkerStrategy):
+    def __init__(self, pool: Optional[DriverPool] = None, profile: Optional[BrowserProfile] = None):
+        """
+        :param profile: Browser launch options, ignored when a pool is given.
+        """
+        self.profile = profile or BrowserProfile()
+        self.pool = pool or get_default_pool(self.profile)
+        self._drivers: dict[int, WebDriver] = {}
+
+    @classmethod
+    def from_config(cls, config: Mapping[str, Any]) -> 'SeleniumWorkerStrategy':
+        return cls(profile=BrowserProfile.from_config(config.get('browser') or {}))
+
     def get_available_tasks(self) -> dict[str, ScrappingTask[Any]]:
-        driver = get_driver()
+        # Round trips are counted per task of the running Worker, see Worker.command_stats
+        driver = instrument_driver(self.pool.acquire())
+        if self.profile.reports_network:
+            # Requests of a previous run of a pooled session
+            driver.get_log('performance') # type: ignore
         tasks_availables = get_selenium_tasks(driver)
         tasks_availables_dict = {task.get_task_action_name(): task for task in tasks_availables}
+        self._drivers[id(tasks_availables_dict)] = driver
         return tasks_availables_dict
-        
-        
\ No newline at end of file
+
+    def release_available_tasks(self, tasks_availables_dict: dict[str, ScrappingTask[Any]]) -> None:
+        driver = self._drivers.pop(id(tasks_availables_dict), None)
+        if driver is None:
+            return
+        if self.profile.reports_network:
+            try:
+                read_network_log(driver)
+            except Exception as e:
+                logging.warning(f"Could not read the network log of the session: {e}")
+        self.pool.release(driver)
+
+    def shutdown(self) -> None:
+        self.pool.shutdown()
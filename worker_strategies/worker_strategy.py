@@ -1,9 +1,29 @@
 from abc import ABC, abstractmethod
-from typing import Any
+from typing import Any, Mapping
 
 from scrapping_playbook_framework.task.task import ScrappingTask
 
 class WorkerStrategy(ABC):
+    @classmethod
+    def from_config(cls, config: Mapping[str, Any]) -> 'WorkerStrategy':
+        """
+        Strategy for a playbook, engines with options (browser profile...) read them from its config.
+        """
+        return cls()
+
     @abstractmethod
     def get_available_tasks(self) -> dict[str, ScrappingTask[Any]]:
-        pass
\ No newline at end of file
+        pass
+
+    def release_available_tasks(self, tasks_availables_dict: dict[str, ScrappingTask[Any]]) -> None:
+        """
+        Called once a set of tasks returned by get_available_tasks is no longer used,
+        strategies holding a browser session per set should close it here.
+        """
+        pass
+
+    def shutdown(self) -> None:
+        """
+        Close every resource kept alive between runs, the strategy is not used afterwards.
+        """
+        pass